@@ -6,23 +6,27 @@ Version: 1.0.0
 """
 
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
 from datetime import datetime, timedelta
+import gzip
+import html
+import io
 import json
-from typing import Dict, List
+import os
+import tempfile
+from typing import Dict, List, Tuple
 
-# Page Configuration
-st.set_page_config(
-    page_title="EU AI Act Toolkit",
-    page_icon="🇪🇺",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
+from changes import ChangeFeed
+from columnar import AssessmentColumns
+# Re-exported so existing ``from app import RiskClassifier`` imports keep working
+from euai_core import (EU_AI_ACT_RULES, RULE_CATEGORIES, KeywordMatcher, RiskClassifier,
+                       compute_compliance_score, get_matcher, get_obligation_table,
+                       instrumentation, parse_data_types)
+from jobs import Job, JobQueue, QueueFull
+from storage import AssessmentRepository, open_repository
+from streaming import detect_format, export_assessments, iter_chunks, read_assessments
 
 # Custom CSS
-st.markdown("""
+APP_CSS = """
 <style>
     .main-header {
         background: linear-gradient(135deg, #003399 0%, #0066cc 100%);
@@ -80,107 +84,16 @@ st.markdown("""
         margin: 0.5rem 0;
         border-left: 3px solid #003399;
     }
+    
+    .evidence-card mark {
+        background: #ffe08a;
+        padding: 0 2px;
+    }
 </style>
-""", unsafe_allow_html=True)
-
-# EU AI Act Knowledge Base
-EU_AI_ACT_RULES = {
-    "prohibited_practices": [
-        {
-            "id": "P1",
-            "article": "Article 5(1)(a)",
-            "title": "Subliminal Manipulation",
-            "description": "AI systems using subliminal techniques beyond consciousness",
-            "keywords": ["subliminal", "subconscious", "manipulative"],
-            "fine": "€35M or 7% global turnover"
-        },
-        {
-            "id": "P2",
-            "article": "Article 5(1)(b)",
-            "title": "Exploitation of Vulnerabilities",
-            "description": "Systems exploiting vulnerabilities of specific groups",
-            "keywords": ["children", "vulnerable", "disability", "exploitation"],
-            "fine": "€35M or 7% global turnover"
-        },
-        {
-            "id": "P3",
-            "article": "Article 5(1)(c)",
-            "title": "Social Scoring",
-            "description": "Social scoring by public authorities",
-            "keywords": ["social scoring", "social credit", "citizen scoring"],
-            "fine": "€35M or 7% global turnover"
-        }
-    ],
-    "high_risk_systems": [
-        {
-            "id": "HR1",
-            "annex": "Annex III(1)",
-            "title": "Biometric Identification",
-            "description": "Biometric identification and categorization",
-            "keywords": ["biometric", "facial recognition", "fingerprint", "iris"],
-            "sector": "Critical Infrastructure",
-            "fine": "€15M or 3% global turnover"
-        },
-        {
-            "id": "HR2",
-            "annex": "Annex III(2)",
-            "title": "Education Assessment",
-            "description": "AI in education and vocational training",
-            "keywords": ["education", "student assessment", "exam proctoring"],
-            "sector": "Education",
-            "fine": "€15M or 3% global turnover"
-        },
-        {
-            "id": "HR3",
-            "annex": "Annex III(3)",
-            "title": "Employment & Recruitment",
-            "description": "AI for recruitment and hiring decisions",
-            "keywords": ["recruitment", "hiring", "cv screening", "employee"],
-            "sector": "Employment",
-            "fine": "€15M or 3% global turnover"
-        },
-        {
-            "id": "HR4",
-            "annex": "Annex III(4)",
-            "title": "Essential Services",
-            "description": "Access to essential services",
-            "keywords": ["credit scoring", "insurance", "healthcare access"],
-            "sector": "Essential Services",
-            "fine": "€15M or 3% global turnover"
-        },
-        {
-            "id": "HR5",
-            "annex": "Annex III(5)",
-            "title": "Law Enforcement",
-            "description": "AI for law enforcement purposes",
-            "keywords": ["predictive policing", "crime prediction"],
-            "sector": "Law Enforcement",
-            "fine": "€15M or 3% global turnover"
-        }
-    ],
-    "limited_risk_systems": [
-        {
-            "id": "LR1",
-            "article": "Article 52(1)",
-            "title": "AI Interaction Transparency",
-            "description": "Systems interacting with humans",
-            "keywords": ["chatbot", "conversational ai", "virtual assistant"],
-            "fine": "€7.5M or 1.5% global turnover"
-        },
-        {
-            "id": "LR2",
-            "article": "Article 52(3)",
-            "title": "Deepfakes & Synthetic Media",
-            "description": "AI-generated content",
-            "keywords": ["deepfake", "synthetic media", "ai-generated"],
-            "fine": "€7.5M or 1.5% global turnover"
-        }
-    ]
-}
+"""
 
-# Initialize session state
-if 'assessments' not in st.session_state:
-    st.session_state.assessments = [
+def sample_assessments() -> List[Dict]:
+    return [
         {
             "id": 1,
             "system_name": "CV Screening AI",
@@ -209,190 +122,75 @@ if 'assessments' not in st.session_state:
         }
     ]
 
-if 'current_page' not in st.session_state:
-    st.session_state.current_page = 'dashboard'
+# Persistence
+@st.cache_resource
+def get_repository() -> AssessmentRepository:
+    repository = open_repository(os.environ.get('EUAI_DB_PATH', 'assessments.db'))
+    # Seeding is atomic, so server processes sharing the store add the demo data once
+    repository.seed(sample_assessments())
+    return repository
 
-# Risk Classification Engine
-class RiskClassifier:
-    def __init__(self):
-        self.rules = EU_AI_ACT_RULES
-    
-    def classify(self, use_case: str, context: str, data_types: List[str]) -> Dict:
-        text = f"{use_case} {context} {' '.join(data_types)}".lower()
-        
-        # Check prohibited practices
-        for practice in self.rules['prohibited_practices']:
-            if any(keyword in text for keyword in practice['keywords']):
-                return {
-                    'risk_level': 'unacceptable',
-                    'risk_score': 100,
-                    'matched_rules': [practice],
-                    'can_deploy': False,
-                    'fine_amount': practice['fine']
-                }
-        
-        # Check high-risk systems
-        high_risk_matches = []
-        for system in self.rules['high_risk_systems']:
-            matches = sum(1 for keyword in system['keywords'] if keyword in text)
-            if matches >= 1:
-                high_risk_matches.append(system)
-        
-        if high_risk_matches:
-            base_score = 60
-            bonus = min(len(high_risk_matches) * 10, 25)
-            score = min(base_score + bonus, 95)
-            
-            return {
-                'risk_level': 'high',
-                'risk_score': score,
-                'matched_rules': high_risk_matches,
-                'can_deploy': True,
-                'fine_amount': high_risk_matches[0]['fine']
-            }
-        
-        # Check limited risk
-        for system in self.rules['limited_risk_systems']:
-            if any(keyword in text for keyword in system['keywords']):
-                return {
-                    'risk_level': 'limited',
-                    'risk_score': 35,
-                    'matched_rules': [system],
-                    'can_deploy': True,
-                    'fine_amount': system['fine']
-                }
-        
-        return {
-            'risk_level': 'minimal',
-            'risk_score': 15,
-            'matched_rules': [],
-            'can_deploy': True,
-            'fine_amount': 'N/A'
-        }
-    
-    def generate_recommendations(self, risk_level: str) -> List[str]:
-        if risk_level == 'unacceptable':
-            return [
-                "⛔ PROHIBITED - Cannot be deployed in EU",
-                "Consider alternative approaches",
-                "Consult legal experts immediately"
-            ]
-        elif risk_level == 'high':
-            return [
-                "📋 Establish risk management system (Article 9)",
-                "📊 Implement data governance (Article 10)",
-                "📄 Prepare technical documentation (Article 11)",
-                "👤 Design human oversight mechanisms (Article 14)",
-                "🛡️ Conduct conformity assessment"
-            ]
-        elif risk_level == 'limited':
-            return [
-                "ℹ️ Inform users of AI interaction (Article 52)",
-                "🏷️ Label AI-generated content",
-                "📝 Document transparency measures"
-            ]
-        else:
-            return [
-                "✅ No mandatory compliance",
-                "💡 Consider voluntary guidelines",
-                "📋 Document for internal governance"
-            ]
-
-# Visualization Functions
-def create_risk_gauge(risk_score: int, risk_level: str):
-    colors = {
-        'unacceptable': '#d32f2f',
-        'high': '#f57c00',
-        'limited': '#fbc02d',
-        'minimal': '#388e3c'
-    }
-    
-    fig = go.Figure(go.Indicator(
-        mode="gauge+number",
-        value=risk_score,
-        domain={'x': [0, 1], 'y': [0, 1]},
-        title={'text': "Risk Score", 'font': {'size': 20}},
-        gauge={
-            'axis': {'range': [None, 100]},
-            'bar': {'color': colors.get(risk_level, '#757575')},
-            'steps': [
-                {'range': [0, 25], 'color': '#e8f5e9'},
-                {'range': [25, 50], 'color': '#fffde7'},
-                {'range': [50, 75], 'color': '#fff3e0'},
-                {'range': [75, 100], 'color': '#ffebee'}
-            ],
-        }
-    ))
-    
-    fig.update_layout(height=300, margin=dict(l=20, r=20, t=50, b=20))
-    return fig
-
-def create_compliance_chart(compliance_score: int):
-    fig = go.Figure(go.Indicator(
-        mode="gauge+number",
-        value=compliance_score,
-        domain={'x': [0, 1], 'y': [0, 1]},
-        title={'text': "Compliance", 'font': {'size': 20}},
-        gauge={
-            'axis': {'range': [None, 100]},
-            'bar': {'color': "green" if compliance_score >= 80 else "orange"},
-            'steps': [
-                {'range': [0, 50], 'color': '#ffebee'},
-                {'range': [50, 80], 'color': '#fff3e0'},
-                {'range': [80, 100], 'color': '#e8f5e9'}
-            ],
-        }
-    ))
-    
-    fig.update_layout(height=300, margin=dict(l=20, r=20, t=50, b=20))
-    return fig
+# Change notifications: one watcher per process; every session compares the
+# version it last rendered and reruns only when the data actually changed
+REFRESH_SECONDS = float(os.environ.get('EUAI_REFRESH_SECONDS', 2))
 
-def create_risk_distribution():
-    df = pd.DataFrame(st.session_state.assessments)
-    risk_counts = df['risk_level'].value_counts()
-    
-    colors = {
-        'unacceptable': '#d32f2f',
-        'high': '#f57c00',
-        'limited': '#fbc02d',
-        'minimal': '#388e3c'
-    }
-    
-    fig = go.Figure(data=[go.Pie(
-        labels=risk_counts.index,
-        values=risk_counts.values,
-        marker=dict(colors=[colors.get(level, '#757575') for level in risk_counts.index]),
-        hole=0.4
-    )])
-    
-    fig.update_layout(title="Risk Distribution", height=400)
-    return fig
-
-def create_timeline():
-    df = pd.DataFrame(st.session_state.assessments)
-    df['date'] = pd.to_datetime(df['date'])
-    df = df.sort_values('date')
-    
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=df['date'],
-        y=df['risk_score'],
-        mode='lines+markers',
-        name='Risk Score',
-        marker=dict(size=10),
-        line=dict(color='#003399', width=2)
-    ))
-    
-    fig.update_layout(
-        title="Assessment Timeline",
-        xaxis_title="Date",
-        yaxis_title="Risk Score",
-        height=400
-    )
-    return fig
+@st.cache_resource
+def get_change_feed() -> ChangeFeed:
+    return ChangeFeed(get_repository(), interval=REFRESH_SECONDS)
+
+@st.fragment(run_every=REFRESH_SECONDS)
+def watch_changes():
+    version = get_change_feed().version
+    if version != st.session_state.get('data_version', version):
+        st.rerun()
+
+# Columnar snapshots for table views, shared by every session and rebuilt
+# only when the data version changes (the repository is not hashed)
+DETAIL_FIELDS = ('system_name', 'date', 'sector', 'risk_level', 'risk_score')
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def load_assessment_columns(data_version: int, _repository: AssessmentRepository,
+                            fields: Tuple[str, ...]) -> AssessmentColumns:
+    return _repository.to_columns(fields)
+
+# Standalone report downloads: one renderer per process, and each report built
+# once per assessment and data version instead of on every rerun
+@st.cache_resource
+def get_report_renderer():
+    from reports import ReportRenderer
+    return ReportRenderer(['html'], inline_charts=True)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def assessment_report(assessment_id: int, data_version: int, _assessment: Dict) -> str:
+    return get_report_renderer().system_html(_assessment)
+
+# Background jobs, shared by every session of this server process
+JOB_POLL_SECONDS = 0.5
+
+@st.cache_resource
+def get_job_queue() -> JobQueue:
+    return JobQueue(workers=int(os.environ.get('EUAI_JOB_WORKERS', 2)),
+                    max_pending=int(os.environ.get('EUAI_MAX_JOBS', 20)))
 
 # Main Application
 def main():
+    # Page Configuration
+    st.set_page_config(
+        page_title="EU AI Act Toolkit",
+        page_icon="🇪🇺",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    st.markdown(APP_CSS, unsafe_allow_html=True)
+    
+    # Initialize session state
+    if 'current_page' not in st.session_state:
+        st.session_state.current_page = 'dashboard'
+    
+    repository = get_repository()
+    # The version this run renders; writes after it trigger ``watch_changes``
+    st.session_state.data_version = get_change_feed().poll()
+    
     # Sidebar
     with st.sidebar:
         st.markdown("## 🇪🇺 Navigation")
@@ -410,26 +208,35 @@ def main():
         
         st.markdown("---")
         st.markdown("### 📈 Quick Stats")
-        st.metric("Total", len(st.session_state.assessments))
-        high_risk = sum(1 for a in st.session_state.assessments if a['risk_level'] in ['high', 'unacceptable'])
+        summary = repository.summary()
+        counts = summary['by_risk_level']
+        st.metric("Total", summary['total'])
+        high_risk = counts.get('high', 0) + counts.get('unacceptable', 0)
         st.metric("High Risk", high_risk)
         
         st.markdown("---")
         st.markdown("**Developed by:**  \nLm - AI Governance Expert  \nParis, France")
     
     # Route to pages
-    if st.session_state.current_page == 'dashboard':
-        show_dashboard()
-    elif st.session_state.current_page == 'assessment':
-        show_assessment_form()
-    elif st.session_state.current_page == 'analytics':
-        show_analytics()
-    elif st.session_state.current_page == 'history':
-        show_history()
-    elif st.session_state.current_page == 'about':
-        show_about()
+    page = st.session_state.current_page
+    with instrumentation.span(f"page.{page}"):
+        if page == 'dashboard':
+            show_dashboard()
+        elif page == 'assessment':
+            show_assessment_form()
+        elif page == 'analytics':
+            show_analytics()
+        elif page == 'history':
+            show_history()
+        elif page == 'about':
+            show_about()
+    if page in ('dashboard', 'analytics', 'history'):
+        watch_changes()
 
 def show_dashboard():
+    # Charts pull in plotly and pandas, so they are imported on first render
+    from charts import create_risk_distribution, create_timeline
+    
     st.markdown("""
     <div class="main-header">
         <h1 style="margin:0;">🇪🇺 EU AI Act Toolkit</h1>
@@ -437,6 +244,10 @@ def show_dashboard():
     </div>
     """, unsafe_allow_html=True)
     
+    repository = get_repository()
+    summary = repository.summary()
+    counts = summary['by_risk_level']
+    
     # Metrics
     col1, col2, col3, col4 = st.columns(4)
     
@@ -444,12 +255,12 @@ def show_dashboard():
         st.markdown(f"""
         <div class="metric-card">
             <h3 style="color: #003399; margin: 0;">Total</h3>
-            <p style="font-size: 2.5rem; margin: 0; font-weight: bold;">{len(st.session_state.assessments)}</p>
+            <p style="font-size: 2.5rem; margin: 0; font-weight: bold;">{summary['total']}</p>
         </div>
         """, unsafe_allow_html=True)
     
     with col2:
-        high = sum(1 for a in st.session_state.assessments if a['risk_level'] == 'high')
+        high = counts.get('high', 0)
         st.markdown(f"""
         <div class="metric-card">
             <h3 style="color: #f57c00; margin: 0;">High Risk</h3>
@@ -458,7 +269,7 @@ def show_dashboard():
         """, unsafe_allow_html=True)
     
     with col3:
-        limited = sum(1 for a in st.session_state.assessments if a['risk_level'] == 'limited')
+        limited = counts.get('limited', 0)
         st.markdown(f"""
         <div class="metric-card">
             <h3 style="color: #fbc02d; margin: 0;">Limited</h3>
@@ -467,7 +278,7 @@ def show_dashboard():
         """, unsafe_allow_html=True)
     
     with col4:
-        avg = sum(a['risk_score'] for a in st.session_state.assessments) / len(st.session_state.assessments)
+        avg = summary['mean_risk_score']
         st.markdown(f"""
         <div class="metric-card">
             <h3 style="color: #388e3c; margin: 0;">Avg Score</h3>
@@ -480,13 +291,13 @@ def show_dashboard():
     # Charts
     col1, col2 = st.columns(2)
     with col1:
-        st.plotly_chart(create_risk_distribution(), use_container_width=True)
+        st.plotly_chart(create_risk_distribution(repository), use_container_width=True)
     with col2:
-        st.plotly_chart(create_timeline(), use_container_width=True)
+        st.plotly_chart(create_timeline(repository), use_container_width=True)
     
     # Recent assessments
     st.markdown("### 📋 Recent Assessments")
-    recent = sorted(st.session_state.assessments, key=lambda x: x['date'], reverse=True)[:3]
+    recent = repository.recent(3)
     
     for a in recent:
         with st.expander(f"**{a['system_name']}** - {a['date']}"):
@@ -537,38 +348,105 @@ def show_assessment_form():
             if not all([system_name, use_case, context, data_types]):
                 st.error("Please fill all required fields")
             else:
-                classifier = RiskClassifier()
-                result = classifier.classify(use_case, context, data_types)
-                recommendations = classifier.generate_recommendations(result['risk_level'])
-                
-                compliance_score = 50 + len(data_types) * 5 if result['risk_level'] == 'high' else 85
-                
-                new_assessment = {
-                    'id': max([a['id'] for a in st.session_state.assessments]) + 1,
-                    'system_name': system_name,
-                    'use_case': use_case,
-                    'context': context,
-                    'data_types': data_types,
-                    'sector': sector,
-                    'risk_level': result['risk_level'],
-                    'risk_score': result['risk_score'],
-                    'compliance_score': compliance_score,
-                    'matched_rules': [r.get('id', 'N/A') for r in result['matched_rules']],
-                    'recommendations': recommendations,
-                    'can_deploy': result['can_deploy'],
-                    'fine_amount': result['fine_amount'],
-                    'date': datetime.now().strftime('%Y-%m-%d')
-                }
-                
-                st.session_state.assessments.append(new_assessment)
-                st.success("✅ Assessment Complete!")
-                st.balloons()
-                
-                # Show results
-                st.markdown("---")
-                show_results(new_assessment)
+                form = {'system_name': system_name, 'use_case': use_case, 'context': context,
+                        'data_types': data_types, 'sector': sector}
+                try:
+                    job = get_job_queue().submit(run_assessment, get_repository(), form,
+                                                 description=f"Assess {system_name}", total=2)
+                    st.session_state.assessment_job = job.id
+                except QueueFull:
+                    st.warning("Too many assessments in progress, please retry in a moment")
+    
+    show_assessment_job()
+
+def run_assessment(job: Job, repository: AssessmentRepository, form: Dict) -> Dict:
+    """Background job: classify a submitted form and store the assessment."""
+    classifier = RiskClassifier()
+    result = classifier.classify(form['use_case'], form['context'], form['data_types'],
+                                 explain=True)
+    matched_rules = [r.get('id', 'N/A') for r in result['matched_rules']]
+    compliance_score = compute_compliance_score(result['risk_level'], form['data_types'])
+    job.update(1)
+    
+    new_assessment = dict(form, **{
+        'risk_level': result['risk_level'],
+        'risk_score': result['risk_score'],
+        'compliance_score': compliance_score,
+        'matched_rules': matched_rules,
+        'can_deploy': result['can_deploy'],
+        'fine_amount': result['fine_amount'],
+        'date': datetime.now().strftime('%Y-%m-%d'),
+        'evidence': result['evidence']
+    })
+    new_assessment = repository.add(new_assessment)
+    job.update(2)
+    return new_assessment
+
+def show_job_progress(job: Job, label: str):
+    """Render an unfinished job, then rerun the page once it changes."""
+    snapshot = job.snapshot()
+    if snapshot['total']:
+        text = f"{label}: {snapshot['status']} ({snapshot['done']}/{snapshot['total']})"
+    else:
+        text = f"{label}: {snapshot['status']} ({snapshot['done']} so far)"
+    st.progress(snapshot['progress'] or 0.0, text=text)
+    job.wait_change(snapshot['version'], timeout=JOB_POLL_SECONDS)
+    st.rerun()
+
+def show_assessment_job():
+    job = get_job_queue().get(st.session_state.get('assessment_job', ''))
+    if job is None:
+        return
+    if not job.is_finished:
+        show_job_progress(job, "Analyzing system")
+    elif job.status == 'failed':
+        st.error(f"Assessment failed: {job.error}")
+        del st.session_state.assessment_job
+    elif job.status == 'done':
+        st.success("✅ Assessment Complete!")
+        if st.session_state.get('celebrated_job') != job.id:
+            st.session_state.celebrated_job = job.id
+            st.balloons()
+        
+        # Show results
+        st.markdown("---")
+        show_results(job.result)
+
+FIELD_LABELS = {'use_case': "Use case", 'context': "Context", 'data_types': "Data types"}
+
+def evidence_snippet(assessment: Dict, item: Dict, width: int = 40) -> str:
+    """HTML excerpt of the assessed field with the matched text highlighted."""
+    value = assessment.get(item['field']) or ''
+    if isinstance(value, list):
+        value = ' '.join(value)
+    # Offsets index the lowercased field; quote that text when lowercasing changed lengths
+    lowered = value.lower()
+    if len(lowered) != len(value):
+        value = lowered
+    start, end = item['start'], item['end']
+    before = ('…' if start > width else '') + value[max(0, start - width):start]
+    after = value[end:end + width] + ('…' if end + width < len(value) else '')
+    return (f"{html.escape(before)}<mark>{html.escape(value[start:end])}</mark>"
+            f"{html.escape(after)}")
+
+def obligation_detail(obligation) -> str:
+    """HTML line with the article, start date and evidence of an obligation."""
+    if obligation is None:
+        return ''
+    parts = [obligation.article,
+             f"applies from {obligation.deadline}" if obligation.deadline else None,
+             f"evidence: {', '.join(obligation.evidence)}" if obligation.evidence else None]
+    parts = [html.escape(part) for part in parts if part]
+    return f"<br><small>{' · '.join(parts)}</small>" if parts else ''
+
+def with_recommendations(assessment: Dict) -> Dict:
+    """Copy of an assessment with its recommendation texts, for downloads."""
+    table = get_obligation_table(EU_AI_ACT_RULES)
+    return dict(assessment, recommendations=list(table.recommendations_for(assessment)))
 
 def show_results(assessment):
+    from charts import create_compliance_chart, create_risk_gauge
+    
     risk_class = f"risk-{assessment['risk_level']}"
     
     st.markdown(f"""
@@ -597,11 +475,25 @@ def show_results(assessment):
         st.plotly_chart(create_compliance_chart(assessment['compliance_score']), 
                        use_container_width=True)
     
+    if assessment.get('evidence'):
+        st.markdown("### 🔎 Why this classification")
+        for item in assessment['evidence']:
+            st.markdown(f"""
+            <div class="recommendation-card evidence-card">
+                <strong>{html.escape(str(item['rule_id']))}</strong> ·
+                "{html.escape(item['keyword'])}" in {FIELD_LABELS.get(item['field'], item['field'])}:
+                {evidence_snippet(assessment, item)}
+            </div>
+            """, unsafe_allow_html=True)
+    
     st.markdown("### 💡 Recommendations")
-    for i, rec in enumerate(assessment['recommendations'], 1):
+    # Assessments keep only their risk level and matched rules; the texts,
+    # articles, start dates and evidence come from the shared obligation table
+    obligations = get_obligation_table(EU_AI_ACT_RULES).for_assessment(assessment)
+    for i, obligation in enumerate(obligations, 1):
         st.markdown(f"""
         <div class="recommendation-card">
-            <strong>{i}.</strong> {rec}
+            <strong>{i}.</strong> {obligation.text}{obligation_detail(obligation)}
         </div>
         """, unsafe_allow_html=True)
     
@@ -610,47 +502,189 @@ def show_results(assessment):
     
     # Export
     st.markdown("---")
-    col1, col2 = st.columns(2)
+    col1, col2, col3 = st.columns(3)
     with col1:
-        json_data = json.dumps(assessment, indent=2)
+        json_data = json.dumps(with_recommendations(assessment), indent=2)
         st.download_button("📄 Download JSON", json_data,
                           f"assessment_{assessment['id']}.json")
     with col2:
+        # A standalone report, with the gauges embedded
+        report = assessment_report(assessment['id'], get_repository().data_version(),
+                                   assessment)
+        st.download_button("🧾 Download Report", report,
+                           f"assessment_{assessment['id']}.html", mime="text/html")
+    with col3:
         if st.button("🏠 Back to Dashboard"):
             st.session_state.current_page = 'dashboard'
             st.rerun()
 
 def show_analytics():
+    from charts import create_risk_distribution, create_timeline
+    
     st.title("📊 Analytics")
     
-    if not st.session_state.assessments:
+    repository = get_repository()
+    if not repository.count():
         st.info("No data yet. Create assessments first!")
         return
     
     tab1, tab2 = st.tabs(["📈 Overview", "🎯 Details"])
     
     with tab1:
-        st.plotly_chart(create_timeline(), use_container_width=True)
-        st.plotly_chart(create_risk_distribution(), use_container_width=True)
+        granularity = st.radio("Timeline granularity", ["Auto", "Daily", "Weekly"],
+                               horizontal=True)
+        bucket = {'Auto': 'auto', 'Daily': 'day', 'Weekly': 'week'}[granularity]
+        st.plotly_chart(create_timeline(repository, bucket), use_container_width=True)
+        st.plotly_chart(create_risk_distribution(repository), use_container_width=True)
     
     with tab2:
-        df = pd.DataFrame(st.session_state.assessments)
-        st.dataframe(df[['system_name', 'date', 'sector', 'risk_level', 
-                        'risk_score']], use_container_width=True)
+        columns = load_assessment_columns(repository.data_version(), repository, DETAIL_FIELDS)
+        with instrumentation.span('dataframe.assessments'):
+            # Newest first, like the History page
+            df = columns.to_frame(DETAIL_FIELDS)[::-1]
+        st.dataframe(df, use_container_width=True, hide_index=True,
+                     column_config={'date': st.column_config.DateColumn(format="YYYY-MM-DD")})
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            export_format = st.selectbox("Export format", ["csv", "jsonl"])
+        with col2:
+            compress = st.checkbox("Gzip compressed")
+        
+        # Only build the export on request, streamed to disk chunk by chunk
+        if st.button("📦 Prepare Export"):
+            filename = f"assessments.{export_format}" + (".gz" if compress else "")
+            export_file = tempfile.NamedTemporaryFile(suffix=filename, delete=False)
+            export_file.close()
+            export_assessments(map(with_recommendations, repository.iter_all()),
+                               export_file.name)
+            with open(export_file.name, 'rb') as f:
+                st.download_button("📊 Download Export", f, filename)
+            os.unlink(export_file.name)
         
-        csv = df.to_csv(index=False)
-        st.download_button("📊 Export CSV", csv, "assessments.csv")
+        show_reports_export(repository)
+        
+        uploaded = st.file_uploader("Import assessments", type=["csv", "jsonl", "gz"])
+        if uploaded is not None and st.button("📥 Import"):
+            try:
+                job = get_job_queue().submit(run_import, repository, uploaded.getvalue(),
+                                             uploaded.name, description=f"Import {uploaded.name}")
+                st.session_state.import_job = job.id
+            except QueueFull:
+                st.warning("Too many jobs in progress, please retry in a moment")
+        
+        job = get_job_queue().get(st.session_state.get('import_job', ''))
+        if job is not None:
+            if not job.is_finished:
+                show_job_progress(job, "Importing assessments")
+            elif job.status == 'done':
+                st.success(f"Imported {job.result} assessments")
+            else:
+                st.error(f"Import {job.status}: {job.error}")
+
+# Report rendering processes for the Analytics page (0: every CPU core)
+REPORT_WORKERS = int(os.environ.get('EUAI_REPORT_WORKERS', '1'))
+
+def show_reports_export(repository: AssessmentRepository):
+    """Audit report archive for every assessment, built as a background job."""
+    formats = st.multiselect("Report formats", ["html", "pdf"], default=["html"])
+    if st.button("🗂️ Prepare Audit Reports") and formats:
+        try:
+            job = get_job_queue().submit(run_reports, repository, tuple(formats),
+                                         description="Audit reports", total=repository.count())
+            st.session_state.reports_job = job.id
+        except QueueFull:
+            st.warning("Too many jobs in progress, please retry in a moment")
+    
+    job = get_job_queue().get(st.session_state.get('reports_job', ''))
+    if job is None:
+        return
+    if not job.is_finished:
+        show_job_progress(job, "Rendering reports")
+    elif job.status == 'done':
+        with open(job.result, 'rb') as f:
+            st.download_button("🗂️ Download Audit Reports", f, "audit-reports.zip",
+                               mime="application/zip")
+    else:
+        st.error(f"Audit reports {job.status}: {job.error}")
+
+def run_reports(job: Job, repository: AssessmentRepository, formats: Tuple[str, ...]) -> str:
+    """Background job: render audit reports into a temporary zip and return its path."""
+    from reports import write_reports
+    
+    archive = tempfile.NamedTemporaryFile(suffix='.zip', delete=False)
+    archive.close()
+    write_reports(repository.iter_all(), archive.name, formats,
+                  workers=REPORT_WORKERS, progress=job.update)
+    return archive.name
+
+IMPORT_CHUNK_SIZE = 1000
+
+def run_import(job: Job, repository: AssessmentRepository, data: bytes, name: str) -> int:
+    """Background job: stream an uploaded CSV/JSONL export into the repository."""
+    raw = io.BytesIO(data)
+    stream = gzip.open(raw, 'rt', encoding='utf-8', newline='') \
+        if name.endswith('.gz') else io.TextIOWrapper(raw, encoding='utf-8', newline='')
+    imported = 0
+    for chunk in iter_chunks(read_assessments(stream, detect_format(name)), IMPORT_CHUNK_SIZE):
+        # Imported assessments get fresh ids from the repository
+        imported += repository.add_many(dict(assessment, id=None) for assessment in chunk)
+        job.update(imported)
+    return imported
+
+HISTORY_PAGE_SIZES = [10, 25, 50, 100]
+RISK_LEVELS = ['unacceptable', 'high', 'limited', 'minimal']
 
 def show_history():
     st.title("📚 Assessment History")
     
-    if not st.session_state.assessments:
+    repository = get_repository()
+    if not repository.count():
         st.info("No assessments yet")
         return
     
-    for a in sorted(st.session_state.assessments, key=lambda x: x['date'], reverse=True):
-        badges = {'unacceptable': '🔴', 'high': '🟠', 'limited': '🟡', 'minimal': '🟢'}
-        
+    # Filters are pushed down to the repository query
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        risk_level = st.selectbox("Risk Level", ["All"] + RISK_LEVELS)
+    with col2:
+        sector = st.selectbox("Sector", ["All"] + sorted(repository.summary()['by_sector']))
+    with col3:
+        date_range = st.date_input("Date Range", value=[])
+    with col4:
+        page_size = st.selectbox("Per Page", HISTORY_PAGE_SIZES)
+    
+    filters = {
+        'risk_level': None if risk_level == "All" else risk_level,
+        'sector': None if sector == "All" else sector,
+        'date_from': date_range[0].isoformat() if len(date_range) > 0 else None,
+        'date_to': date_range[-1].isoformat() if len(date_range) > 1 else None,
+    }
+    
+    # Keyset pagination: one (date, id) cursor per visited page, reset when
+    # the filters or the page size change
+    state_key = (tuple(filters.values()), page_size)
+    if st.session_state.get('history_key') != state_key:
+        st.session_state.history_key = state_key
+        st.session_state.history_cursors = [None]
+    cursors = st.session_state.history_cursors
+    
+    rows = repository.list(**filters, before=cursors[-1], limit=page_size + 1)
+    if not rows and len(cursors) > 1:
+        # A stale cursor (rows deleted or changed meanwhile): back to the first page
+        cursors[:] = [None]
+        rows = repository.list(**filters, limit=page_size + 1)
+    page, has_next = rows[:page_size], len(rows) > page_size
+    
+    total = repository.count(**filters)
+    if not total:
+        st.info("No assessments match these filters")
+        return
+    pages = -(-total // page_size)
+    st.caption(f"Page {len(cursors)} of {pages} · {total} assessments")
+    
+    badges = {'unacceptable': '🔴', 'high': '🟠', 'limited': '🟡', 'minimal': '🟢'}
+    for a in page:
         with st.expander(f"{badges[a['risk_level']]} {a['system_name']} - {a['date']}"):
             col1, col2, col3 = st.columns(3)
             with col1:
@@ -658,9 +692,18 @@ def show_history():
             with col2:
                 st.metric("Score", f"{a['risk_score']}/100")
             with col3:
-                st.metric("Sector", a['sector'])
+                st.metric("Sector", a.get('sector', 'N/A'))
             
-            st.markdown(f"**Use Case:** {a['use_case'][:200]}...")
+            st.markdown(f"**Use Case:** {a.get('use_case', '')[:200]}...")
+    
+    col1, _, col2 = st.columns([1, 4, 1])
+    with col1:
+        st.button("◀ Previous", disabled=len(cursors) == 1, use_container_width=True,
+                  on_click=cursors.pop)
+    with col2:
+        next_cursor = (page[-1]['date'], page[-1]['id']) if page else None
+        st.button("Next ▶", disabled=not has_next, use_container_width=True,
+                  on_click=cursors.append, args=(next_cursor,))
 
 def show_about():
     st.title("ℹ️ About")
@@ -692,4 +735,7 @@ def show_about():
     """)
 
 if __name__ == "__main__":
-    main()
+    # Opt-in timing of every rerun: EUAI_INSTRUMENT, EUAI_TRACE_PATH, EUAI_METRICS_PORT
+    instrumentation.configure_from_env()
+    with instrumentation.span('rerun'):
+        main()
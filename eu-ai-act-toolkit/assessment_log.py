@@ -0,0 +1,477 @@
+"""
+EU AI Act Toolkit - Append-only assessment log
+Memory-mapped fixed-width records with an interned string heap, for instant start-up
+"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+from contextlib import contextmanager
+from datetime import date as Date
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from storage import COLUMNS, JSON_COLUMNS, AssessmentRepository
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are only serialized within one process
+    fcntl = None
+
+# File suffix that ``storage.open_repository`` maps to ``LogRepository``
+LOG_SUFFIX = '.euailog'
+HEAP_SUFFIX = '.strings'
+
+RECORDS_MAGIC = b'EUAILOG1'
+HEAP_MAGIC = b'EUAISTR1'
+HEADER_SIZE = 16
+
+# Record operations; updates are new PUTs of the same id
+PUT, DELETE = 0, 1
+MISSING = -1
+
+# Fields stored as references into the string heap (0: field absent)
+STRING_FIELDS = ('system_name', 'use_case', 'context', 'data_types', 'sector', 'risk_level',
+                 'matched_rules', 'recommendations', 'fine_amount', 'date', 'evidence')
+# Repeated values written once and shared by every record holding them
+INTERNED_FIELDS = ('data_types', 'sector', 'risk_level', 'matched_rules', 'recommendations',
+                   'fine_amount', 'date')
+
+# On-disk record layout: explicit offsets keep the format independent of the platform
+RECORD = np.dtype({
+    'names': ['id', 'op', 'can_deploy', 'risk_score', 'compliance_score', 'days',
+              *(f"{name}_ref" for name in STRING_FIELDS)],
+    'formats': ['<i8', 'u1', 'i1', '<i2', '<i2', '<i4', *(['<u8'] * len(STRING_FIELDS))],
+    'offsets': [0, 8, 9, 10, 12, 16, *range(24, 24 + 8 * len(STRING_FIELDS), 8)],
+    'itemsize': 24 + 8 * len(STRING_FIELDS),
+})
+
+# Assessments encoded per write
+WRITE_BATCH = 10000
+_EPOCH = Date(1970, 1, 1).toordinal()
+_LENGTH = struct.Struct('<I')
+
+def _days(value: str) -> int:
+    return Date.fromisoformat(value[:10]).toordinal() - _EPOCH
+
+def _open(path: str, magic: bytes):
+    """Open (creating if needed) a log file and check its header."""
+    handle = open(path, 'a+b')
+    handle.seek(0)
+    header = handle.read(HEADER_SIZE)
+    if not header:
+        handle.write(magic + _LENGTH.pack(RECORD.itemsize).ljust(HEADER_SIZE - len(magic), b'\0'))
+        handle.flush()
+    elif header[:len(magic)] != magic or (magic == RECORDS_MAGIC and _LENGTH.unpack_from(
+            header, len(magic))[0] != RECORD.itemsize):
+        handle.close()
+        raise ValueError(f"{path} is not an assessment log of this version")
+    return handle
+
+class LogRepository(AssessmentRepository):
+    """Append-only, memory-mapped assessment store.
+
+    Assessments are fixed-width records in ``path``; their text lives in
+    ``path + '.strings'``, where repeated values (risk level, sector, date,
+    recommendation lists, ...) are written once. Opening a log maps both
+    files without reading them, and queries run as NumPy operations over the
+    mapped records, so start-up does not depend on the history size.
+
+    Updates and deletes append a new version or a tombstone for the id.
+    Any number of processes can read the same log while one writes: strings
+    are flushed before the records that reference them, readers ignore a
+    partially written record, and writers hold an exclusive ``flock``.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.RLock()
+        self._records_file = _open(path, RECORDS_MAGIC)
+        self._heap_file = _open(path + HEAP_SUFFIX, HEAP_MAGIC)
+        self._records_map = self._heap_map = None
+        self._decoded: Dict[int, str] = {}
+        # Live positions in (date, id) order and aggregates, per record count
+        self._view_cache: Optional[Tuple[int, np.ndarray]] = None
+        self._summary_cache: Optional[Tuple[int, Dict]] = None
+        # Writer side: interned string -> heap offset, valid up to a record count
+        self._interned: Dict[str, int] = {}
+        self._interned_count = -1
+
+    def close(self):
+        with self._lock:
+            # Arrays handed out may still reference the maps; they close with them
+            self._records_map = self._heap_map = None
+            self._view_cache = self._summary_cache = None
+            self._records_file.close()
+            self._heap_file.close()
+
+    # Reading
+
+    def _records(self) -> np.ndarray:
+        """The complete records written so far, as a view on the mapped file."""
+        with self._lock:
+            size = os.fstat(self._records_file.fileno()).st_size
+            if self._records_map is None or len(self._records_map) != size:
+                self._records_map = mmap.mmap(self._records_file.fileno(), 0,
+                                              access=mmap.ACCESS_READ)
+            count = (size - HEADER_SIZE) // RECORD.itemsize
+            return np.frombuffer(self._records_map, dtype=RECORD, count=count,
+                                 offset=HEADER_SIZE)
+
+    def _string(self, ref: int) -> Optional[str]:
+        if not ref:
+            return None
+        cached = self._decoded.get(ref)
+        if cached is not None:
+            return cached
+        start = ref + _LENGTH.size
+        with self._lock:
+            heap = self._heap_map
+            if (heap is None or start > len(heap)
+                    or start + _LENGTH.unpack_from(heap, ref)[0] > len(heap)):
+                # Written after the heap was mapped
+                heap = self._heap_map = mmap.mmap(self._heap_file.fileno(), 0,
+                                                  access=mmap.ACCESS_READ)
+        length, = _LENGTH.unpack_from(heap, ref)
+        return heap[start:start + length].decode('utf-8')
+
+    def _interned_string(self, ref: int) -> Optional[str]:
+        """``_string`` for low-cardinality fields, decoded once per process."""
+        if ref and ref not in self._decoded:
+            self._decoded[ref] = self._string(ref)
+        return self._decoded.get(ref)
+
+    def _to_dict(self, record) -> Dict:
+        assessment = {}
+        for name in COLUMNS:
+            if name in STRING_FIELDS:
+                ref = int(record[f"{name}_ref"])
+                value = (self._interned_string(ref) if name in INTERNED_FIELDS
+                         else self._string(ref))
+                if value is not None and name in JSON_COLUMNS:
+                    value = json.loads(value)
+            else:
+                value = int(record[name])
+                if value == MISSING and name != 'id':
+                    value = None
+                elif name == 'can_deploy':
+                    value = bool(value)
+            # Fields the assessment never had are left out
+            if value is not None:
+                assessment[name] = value
+        return assessment
+
+    def _view(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Records and the positions of live ones, oldest first by (date, id)."""
+        records = self._records()
+        cached = self._view_cache
+        if cached is not None and cached[0] == len(records):
+            return records, cached[1]
+
+        ids, ops = records['id'], records['op']
+        if (ops == PUT).all() and (np.diff(ids) > 0).all():
+            # Plain appends: every record is the only version of its id
+            live = np.arange(len(records))
+        else:
+            # Latest version of each id, dropped when it is a tombstone
+            _, last = np.unique(ids[::-1], return_index=True)
+            live = np.sort(len(records) - 1 - last)
+            live = live[ops[live] == PUT]
+        days, live_ids = records['days'][live], ids[live]
+        if not ((np.diff(days) >= 0).all() and (np.diff(live_ids) > 0).all()):
+            live = live[np.lexsort((live_ids, days))]
+        self._view_cache = (len(records), live)
+        return records, live
+
+    def _refs_matching(self, refs: np.ndarray, value: str) -> np.ndarray:
+        """Mask of ``refs`` pointing at ``value``, decoding each distinct ref once."""
+        wanted = [ref for ref in np.unique(refs).tolist() if self._interned_string(ref) == value]
+        return np.isin(refs, wanted)
+
+    def _select(self, risk_level: Optional[str] = None, sector: Optional[str] = None,
+                date_from: Optional[str] = None, date_to: Optional[str] = None,
+                before: Optional[Tuple[str, int]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Records and matching live positions, oldest first."""
+        records, live = self._view()
+        selected = records[live]
+        mask = np.ones(len(live), dtype=bool)
+        if risk_level is not None:
+            mask &= self._refs_matching(selected['risk_level_ref'], risk_level)
+        if sector is not None:
+            mask &= self._refs_matching(selected['sector_ref'], sector)
+        if date_from is not None:
+            mask &= selected['days'] >= _days(date_from)
+        if date_to is not None:
+            mask &= selected['days'] <= _days(date_to)
+        if before is not None:
+            days, key = selected['days'], _days(before[0])
+            mask &= (days < key) | ((days == key) & (selected['id'] < before[1]))
+        return records, live[mask]
+
+    def get(self, assessment_id: int) -> Optional[Dict]:
+        records = self._records()
+        positions = np.flatnonzero(records['id'] == assessment_id)
+        if not len(positions) or records['op'][positions[-1]] != PUT:
+            return None
+        return self._to_dict(records[positions[-1]])
+
+    def count(self, risk_level: Optional[str] = None, sector: Optional[str] = None,
+              date_from: Optional[str] = None, date_to: Optional[str] = None) -> int:
+        if risk_level is None and sector is None and date_from is None and date_to is None:
+            return len(self._view()[1])
+        return len(self._select(risk_level, sector, date_from, date_to)[1])
+
+    def count_by_level(self) -> Dict[str, int]:
+        return self.summary()['by_risk_level']
+
+    def average_risk_score(self) -> float:
+        return self.summary()['mean_risk_score']
+
+    def data_version(self) -> int:
+        # Every write appends at least one record
+        return len(self._records())
+
+    def _counts(self, refs: np.ndarray, missing: str = '') -> Dict[str, int]:
+        values, counts = np.unique(refs, return_counts=True)
+        totals: Dict[str, int] = {}
+        for ref, count in zip(values.tolist(), counts.tolist()):
+            key = self._interned_string(ref) if ref else missing
+            totals[key] = totals.get(key, 0) + count
+        return totals
+
+    def summary(self) -> Dict:
+        records, live = self._view()
+        cached = self._summary_cache
+        if cached is not None and cached[0] == len(records):
+            return cached[1]
+        selected = records[live]
+        count = len(selected)
+        compliance = selected['compliance_score'].astype(np.int64)
+        summary = {
+            'total': count,
+            'mean_risk_score': float(selected['risk_score'].mean()) if count else 0.0,
+            'mean_compliance_score': (float(np.where(compliance == MISSING, 0, compliance).mean())
+                                      if count else 0.0),
+            'by_risk_level': self._counts(selected['risk_level_ref']),
+            'by_sector': self._counts(selected['sector_ref']),
+            'by_date': dict(sorted(self._counts(selected['date_ref']).items())),
+        }
+        self._summary_cache = (len(records), summary)
+        return summary
+
+    def list(self, risk_level: Optional[str] = None, sector: Optional[str] = None,
+             date_from: Optional[str] = None, date_to: Optional[str] = None,
+             limit: Optional[int] = None, offset: int = 0,
+             before: Optional[Tuple[str, int]] = None) -> List[Dict]:
+        records, positions = self._select(risk_level, sector, date_from, date_to, before)
+        # Newest first: only the requested page is decoded
+        page = positions[::-1][offset:None if limit is None else offset + limit]
+        return [self._to_dict(records[position]) for position in page]
+
+    def scores_by_date(self) -> List[Tuple[str, int]]:
+        records, live = self._view()
+        selected = records[live]
+        return [(self._interned_string(ref), score) for ref, score in
+                zip(selected['date_ref'].tolist(), selected['risk_score'].tolist())]
+
+    def timeline(self, bucket: str = 'day') -> List[Tuple[str, int, int, float, int]]:
+        if bucket not in ('day', 'week'):
+            raise KeyError(bucket)
+        records, live = self._view()
+        if not len(live):
+            return []
+        days = records['days'][live].astype(np.int64)
+        if bucket == 'week':
+            # Back to Monday; 1970-01-01 was a Thursday
+            days -= (days + 3) % 7
+        scores = records['risk_score'][live].astype(np.int64)
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(days)) + 1))
+        counts = np.diff(np.append(starts, len(days)))
+        sums = np.add.reduceat(scores, starts)
+        return [(Date.fromordinal(_EPOCH + day).isoformat(), count, low, total / count, high)
+                for day, count, low, total, high in zip(
+                    days[starts].tolist(), counts.tolist(),
+                    np.minimum.reduceat(scores, starts).tolist(), sums.tolist(),
+                    np.maximum.reduceat(scores, starts).tolist())]
+
+    def ids(self) -> List[int]:
+        records, live = self._view()
+        return records['id'][live].tolist()
+
+    def iter_all(self, batch_size: int = 1000) -> Iterator[Dict]:
+        records, live = self._view()
+        for start in range(0, len(live), batch_size):
+            for position in live[start:start + batch_size]:
+                yield self._to_dict(records[position])
+
+    # Writing
+
+    @contextmanager
+    def _writing(self):
+        """Hold the write lock (threads and processes) with the heap and tail checked."""
+        with self._lock:
+            if fcntl is not None:
+                fcntl.flock(self._records_file.fileno(), fcntl.LOCK_EX)
+            try:
+                size = os.fstat(self._records_file.fileno()).st_size
+                tail = (size - HEADER_SIZE) % RECORD.itemsize
+                if tail:
+                    # A writer died mid-record; readers already ignore the fragment
+                    self._records_file.truncate(size - tail)
+                records = self._records()
+                if self._interned_count != len(records):
+                    # Another process may have written since: re-learn interned offsets
+                    refs = np.unique(np.concatenate(
+                        [records[f"{name}_ref"] for name in INTERNED_FIELDS]))
+                    self._interned = {self._string(ref): ref for ref in refs.tolist() if ref}
+                yield records
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self._records_file.fileno(), fcntl.LOCK_UN)
+
+    def _append(self, encoded: np.ndarray, heap: bytearray):
+        # Strings first, so no record is ever visible before the text it references
+        if heap:
+            self._heap_file.write(heap)
+            self._heap_file.flush()
+        self._records_file.write(encoded.tobytes())
+        self._records_file.flush()
+        self._interned_count = len(self._records())
+
+    def _string_store(self):
+        """A ``store(value, interned) -> ref`` function and the heap bytes it adds."""
+        self._heap_file.seek(0, os.SEEK_END)
+        heap_end, heap = self._heap_file.tell(), bytearray()
+
+        def store(value: str, interned: bool) -> int:
+            if interned and value in self._interned:
+                return self._interned[value]
+            ref = heap_end + len(heap)
+            data = value.encode('utf-8')
+            heap.extend(_LENGTH.pack(len(data)) + data)
+            if interned:
+                self._interned[value] = ref
+            return ref
+        return store, heap
+
+    def _encode(self, assessments: List[Dict], next_id: int) -> Tuple[np.ndarray, bytearray, int]:
+        """Records for ``assessments`` and the heap bytes they add (ids from ``next_id``)."""
+        store, heap = self._string_store()
+        encoded = np.zeros(len(assessments), dtype=RECORD)
+        ids = []
+        for assessment in assessments:
+            assessment_id = assessment.get('id')
+            if assessment_id is None:
+                assessment_id, next_id = next_id, next_id + 1
+            ids.append(assessment_id)
+        encoded['id'] = ids
+        # Field at a time, so NumPy fills each column in one assignment
+        for name in ('risk_score', 'compliance_score', 'can_deploy'):
+            encoded[name] = [MISSING if assessment.get(name) is None else int(assessment[name])
+                             for assessment in assessments]
+        encoded['days'] = [_days(assessment['date']) for assessment in assessments]
+        for name in STRING_FIELDS:
+            interned, as_json = name in INTERNED_FIELDS, name in JSON_COLUMNS
+            values = [assessment.get(name) for assessment in assessments]
+            encoded[f"{name}_ref"] = [
+                0 if value is None else
+                store(json.dumps(value, ensure_ascii=False) if as_json else value, interned)
+                for value in values]
+        return encoded, heap, next_id
+
+    @staticmethod
+    def _next_id(records: np.ndarray) -> int:
+        return int(records['id'].max()) + 1 if len(records) else 1
+
+    def add(self, assessment: Dict) -> Dict:
+        with self._writing() as records:
+            encoded, heap, _ = self._encode([assessment], self._next_id(records))
+            self._append(encoded, heap)
+        return dict(assessment, id=int(encoded[0]['id']))
+
+    def add_many(self, assessments: Iterable[Dict]) -> int:
+        with self._writing() as records:
+            return self._append_all(records, assessments)
+
+    def seed(self, assessments: Iterable[Dict]) -> int:
+        with self._writing() as records:
+            if len(self._view()[1]):
+                return 0
+            return self._append_all(records, assessments)
+
+    def _append_all(self, records: np.ndarray, assessments: Iterable[Dict]) -> int:
+        """Append ``assessments`` in batches; the caller holds the write lock."""
+        assessments, total = iter(assessments), 0
+        next_id = self._next_id(records)
+        while True:
+            batch = list(islice(assessments, WRITE_BATCH))
+            if not batch:
+                return total
+            encoded, heap, next_id = self._encode(batch, next_id)
+            next_id = max(next_id, int(encoded['id'].max()) + 1)
+            self._append(encoded, heap)
+            total += len(batch)
+
+    def delete(self, assessment_id: int) -> bool:
+        if self.get(assessment_id) is None:
+            return False
+        with self._writing():
+            tombstone = np.zeros(1, dtype=RECORD)
+            tombstone['id'] = assessment_id
+            tombstone['op'] = DELETE
+            self._append(tombstone, bytearray())
+        return True
+
+    def update_results(self, results: Iterable[Dict]) -> int:
+        results = {result['id']: result for result in results}
+        with self._writing() as records:
+            _, live = self._view()
+            current = live[np.isin(records['id'][live], list(results))]
+            # New versions of the assessments; their free text is referenced, not copied
+            kept_text = ('system_name', 'use_case', 'context', 'evidence')
+            updated, keep_evidence = [], []
+            for position in current.tolist():
+                result = results[int(records['id'][position])]
+                stored = self._to_dict(records[position])
+                assessment = {name: value for name, value in stored.items()
+                              if name not in kept_text}
+                assessment.update((name, value) for name, value in result.items()
+                                  if name != 'evidence' or value is not None)
+                updated.append(assessment)
+                keep_evidence.append(result.get('evidence') is None)
+            if not updated:
+                return 0
+            encoded, heap, _ = self._encode(updated, 0)
+            for name in kept_text[:3]:
+                encoded[f"{name}_ref"] = records[f"{name}_ref"][current]
+            keep_evidence = np.array(keep_evidence)
+            encoded['evidence_ref'][keep_evidence] = records['evidence_ref'][current][keep_evidence]
+            self._append(encoded, heap)
+        return len(updated)
+
+    def update_scores(self, scores: Iterable[Tuple[int, str, int, int]]) -> int:
+        scores = list(scores)
+        with self._writing() as records:
+            _, live = self._view()
+            if not scores or not len(live):
+                return 0
+            by_id = live[np.argsort(records['id'][live])]
+            ids = records['id'][by_id]
+            wanted = np.array([assessment_id for assessment_id, *_ in scores], dtype=np.int64)
+            index = np.minimum(np.searchsorted(ids, wanted), len(ids) - 1)
+            found = ids[index] == wanted
+            if not found.any():
+                return 0
+            # New versions of the current records carrying the new scores
+            updated = records[by_id[index[found]]].copy()
+            scores = [score for score, hit in zip(scores, found.tolist()) if hit]
+            store, heap = self._string_store()
+            updated['risk_level_ref'] = [store(level, True) for _, level, _, _ in scores]
+            updated['risk_score'] = [risk_score for _, _, risk_score, _ in scores]
+            updated['compliance_score'] = [compliance for _, _, _, compliance in scores]
+            self._append(updated, heap)
+        return len(scores)
@@ -0,0 +1,52 @@
+"""
+EU AI Act Toolkit - Columnar store memory benchmark
+Compares a synthetic history loaded as assessment dicts with AssessmentColumns
+
+Usage: python benchmarks/bench_columnar.py [--records 1000000]
+"""
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from corpus import assessment_database
+from storage import SQLiteRepository
+
+def traced(load):
+    """Result of ``load()``, its seconds and the bytes it still holds afterwards."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = load()
+    elapsed = time.perf_counter() - start
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, elapsed, held
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument('--records', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    repository = SQLiteRepository(assessment_database(args.records))
+    rows, dict_seconds, dict_bytes = traced(repository.list)
+    del rows
+    columns, column_seconds, column_bytes = traced(repository.to_columns)
+    _, frame_seconds, _ = traced(lambda: columns.to_frame(['system_name', 'date', 'sector',
+                                                           'risk_level', 'risk_score']))
+
+    print(f"{'store':>8} {'MB':>9} {'bytes/row':>10} {'load s':>7}")
+    print(f"{'dicts':>8} {dict_bytes / 1e6:9.1f} {dict_bytes / args.records:10.0f} "
+          f"{dict_seconds:7.2f}")
+    print(f"{'columns':>8} {column_bytes / 1e6:9.1f} {column_bytes / args.records:10.0f} "
+          f"{column_seconds:7.2f}")
+    print(f"reduction {dict_bytes / column_bytes:.1f}x; "
+          f"5-column DataFrame from the columns in {frame_seconds:.2f}s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+EU AI Act Toolkit - Keyword matching benchmark
+Compares the substring matcher with token matching (exact and fuzzy)
+
+Usage: python benchmarks/bench_matching.py [--records 100000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from corpus import FILLER, synthetic_corpus
+from euai_core import EU_AI_ACT_RULES, RiskClassifier, create_matcher, fold, rule_translations
+
+FILLER_FR = ("le système traite les commandes des clients et classe les produits selon "
+             "l'historique d'achat les délais de livraison et les rapports internes").split()
+
+def multilingual_corpus(size: int, seed: int = 0):
+    """French descriptions with translated keywords in half of them."""
+    rng = random.Random(seed)
+    keywords = [k for rules in EU_AI_ACT_RULES.values() for rule in rules
+                for k in rule_translations(rule)['fr']]
+    records = []
+    for _ in range(size):
+        words = [rng.choice(FILLER_FR) for _ in range(rng.randint(10, 80))]
+        if rng.random() < 0.5:
+            words.insert(rng.randrange(len(words)), rng.choice(keywords).capitalize())
+        records.append({'use_case': ' '.join(words), 'context': ' '.join(rng.sample(FILLER, 3))})
+    return records
+
+def with_translations(rules):
+    """Rules whose substring keywords also include every translation (accents folded)."""
+    return {category: [dict(rule, keywords=rule['keywords'] + [
+                fold(k) for keywords in rule_translations(rule).values() for k in keywords])
+                for rule in category_rules]
+            for category, category_rules in rules.items()}
+
+def timed(classifier, records):
+    start = time.perf_counter()
+    flagged = sum(result['risk_level'] != 'minimal' for result in classifier.classify_batch(records))
+    return time.perf_counter() - start, flagged
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument('--records', type=int, default=100_000)
+    args = parser.parse_args()
+
+    corpora = {'english': synthetic_corpus(args.records),
+               'french': multilingual_corpus(args.records)}
+    matchers = {
+        'substring': create_matcher(EU_AI_ACT_RULES),
+        # Same multilingual vocabulary as the token matcher, for a like-for-like cost
+        'substring+': create_matcher(with_translations(EU_AI_ACT_RULES)),
+        'token': create_matcher(EU_AI_ACT_RULES, 'token'),
+        'token~1': create_matcher(EU_AI_ACT_RULES, 'token', max_edits=1),
+    }
+    print(f"{'corpus':>8} {'matcher':>10} {'seconds':>8} {'rec/sec':>10} {'flagged':>8}")
+    for corpus, records in corpora.items():
+        for name, matcher in matchers.items():
+            elapsed, flagged = timed(RiskClassifier(matcher=matcher), records)
+            print(f"{corpus:>8} {name:>10} {elapsed:8.2f} {len(records) / elapsed:10,.0f} "
+                  f"{flagged / len(records):8.1%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+EU AI Act Toolkit - Parallel classification scaling benchmark
+Classifies a synthetic corpus serially and with 1..N worker processes
+
+Usage: python benchmarks/bench_parallel.py [--records 100000] [--max-workers N]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from corpus import synthetic_corpus
+from euai_core import RiskClassifier
+from parallel import ParallelClassifier
+
+def timed(classifier, records) -> float:
+    start = time.perf_counter()
+    for _ in classifier.classify_batch(records):
+        pass
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument('--records', type=int, default=100_000)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunk-size', type=int, default=2000)
+    args = parser.parse_args()
+
+    records = synthetic_corpus(args.records)
+    serial = timed(RiskClassifier(), records)
+    print(f"{'workers':>8} {'seconds':>8} {'rec/sec':>10} {'speedup':>8}")
+    print(f"{'serial':>8} {serial:8.2f} {len(records) / serial:10,.0f} {1.0:8.2f}")
+
+    for workers in range(1, args.max_workers + 1):
+        with ParallelClassifier(workers=workers, chunk_size=args.chunk_size) as classifier:
+            # Start the pool outside the timed region
+            list(classifier.classify_batch(records[:workers]))
+            elapsed = timed(classifier, records)
+        print(f"{workers:>8} {elapsed:8.2f} {len(records) / elapsed:10,.0f} {serial / elapsed:8.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+EU AI Act Toolkit - Report rendering benchmark
+Renders audit report archives for synthetic assessments with 1..N worker processes
+
+Usage: python benchmarks/bench_reports.py [--systems 2000] [--formats html,pdf] [--max-workers N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from corpus import synthetic_assessments
+from reports import write_reports
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument('--systems', type=int, default=2000)
+    parser.add_argument('--formats', default='html')
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunk-size', type=int, default=20)
+    args = parser.parse_args()
+
+    assessments = [dict(assessment, id=position, system_name=f"System {position}")
+                   for position, assessment in enumerate(synthetic_assessments(args.systems), 1)]
+    formats = args.formats.split(',')
+    print(f"{'workers':>8} {'seconds':>8} {'sys/sec':>10} {'MB':>8} {'speedup':>8}")
+    serial = None
+    with tempfile.TemporaryDirectory() as directory:
+        for workers in range(1, args.max_workers + 1):
+            stats = write_reports(assessments, os.path.join(directory, f"{workers}.zip"),
+                                  formats, workers=workers, chunk_size=args.chunk_size)
+            serial = serial or stats['seconds']
+            print(f"{workers:>8} {stats['seconds']:8.2f} {stats['systems_per_sec']:10,.0f} "
+                  f"{stats['bytes'] / 1e6:8.1f} {serial / stats['seconds']:8.2f}")
+
+if __name__ == "__main__":
+    main()
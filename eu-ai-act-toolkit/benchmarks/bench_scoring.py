@@ -0,0 +1,65 @@
+"""
+EU AI Act Toolkit - Vectorized scoring benchmark
+Re-scores a synthetic portfolio per record and with the NumPy scoring engine
+
+Usage: python benchmarks/bench_scoring.py [--records 1000000] [--matched 100000]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from corpus import synthetic_corpus
+from euai_core import RULE_CATEGORIES, RiskClassifier, compute_compliance_score
+from euai_core.scoring import ScoringMatrix, rule_columns
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument('--records', type=int, default=1_000_000)
+    parser.add_argument('--matched', type=int, default=100_000,
+                        help="records actually matched; the portfolio repeats them")
+    args = parser.parse_args()
+
+    records = synthetic_corpus(args.matched)
+    start = time.perf_counter()
+    base = ScoringMatrix.from_records(records)
+    built = time.perf_counter() - start
+    repeats = -(-args.records // len(base))
+    matrix = ScoringMatrix(np.tile(base.rule_hits, (repeats, 1))[:args.records],
+                           np.tile(base.data_type_counts, (repeats, 1))[:args.records],
+                           base.rules, base.data_types)
+    print(f"matched {len(base):,} records in {built:.2f}s ({len(base) / built:,.0f} rec/sec)")
+
+    weights = {'high_match_bonus': 15}
+    classifier = RiskClassifier(weights=weights)
+    # Per-record baseline: the same matches through classify_matches()
+    columns = rule_columns(base.rules)
+    matches = []
+    for row in base.rule_hits:
+        match = {category: [] for category in RULE_CATEGORIES}
+        for column in np.flatnonzero(row):
+            category, index = columns[column]
+            match[category].append(index)
+        matches.append(match)
+    counts = base.data_type_counts.sum(axis=1).tolist()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for match, count in zip(matches, counts):
+            result = classifier.classify_matches(match)
+            compute_compliance_score(result['risk_level'], [None] * count, classifier.weights)
+    per_record = (time.perf_counter() - start) * args.records / (repeats * len(base))
+
+    start = time.perf_counter()
+    matrix.score(weights)
+    vectorized = time.perf_counter() - start
+    print(f"{'engine':>11} {'seconds':>8} {'rec/sec':>12}")
+    print(f"{'per-record':>11} {per_record:8.2f} {args.records / per_record:12,.0f}")
+    print(f"{'vectorized':>11} {vectorized:8.2f} {args.records / vectorized:12,.0f}")
+
+if __name__ == '__main__':
+    main()
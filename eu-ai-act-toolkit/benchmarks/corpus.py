@@ -0,0 +1,108 @@
+"""
+EU AI Act Toolkit - Synthetic benchmark data
+Seeded generators for descriptions, rule packs and stored assessments
+"""
+
+import random
+import sys
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from euai_core import EU_AI_ACT_RULES, RULE_CATEGORIES
+
+FILLER = ("the system processes customer orders and ranks products for users based on "
+          "purchase history delivery times support tickets and internal reports").split()
+
+DATA_TYPES = ["Personal data", "Biometric data", "Sensitive data",
+              "Financial data", "Behavioral data", "Text data"]
+SECTORS = ["Employment", "Healthcare", "Education", "Financial Services",
+           "Law Enforcement", "Customer Service", "Other"]
+SYLLABLES = "ka ri to ne mu sa lo vi de pa zu fe ho gi".split()
+
+def synthetic_corpus(size: int, seed: int = 0, min_words: int = 10, max_words: int = 80,
+                     keyword_rate: float = 0.5, rules: Dict = EU_AI_ACT_RULES) -> List[Dict]:
+    """Records of ``min_words``..``max_words`` filler words, ``keyword_rate`` of them with a keyword."""
+    rng = random.Random(seed)
+    keywords = [k for category_rules in rules.values() for rule in category_rules
+                for k in rule['keywords']]
+    records = []
+    for _ in range(size):
+        words = [rng.choice(FILLER) for _ in range(rng.randint(min_words, max_words))]
+        if rng.random() < keyword_rate:
+            words.insert(rng.randrange(len(words)), rng.choice(keywords))
+        records.append({
+            'use_case': ' '.join(words),
+            'context': ' '.join(rng.choice(FILLER) for _ in range(rng.randint(3, 15))),
+            'data_types': rng.sample(["Personal data", "Biometric data", "Text data"], rng.randint(0, 2)),
+        })
+    return records
+
+def synthetic_rules(size: int, seed: int = 0, keywords_per_rule: int = 4) -> Dict:
+    """A valid rule pack of ``size`` rules with made-up one and two word keywords."""
+    rng = random.Random(seed)
+    rules: Dict[str, List[Dict]] = {category: [] for category in RULE_CATEGORIES}
+    for number in range(size):
+        category = RULE_CATEGORIES[number % len(RULE_CATEGORIES)]
+        keywords = [' '.join(''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+                             for _ in range(rng.randint(1, 2)))
+                    for _ in range(keywords_per_rule)]
+        rules[category].append({'id': f"S{number}", 'title': f"Synthetic rule {number}",
+                                'keywords': keywords, 'fine': "€1M"})
+    return rules
+
+def synthetic_assessments(size: int, seed: int = 0, days: int = 730,
+                          distinct: int = 5000) -> Iterator[Dict]:
+    """Stored-assessment dicts spread over ``days`` days.
+
+    ``distinct`` descriptions are classified for real and then reused, so
+    generating a million assessments stays cheap.
+    """
+    from euai_core import RiskClassifier, compute_compliance_score
+
+    rng = random.Random(seed)
+    classifier = RiskClassifier()
+    base = []
+    for record in synthetic_corpus(min(size, distinct), seed, max_words=30):
+        data_types = rng.sample(DATA_TYPES, rng.randint(1, 3))
+        result = classifier.classify(record['use_case'], record['context'], data_types)
+        base.append({
+            'use_case': record['use_case'],
+            'context': record['context'],
+            'data_types': data_types,
+            'risk_level': result['risk_level'],
+            'risk_score': result['risk_score'],
+            'compliance_score': compute_compliance_score(result['risk_level'], data_types),
+            'matched_rules': [rule['id'] for rule in result['matched_rules']],
+            'can_deploy': result['can_deploy'],
+            'fine_amount': result['fine_amount'],
+        })
+    start = date(2024, 1, 1)
+    for number in range(size):
+        yield {**base[number % len(base)],
+               'system_name': f"System {number}",
+               'sector': rng.choice(SECTORS),
+               'date': (start + timedelta(days=rng.randrange(days))).isoformat()}
+
+# Bumped whenever ``synthetic_assessments`` changes, so cached databases are rebuilt
+ASSESSMENTS_VERSION = 1
+DATA_DIR = Path(tempfile.gettempdir()) / 'euai-bench'
+
+def assessment_database(size: int, data_dir: Path = DATA_DIR) -> str:
+    """Path of a SQLite database of ``size`` synthetic assessments, generated once."""
+    from storage import SQLiteRepository
+
+    path = Path(data_dir) / f"assessments-{size}-v{ASSESSMENTS_VERSION}.db"
+    if not path.exists():
+        print(f"generating {size:,} assessments into {path}", flush=True)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_suffix('.tmp')
+        partial.unlink(missing_ok=True)
+        repository = SQLiteRepository(str(partial))
+        repository.add_many(synthetic_assessments(size))
+        repository.close()
+        partial.rename(path)
+    return str(path)
@@ -0,0 +1,267 @@
+"""
+EU AI Act Toolkit - Benchmark suite
+Times classification, aggregates, charts, export and imports; writes JSON comparable across commits
+
+Usage: python benchmarks/run.py [-o results.json] [--baseline old.json] [--sizes 1000,100000]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from corpus import DATA_DIR, assessment_database, synthetic_corpus, synthetic_rules
+from euai_core import EU_AI_ACT_RULES, RULE_CATEGORIES, RiskClassifier
+
+# Bumped whenever benchmark names or workloads change meaning
+SUITE_VERSION = 1
+# The fields of the Analytics details table
+DETAIL_FIELDS = ('system_name', 'date', 'sector', 'risk_level', 'risk_score')
+GROUPS = ('import', 'classify', 'batch', 'aggregates', 'charts', 'export')
+
+def measure(fn: Callable, repeat: int = 5, min_time: float = 0.05) -> Dict:
+    """Per-call seconds of ``fn``: looped to run at least ``min_time`` per round."""
+    start = time.perf_counter()
+    fn()
+    once = time.perf_counter() - start
+    loops = max(1, int(min_time / once)) if once > 0 else 1000
+    rounds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        rounds.append((time.perf_counter() - start) / loops)
+    return {'min': min(rounds), 'median': statistics.median(rounds),
+            'stdev': statistics.stdev(rounds) if len(rounds) > 1 else 0.0,
+            'rounds': repeat, 'loops': loops}
+
+def with_synthetic_rules(size: int) -> Dict:
+    """The built-in rules plus ``size`` synthetic ones."""
+    extra = synthetic_rules(size)
+    return {category: EU_AI_ACT_RULES.get(category, []) + extra[category]
+            for category in RULE_CATEGORIES}
+
+class Suite:
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.results: List[Dict] = []
+
+    def wanted(self, name: str) -> bool:
+        return not self.args.only or any(part in name for part in self.args.only)
+
+    def bench(self, group: str, name: str, fn: Callable, items: int = 1,
+              repeat: Optional[int] = None, **params):
+        if not self.wanted(name):
+            return
+        result = measure(fn, repeat or self.args.repeat, self.args.min_time)
+        result.update(group=group, name=name, params=params, items=items,
+                      per_second=items / result['median'] if result['median'] else None)
+        self.results.append(result)
+        rate = f"{result['per_second']:14,.0f}/s" if items > 1 else ' ' * 16
+        print(f"{name:48} {result['median'] * 1000:12.3f} ms {rate}", flush=True)
+
+    def run(self):
+        for group in self.args.groups:
+            getattr(self, f"bench_{group}")()
+
+    def bench_import(self):
+        for module in ('euai_core', 'app'):
+            code = ("import time; start = time.perf_counter(); "
+                    f"import {module}; print(time.perf_counter() - start)")
+            name = f"import[{module}]"
+            if not self.wanted(name):
+                continue
+            # Fresh interpreters, so the timing is always a cold import
+            rounds = [float(subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True,
+                                           capture_output=True, text=True).stdout)
+                      for _ in range(self.args.repeat)]
+            result = {'min': min(rounds), 'median': statistics.median(rounds),
+                      'stdev': statistics.stdev(rounds) if len(rounds) > 1 else 0.0,
+                      'rounds': len(rounds), 'loops': 1, 'group': 'import', 'name': name,
+                      'params': {'module': module}, 'items': 1, 'per_second': None}
+            self.results.append(result)
+            print(f"{name:48} {result['median'] * 1000:12.3f} ms", flush=True)
+
+    def bench_classify(self):
+        for rule_count in self.args.rule_counts:
+            rules = with_synthetic_rules(rule_count) if rule_count else EU_AI_ACT_RULES
+            classifier = RiskClassifier(rules)
+            for words in self.args.words:
+                records = synthetic_corpus(200, min_words=words, max_words=words, rules=rules)
+                args = [(r['use_case'], r['context'], r['data_types']) for r in records]
+
+                def classify_all():
+                    for use_case, context, data_types in args:
+                        classifier.classify(use_case, context, data_types)
+
+                self.bench('classify', f"classify[words={words},rules={rule_count or 'builtin'}]",
+                           classify_all, items=len(args), words=words, extra_rules=rule_count)
+
+    def bench_batch(self):
+        from parallel import ParallelClassifier
+
+        records = synthetic_corpus(self.args.records)
+        classifier = RiskClassifier()
+        self.bench('batch', f"classify_batch[records={len(records)}]",
+                   lambda: list(classifier.classify_batch(records)), items=len(records), repeat=3,
+                   records=len(records))
+        with ParallelClassifier(workers=os.cpu_count() or 1) as parallel:
+            self.bench('batch', f"parallel_batch[records={len(records)}]",
+                       lambda: list(parallel.classify_batch(records)), items=len(records),
+                       repeat=3, records=len(records), workers=parallel.workers)
+
+    def repository(self, size: int):
+        """A SQLite repository of ``size`` synthetic assessments, cached in ``--data-dir``."""
+        from storage import SQLiteRepository
+
+        return SQLiteRepository(assessment_database(size, self.args.data_dir))
+
+    def bench_aggregates(self):
+        for size in self.args.sizes:
+            repository = self.repository(size)
+            self.bench('aggregates', f"summary[n={size}]", repository.summary, n=size)
+            self.bench('aggregates', f"timeline_week[n={size}]",
+                       lambda: repository.timeline('week'), n=size)
+            self.bench('aggregates', f"list_page[n={size}]",
+                       lambda: repository.list(risk_level='high', limit=50), n=size)
+            self.bench('aggregates', f"to_columns[n={size}]",
+                       lambda: repository.to_columns(DETAIL_FIELDS), items=size, repeat=3, n=size)
+            repository.close()
+
+    def bench_charts(self):
+        import charts
+
+        for size in self.args.sizes:
+            repository = self.repository(size)
+
+            # Cleared before every call, so this is always the uncached render path
+            def cold_timeline():
+                charts._timeline_figure.clear()
+                charts.create_timeline(repository)
+
+            def cold_distribution():
+                charts._risk_distribution_figure.clear()
+                charts.create_risk_distribution(repository)
+
+            self.bench('charts', f"create_timeline[n={size}]", cold_timeline, n=size)
+            self.bench('charts', f"create_risk_distribution[n={size}]", cold_distribution, n=size)
+            repository.close()
+
+    def bench_export(self):
+        from streaming import export_assessments
+
+        for size in self.args.sizes:
+            repository = self.repository(size)
+            for fmt in ('csv', 'jsonl'):
+                with tempfile.TemporaryDirectory() as tmp:
+                    target = os.path.join(tmp, f"export.{fmt}")
+                    self.bench('export', f"export_{fmt}[n={size}]",
+                               lambda: export_assessments(repository.iter_all(), target),
+                               items=size, repeat=3, n=size, format=fmt)
+            repository.close()
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, check=True,
+                              capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def metadata(args: argparse.Namespace) -> Dict:
+    return {
+        'suite_version': SUITE_VERSION,
+        'commit': git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'sizes': args.sizes,
+        'records': args.records,
+    }
+
+def compare(results: List[Dict], baseline: Dict, threshold: float) -> List[Dict]:
+    """Median-to-median ratios against a baseline run; returns the regressions."""
+    previous = {result['name']: result for result in baseline['results']}
+    regressions = []
+    print(f"\n{'benchmark':48} {'baseline ms':>12} {'now ms':>12} {'ratio':>7}")
+    for result in results:
+        old = previous.get(result['name'])
+        if old is None:
+            continue
+        ratio = result['median'] / old['median']
+        flag = ''
+        if ratio > 1 + threshold:
+            flag = '  REGRESSION'
+            regressions.append({'name': result['name'], 'ratio': ratio})
+        elif ratio < 1 - threshold:
+            flag = '  faster'
+        print(f"{result['name']:48} {old['median'] * 1000:12.3f} {result['median'] * 1000:12.3f} "
+              f"{ratio:7.2f}{flag}")
+    return regressions
+
+def int_list(value: str) -> List[int]:
+    return [int(part) for part in value.split(',') if part]
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument('-o', '--output', help="write results as JSON to this file")
+    parser.add_argument('--baseline', help="JSON results of an earlier run to compare against")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="relative slowdown reported as a regression (default 0.25)")
+    parser.add_argument('--groups', type=lambda v: v.split(','), default=list(GROUPS),
+                        help=f"comma-separated subset of {','.join(GROUPS)}")
+    parser.add_argument('--only', action='append',
+                        help="only run benchmarks whose name contains this (repeatable)")
+    parser.add_argument('--sizes', type=int_list, default=[1000, 100_000],
+                        help="stored assessments for aggregates/charts/export, e.g. 1000,100000,1000000")
+    parser.add_argument('--records', type=int, default=20_000, help="records per batch run")
+    parser.add_argument('--words', type=int_list, default=[10, 80, 400],
+                        help="use-case lengths in words")
+    parser.add_argument('--rule-counts', type=int_list, default=[0, 200, 2000],
+                        help="synthetic rules added to the built-in ones (0 = built-in only)")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.05,
+                        help="minimum seconds per round; fast calls are looped")
+    parser.add_argument('--data-dir', default=str(DATA_DIR),
+                        help="where generated assessment databases are kept between runs")
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    unknown = set(args.groups) - set(GROUPS)
+    if unknown:
+        print(f"Unknown groups: {', '.join(sorted(unknown))}", file=sys.stderr)
+        return 2
+
+    suite = Suite(args)
+    suite.run()
+    report = {'meta': metadata(args), 'results': suite.results}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline['meta'].get('suite_version') != SUITE_VERSION:
+            print("Baseline was written by another suite version; names may not line up",
+                  file=sys.stderr)
+        regressions = compare(suite.results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}", file=sys.stderr)
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""
+EU AI Act Toolkit - Change notifications
+One data-version watcher per process that sessions and pollers subscribe to
+"""
+
+import threading
+from typing import Callable, Dict, Optional
+
+from storage import AssessmentRepository
+
+class ChangeFeed:
+    """Watches a repository's ``data_version`` and tells subscribers when it moves.
+
+    A single daemon thread polls the repository every ``interval`` seconds, so
+    the cost does not grow with the number of sessions; writes by other
+    processes sharing the store are picked up the same way. Readers check the
+    in-memory ``version``, block in ``wait_change`` or register a callback
+    with ``subscribe``. ``poll`` checks right away, e.g. after a write.
+    """
+
+    def __init__(self, repository: AssessmentRepository, interval: float = 2.0,
+                 start: bool = True):
+        self.repository = repository
+        self.interval = interval
+        self.version = repository.data_version()
+        self._changed = threading.Condition()
+        self._subscribers: Dict[int, Callable[[int], None]] = {}
+        self._next_token = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if start:
+            self._thread = threading.Thread(target=self._watch, name='euai-change-feed',
+                                            daemon=True)
+            self._thread.start()
+
+    def _watch(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception:
+                # A busy or briefly unavailable store is retried on the next tick
+                continue
+
+    def poll(self) -> int:
+        """Read the data version now, notifying subscribers if it changed."""
+        version = self.repository.data_version()
+        with self._changed:
+            if version == self.version:
+                return version
+            self.version = version
+            self._changed.notify_all()
+            subscribers = list(self._subscribers.values())
+        for callback in subscribers:
+            callback(version)
+        return version
+
+    def wait_change(self, version: int, timeout: Optional[float] = None) -> int:
+        """Block until the data version differs from ``version``; returns the current one."""
+        with self._changed:
+            self._changed.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+    def subscribe(self, callback: Callable[[int], None]) -> int:
+        """Call ``callback(version)`` on every change; returns a token for ``unsubscribe``."""
+        with self._changed:
+            self._next_token += 1
+            self._subscribers[self._next_token] = callback
+            return self._next_token
+
+    def unsubscribe(self, token: int) -> bool:
+        with self._changed:
+            return self._subscribers.pop(token, None) is not None
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
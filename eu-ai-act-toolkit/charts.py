@@ -0,0 +1,169 @@
+"""
+EU AI Act Toolkit - Charts
+Plotly gauges, risk distribution and timeline figures for the Streamlit UI
+"""
+
+from typing import Dict
+
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from euai_core.instrumentation import instrumented, span
+from storage import AssessmentRepository
+
+@instrumented('chart.create_risk_gauge')
+def create_risk_gauge(risk_score: int, risk_level: str):
+    colors = {
+        'unacceptable': '#d32f2f',
+        'high': '#f57c00',
+        'limited': '#fbc02d',
+        'minimal': '#388e3c'
+    }
+    
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=risk_score,
+        domain={'x': [0, 1], 'y': [0, 1]},
+        title={'text': "Risk Score", 'font': {'size': 20}},
+        gauge={
+            'axis': {'range': [None, 100]},
+            'bar': {'color': colors.get(risk_level, '#757575')},
+            'steps': [
+                {'range': [0, 25], 'color': '#e8f5e9'},
+                {'range': [25, 50], 'color': '#fffde7'},
+                {'range': [50, 75], 'color': '#fff3e0'},
+                {'range': [75, 100], 'color': '#ffebee'}
+            ],
+        }
+    ))
+    
+    fig.update_layout(height=300, margin=dict(l=20, r=20, t=50, b=20))
+    return fig
+
+@instrumented('chart.create_compliance_chart')
+def create_compliance_chart(compliance_score: int):
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=compliance_score,
+        domain={'x': [0, 1], 'y': [0, 1]},
+        title={'text': "Compliance", 'font': {'size': 20}},
+        gauge={
+            'axis': {'range': [None, 100]},
+            'bar': {'color': "green" if compliance_score >= 80 else "orange"},
+            'steps': [
+                {'range': [0, 50], 'color': '#ffebee'},
+                {'range': [50, 80], 'color': '#fff3e0'},
+                {'range': [80, 100], 'color': '#e8f5e9'}
+            ],
+        }
+    ))
+    
+    fig.update_layout(height=300, margin=dict(l=20, r=20, t=50, b=20))
+    return fig
+
+# Timelines with more assessments than this are aggregated into buckets
+MAX_TIMELINE_POINTS = 500
+
+def choose_timeline_bucket(summary: Dict) -> str:
+    if summary['total'] <= MAX_TIMELINE_POINTS:
+        return 'raw'
+    if len(summary['by_date']) <= MAX_TIMELINE_POINTS:
+        return 'day'
+    return 'week'
+
+@instrumented('chart.create_risk_distribution')
+def create_risk_distribution(repository: AssessmentRepository):
+    return _risk_distribution_figure(repository.data_version(), repository)
+
+# Figures are memoized on the repository data version, so they are only
+# rebuilt after assessments change (the underscored repository is not hashed)
+@st.cache_data(max_entries=8, show_spinner=False)
+def _risk_distribution_figure(data_version: int, _repository: AssessmentRepository):
+    risk_counts = sorted(_repository.count_by_level().items(),
+                         key=lambda item: item[1], reverse=True)
+    labels = [level for level, _ in risk_counts]
+    
+    colors = {
+        'unacceptable': '#d32f2f',
+        'high': '#f57c00',
+        'limited': '#fbc02d',
+        'minimal': '#388e3c'
+    }
+    
+    fig = go.Figure(data=[go.Pie(
+        labels=labels,
+        values=[count for _, count in risk_counts],
+        marker=dict(colors=[colors.get(level, '#757575') for level in labels]),
+        hole=0.4
+    )])
+    
+    fig.update_layout(title="Risk Distribution", height=400)
+    return fig
+
+@instrumented('chart.create_timeline')
+def create_timeline(repository: AssessmentRepository, bucket: str = 'auto'):
+    """Timeline of risk scores; ``bucket`` is 'auto', 'raw', 'day' or 'week'.
+
+    In 'auto' mode every assessment is plotted for small histories, and
+    larger ones are aggregated server-side into daily or weekly buckets so
+    the number of rendered points stays bounded.
+    """
+    if bucket == 'auto':
+        bucket = choose_timeline_bucket(repository.summary())
+    return _timeline_figure(repository.data_version(), bucket, repository)
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _timeline_figure(data_version: int, bucket: str, _repository: AssessmentRepository):
+    fig = go.Figure()
+    
+    if bucket == 'raw':
+        with span('dataframe.timeline'):
+            df = pd.DataFrame(_repository.scores_by_date(), columns=['date', 'risk_score'])
+        df['date'] = pd.to_datetime(df['date'])
+        fig.add_trace(go.Scatter(
+            x=df['date'],
+            y=df['risk_score'],
+            mode='lines+markers',
+            name='Risk Score',
+            marker=dict(size=10),
+            line=dict(color='#003399', width=2)
+        ))
+        title = "Assessment Timeline"
+    else:
+        rows = list(_repository.timeline(bucket))
+        # No assessments yet: an empty figure with the usual layout
+        if rows:
+            periods, counts, lows, means, highs = zip(*rows)
+            dates = pd.to_datetime(list(periods))
+            # Min-max band behind the mean line
+            fig.add_trace(go.Scatter(
+                x=dates, y=highs, mode='lines', line=dict(width=0),
+                name='Max', showlegend=False, hoverinfo='skip'
+            ))
+            fig.add_trace(go.Scatter(
+                x=dates, y=lows, mode='lines', line=dict(width=0),
+                fill='tonexty', fillcolor='rgba(0, 51, 153, 0.15)',
+                name='Min-Max', hoverinfo='skip'
+            ))
+            fig.add_trace(go.Scatter(
+                x=dates,
+                y=means,
+                mode='lines+markers',
+                name='Mean Risk Score',
+                customdata=list(zip(counts, lows, highs)),
+                hovertemplate="%{x|%Y-%m-%d}<br>Mean: %{y:.1f}<br>"
+                              "Min: %{customdata[1]} / Max: %{customdata[2]}<br>"
+                              "Assessments: %{customdata[0]}<extra></extra>",
+                marker=dict(size=6),
+                line=dict(color='#003399', width=2)
+            ))
+        title = f"Assessment Timeline ({'daily' if bucket == 'day' else 'weekly'})"
+    
+    fig.update_layout(
+        title=title,
+        xaxis_title="Date",
+        yaxis_title="Risk Score",
+        height=400
+    )
+    return fig
@@ -0,0 +1,294 @@
+"""
+EU AI Act Toolkit - Headless batch classification
+Classifies AI system inventories from CSV/JSONL without the Streamlit UI
+"""
+
+import argparse
+import json
+import sys
+import time
+from itertools import tee
+from typing import Dict, Iterable, List, Optional, TextIO
+
+from euai_core import (EU_AI_ACT_RULES, LANGUAGES, MATCHING_MODES, ObligationTable, ResultCache,
+                       RiskClassifier, RulePack, compute_compliance_score, create_matcher,
+                       get_obligation_table, instrumentation, parse_data_types)
+from streaming import RecordWriter, detect_format, iter_chunks, open_text, read_records
+
+RESULT_FIELDS = ['risk_level', 'risk_score', 'compliance_score',
+                 'matched_rules', 'can_deploy', 'fine_amount']
+# Added after the result fields by --explain
+EVIDENCE_FIELD = 'evidence'
+# Added after the result fields by --dedup (euai_core.dedup.GROUP_FIELD)
+GROUP_FIELD = 'duplicate_group'
+# Added after the result fields by --obligations
+OBLIGATIONS_FIELD = 'obligations'
+
+def build_result(record: Dict, result: Dict,
+                 obligations: Optional[ObligationTable] = None) -> Dict:
+    """Input record with the classification fields; given an ``obligations``
+    table, also the ids of the obligations that apply (a shared tuple)."""
+    data_types = parse_data_types(record.get('data_types'))
+    row = dict(record)
+    row.update({
+        'risk_level': result['risk_level'],
+        'risk_score': result['risk_score'],
+        'compliance_score': compute_compliance_score(result['risk_level'], data_types),
+        'matched_rules': [r.get('id', 'N/A') for r in result['matched_rules']],
+        'can_deploy': result['can_deploy'],
+        'fine_amount': result['fine_amount'],
+    })
+    for field in (EVIDENCE_FIELD, GROUP_FIELD):
+        if field in result:
+            row[field] = result[field]
+    if obligations is not None:
+        row[OBLIGATIONS_FIELD] = obligations.obligation_ids(row['risk_level'],
+                                                            row['matched_rules'])
+    return row
+
+class ResultWriter(RecordWriter):
+    """Writes result rows with the classification columns after the input columns."""
+
+    def write_chunk(self, rows: List[Dict]):
+        if self.fieldnames is None and rows:
+            result_fields = RESULT_FIELDS + [
+                f for f in [EVIDENCE_FIELD, GROUP_FIELD, OBLIGATIONS_FIELD] if f in rows[0]]
+            self.fieldnames = [f for f in rows[0] if f not in result_fields] + result_fields
+        if self.fmt == 'csv':
+            # Evidence items are mappings; CSV cells hold them as JSON
+            rows = [dict(row, evidence=json.dumps(row[EVIDENCE_FIELD], ensure_ascii=False))
+                    if EVIDENCE_FIELD in row else row for row in rows]
+        super().write_chunk(rows)
+
+def run_batch(records: Iterable[Dict], writer: ResultWriter, chunk_size: int = 1000,
+              classifier=None,
+              progress: Optional[TextIO] = None, explain: bool = False,
+              obligations: Optional[ObligationTable] = None) -> Dict:
+    """Classify records chunk by chunk and write the results.
+
+    ``classifier`` is anything with a ``classify_batch`` method, by default a
+    single ``RiskClassifier``. With ``explain`` each row also gets the
+    ``evidence`` behind its matched rules, and with an ``obligations`` table
+    the ids of the obligations that apply.
+
+    Returns run statistics: ``records``, ``seconds`` and ``records_per_sec``.
+    """
+    classifier = classifier or RiskClassifier()
+    total = 0
+    start = time.perf_counter()
+
+    # The classifier may read ahead (e.g. a process pool), so pair each
+    # result with its record through a tee rather than per-chunk calls
+    records, to_classify = tee(records)
+    results = (classifier.classify_batch(to_classify, explain=True) if explain
+               else classifier.classify_batch(to_classify))
+
+    for chunk in iter_chunks(zip(records, results), chunk_size):
+        with instrumentation.span('write_chunk'):
+            writer.write_chunk([build_result(record, result, obligations)
+                                for record, result in chunk])
+        total += len(chunk)
+        if progress is not None:
+            elapsed = time.perf_counter() - start
+            progress.write(f"\r{total} records ({total / elapsed:,.0f} records/sec)")
+            progress.flush()
+
+    elapsed = time.perf_counter() - start
+    return {
+        'records': total,
+        'seconds': elapsed,
+        'records_per_sec': total / elapsed if elapsed > 0 else 0.0,
+    }
+
+def add_cache_arguments(parser: argparse.ArgumentParser):
+    group = parser.add_argument_group("result cache")
+    group.add_argument('--cache-size', type=int, default=0,
+                       help="Cache up to N classification results in memory (default: 0, off)")
+    group.add_argument('--cache-ttl', type=float,
+                       help="Expire cached results after this many seconds")
+    group.add_argument('--cache-path',
+                       help="SQLite file persisting cached results across runs and workers")
+
+def cache_from_args(args: argparse.Namespace) -> Optional[ResultCache]:
+    if not args.cache_size and not args.cache_path:
+        return None
+    return ResultCache(max_size=args.cache_size or 10000, ttl=args.cache_ttl,
+                       path=args.cache_path)
+
+def add_dedup_arguments(parser: argparse.ArgumentParser):
+    group = parser.add_argument_group("deduplication")
+    group.add_argument('--dedup', choices=['exact', 'near'],
+                       help="Classify one record per group of duplicate descriptions and share "
+                            "its result: identical text only, or also near duplicates")
+    group.add_argument('--dedup-threshold', type=float, default=0.8,
+                       help="Minimum estimated similarity of near duplicates (default: 0.8)")
+    group.add_argument('--dedup-report',
+                       help="Write the duplicate groups (size, representative, risk level) "
+                            "to this CSV/JSONL file")
+
+def write_dedup_report(classifier, path: str):
+    """Write the groups of a ``DedupClassifier`` with more than one record."""
+    fields = ['group', 'size', 'exact_duplicates', 'near_duplicates', 'min_similarity',
+              'representative', 'risk_level', 'use_case', 'context']
+    with open_text(path, 'w') as stream:
+        writer = RecordWriter(stream, detect_format(path), fields)
+        for chunk in iter_chunks(classifier.groups(), 1000):
+            writer.write_chunk(chunk)
+
+def add_instrumentation_arguments(parser: argparse.ArgumentParser):
+    group = parser.add_argument_group("instrumentation")
+    group.add_argument('--instrument', action='store_true',
+                       help="Record timing spans and counters (also EUAI_INSTRUMENT=1)")
+    group.add_argument('--trace-file',
+                       help="Write recorded spans as a JSON trace to this file on exit "
+                            "(also EUAI_TRACE_PATH)")
+    group.add_argument('--metrics-port', type=int,
+                       help="Serve Prometheus text metrics on this local port "
+                            "(also EUAI_METRICS_PORT)")
+
+def instrumentation_from_args(args: argparse.Namespace) -> Optional[instrumentation.Recorder]:
+    if args.instrument or args.trace_file or args.metrics_port:
+        instrumentation.enable(trace_path=args.trace_file)
+        if args.metrics_port:
+            instrumentation.serve_metrics(args.metrics_port)
+    return instrumentation.configure_from_env()
+
+def add_rules_arguments(parser: argparse.ArgumentParser):
+    group = parser.add_argument_group("rule pack")
+    group.add_argument('--rules',
+                       help="JSON/YAML rule pack, or a .pkl snapshot (default: built-in EU AI Act rules)")
+    group.add_argument('--rules-snapshot',
+                       help="Reuse/write the compiled rule pack at this path for faster start-up")
+    group.add_argument('--matching', choices=MATCHING_MODES, default='substring',
+                       help="Keyword matching: raw substrings, or normalized and stemmed "
+                            "multilingual tokens (default: substring)")
+    group.add_argument('--languages', default=','.join(LANGUAGES),
+                       help="Token matching languages (default: %(default)s)")
+    group.add_argument('--max-edits', type=int, default=0,
+                       help="Token matching typo tolerance in edits (default: 0)")
+
+def matcher_options_from_args(args: argparse.Namespace) -> Dict:
+    if args.matching == 'substring':
+        return {}
+    return {'matching': args.matching, 'languages': tuple(args.languages.split(',')),
+            'max_edits': args.max_edits}
+
+def rule_pack_from_args(args: argparse.Namespace,
+                        cache: Optional[ResultCache] = None) -> Optional[RulePack]:
+    if not args.rules:
+        return None
+    return RulePack(args.rules, cache=cache, snapshot_path=args.rules_snapshot,
+                    **matcher_options_from_args(args))
+
+def matcher_from_args(args: argparse.Namespace, rule_pack: Optional[RulePack] = None):
+    if rule_pack is not None:
+        return rule_pack.classifier.matcher
+    return create_matcher(EU_AI_ACT_RULES, **matcher_options_from_args(args))
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='euai-classify',
+        description="Classify AI system inventories against the EU AI Act")
+    parser.add_argument('input', help="Input CSV or JSONL file, optionally .gz ('-' for stdin)")
+    parser.add_argument('-o', '--output', default='-',
+                        help="Output CSV or JSONL file, optionally .gz (default: stdout)")
+    parser.add_argument('--input-format', choices=['csv', 'jsonl'])
+    parser.add_argument('--output-format', choices=['csv', 'jsonl'])
+    parser.add_argument('--chunk-size', type=int, default=1000,
+                        help="Records classified and written per chunk")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Worker processes; 0 uses every CPU core (default: 1)")
+    parser.add_argument('--progress', action='store_true',
+                        help="Report progress on stderr after every chunk")
+    parser.add_argument('--explain', action='store_true',
+                        help="Add an evidence column with the keyword, field and character "
+                             "span behind each matched rule")
+    parser.add_argument('--obligations', action='store_true',
+                        help="Add an obligations column with the ids of the obligations that "
+                             "apply (see GET /recommendations for their detail)")
+    add_rules_arguments(parser)
+    add_cache_arguments(parser)
+    add_dedup_arguments(parser)
+    add_instrumentation_arguments(parser)
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    recorder = instrumentation_from_args(args)
+    try:
+        input_format = detect_format(args.input, args.input_format)
+        output_format = detect_format(args.output, args.output_format or
+                                      (input_format if args.output == '-' else None))
+    except ValueError as e:
+        parser.error(f"{e}, use --input-format/--output-format")
+    cache = cache_from_args(args)
+    if cache is not None and args.workers != 1:
+        parser.error("the result cache requires --workers 1")
+    if args.dedup and args.workers != 1:
+        parser.error("--dedup requires --workers 1")
+    if args.dedup_report and not args.dedup:
+        parser.error("--dedup-report requires --dedup")
+    try:
+        rule_pack = rule_pack_from_args(args, cache)
+        matcher = matcher_from_args(args, rule_pack)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    source = sys.stdin if args.input == '-' else open_text(args.input)
+    target = sys.stdout if args.output == '-' else open_text(args.output, 'w')
+    classifier = rule_pack or RiskClassifier(cache=cache, matcher=matcher)
+    if args.workers != 1:
+        from parallel import ParallelClassifier
+        classifier = ParallelClassifier(matcher=matcher, workers=args.workers or None,
+                                        chunk_size=args.chunk_size)
+    if args.dedup:
+        from euai_core.dedup import DedupClassifier
+        try:
+            classifier = DedupClassifier(classifier, near_duplicates=args.dedup == 'near',
+                                         threshold=args.dedup_threshold)
+        except ValueError as e:
+            parser.error(str(e))
+    try:
+        stats = run_batch(read_records(source, input_format),
+                          ResultWriter(target, output_format),
+                          chunk_size=args.chunk_size,
+                          classifier=classifier,
+                          progress=sys.stderr if args.progress else None,
+                          explain=args.explain,
+                          obligations=get_obligation_table(matcher.rules)
+                          if args.obligations else None)
+    finally:
+        if classifier is not None and hasattr(classifier, 'close'):
+            classifier.close()
+        if cache is not None:
+            cache.close()
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
+    if args.progress:
+        sys.stderr.write('\n')
+    sys.stderr.write(f"Classified {stats['records']} records in {stats['seconds']:.2f}s "
+                     f"({stats['records_per_sec']:,.0f} records/sec)\n")
+    if args.dedup:
+        dedup_stats = classifier.stats()
+        sys.stderr.write(f"Deduplication: {dedup_stats['groups']} groups classified, "
+                         f"{dedup_stats['exact_duplicates']} exact and "
+                         f"{dedup_stats['near_duplicates']} near duplicates shared "
+                         f"({dedup_stats['duplicate_rate']:.0%})\n")
+        if args.dedup_report:
+            write_dedup_report(classifier, args.dedup_report)
+    if cache is not None:
+        cache_stats = cache.stats()
+        sys.stderr.write(f"Result cache: {cache_stats['hits']} hits, "
+                         f"{cache_stats['misses']} misses ({cache_stats['hit_rate']:.0%})\n")
+    if recorder is not None:
+        for name, span in recorder.snapshot()['spans'].items():
+            sys.stderr.write(f"{name}: {span['count']} calls, {span['mean_ms']:.3f} ms mean, "
+                             f"{span['max_ms']:.3f} ms max\n")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
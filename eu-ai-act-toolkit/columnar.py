@@ -0,0 +1,264 @@
+"""
+EU AI Act Toolkit - Columnar assessment store
+Compact NumPy columns with dictionary-encoded categories and interned list values
+"""
+
+import json
+import sys
+from array import array
+from datetime import date as Date
+from itertools import accumulate, islice
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Repeated strings, stored as small integer codes into a category list
+CATEGORY_COLUMNS = ('risk_level', 'sector', 'fine_amount')
+# Lists, interned as tuples: identical lists (e.g. the recommendations of one
+# risk level) are stored once and referenced by id
+SET_COLUMNS = ('data_types', 'matched_rules', 'recommendations')
+# Free text, concatenated into one UTF-8 buffer per column with row offsets
+TEXT_COLUMNS = ('system_name', 'use_case', 'context', 'evidence')
+# Stored with MISSING for absent values
+NUMERIC_COLUMNS = {'id': np.int64, 'risk_score': np.int16, 'compliance_score': np.int16,
+                   'can_deploy': np.int8}
+MISSING = -1
+# Rows encoded per pass while building
+BUILD_BATCH = 10000
+_EPOCH = Date(1970, 1, 1).toordinal()
+_NO_DATE = np.iinfo(np.int64).min  # NaT
+
+# Field order of ``row()``, matching ``storage.COLUMNS``
+FIELDS = ['id', 'system_name', 'use_case', 'context', 'data_types', 'sector',
+          'risk_level', 'risk_score', 'compliance_score', 'matched_rules',
+          'recommendations', 'can_deploy', 'fine_amount', 'date', 'evidence']
+
+class AssessmentColumns:
+    """Read-only assessments held column by column.
+
+    A million assessments as dicts cost several kilobytes each (one dict,
+    per-row lists and a fresh copy of every repeated string). Here a row
+    costs its text bytes plus a few bytes of integer codes. ``to_frame``
+    hands the numeric and category columns to pandas without copying them.
+
+    Build one with ``from_records`` (or ``AssessmentRepository.to_columns``);
+    ``row(i)`` gives back the dict of assessment ``i``.
+    """
+
+    def __init__(self, numeric: Dict[str, np.ndarray], dates: Optional[np.ndarray],
+                 categories: Dict[str, Tuple[np.ndarray, List[str]]],
+                 sets: Dict[str, Tuple[np.ndarray, List[Tuple]]],
+                 texts: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]], size: int):
+        self.numeric = numeric
+        self.dates = dates
+        self.categories = categories
+        self.sets = sets
+        self.texts = texts
+        self.size = size
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def fields(self) -> List[str]:
+        """The fields held, in ``FIELDS`` order."""
+        held = {*self.numeric, *self.categories, *self.sets, *self.texts}
+        if self.dates is not None:
+            held.add('date')
+        return [name for name in FIELDS if name in held]
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict],
+                     fields: Sequence[str] = FIELDS) -> 'AssessmentColumns':
+        """Encode assessment dicts (as returned by a repository) in one pass."""
+        return cls.from_rows((tuple(record.get(name) for name in fields) for record in records),
+                             fields)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence],
+                  fields: Sequence[str] = FIELDS) -> 'AssessmentColumns':
+        """Encode value tuples in ``fields`` order, e.g. straight from a SQL cursor.
+
+        List and evidence values may also be given as their JSON text (as
+        stored by ``SQLiteRepository``): identical texts are decoded once.
+        """
+        unknown = set(fields) - set(FIELDS)
+        if unknown:
+            raise KeyError(f"Unknown assessment fields {sorted(unknown)}")
+        numeric = {name: array('q') for name in fields if name in NUMERIC_COLUMNS}
+        # Dates repeat too: they are interned while loading, then turned into days
+        interned_fields = [name for name in fields
+                           if name in CATEGORY_COLUMNS or name in SET_COLUMNS or name == 'date']
+        codes = {name: array('i') for name in interned_fields}
+        index: Dict[str, Dict] = {name: {} for name in interned_fields}
+        buffers = {name: bytearray() for name in fields if name in TEXT_COLUMNS}
+        offsets = {name: array('q', [0]) for name in buffers}
+        text_missing = {name: array('b') for name in buffers}
+        size = 0
+
+        # Column at a time over batches of rows keeps the per-value work in comprehensions
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, BUILD_BATCH))
+            if not batch:
+                break
+            size += len(batch)
+            for name, values in zip(fields, zip(*batch)):
+                if name in numeric:
+                    numeric[name].extend([MISSING if value is None else int(value)
+                                          for value in values])
+                elif name in codes:
+                    known = index[name]
+                    if name in SET_COLUMNS:
+                        # Lists are interned on their JSON text or their items
+                        values = [value if value is None or isinstance(value, str)
+                                  else tuple(value) for value in values]
+                    codes[name].extend([MISSING if value is None
+                                        else known.setdefault(value, len(known))
+                                        for value in values])
+                else:
+                    texts = [value if value is None or isinstance(value, str)
+                             else json.dumps(value, ensure_ascii=False) for value in values]
+                    encoded = [b'' if text is None else text.encode('utf-8') for text in texts]
+                    ends = accumulate(map(len, encoded), initial=len(buffers[name]))
+                    offsets[name].extend(islice(ends, 1, None))
+                    buffers[name] += b''.join(encoded)
+                    text_missing[name].extend([text is None for text in texts])
+
+        def interned(name: str) -> List:
+            values = list(index[name])
+            if name in SET_COLUMNS:
+                values = [tuple(json.loads(value)) if isinstance(value, str) else value
+                          for value in values]
+            return values
+
+        dates = None
+        if 'date' in codes:
+            days = np.array([Date.fromisoformat(value[:10]).toordinal() - _EPOCH
+                             for value in index['date']] + [_NO_DATE], dtype=np.int64)
+            # MISSING (-1) picks the trailing NaT
+            dates = days[np.frombuffer(codes['date'], dtype=np.int32)].astype('datetime64[D]')
+
+        return cls(
+            {name: np.frombuffer(values, dtype=np.int64).astype(NUMERIC_COLUMNS[name])
+             for name, values in numeric.items()},
+            dates,
+            {name: (_narrow(codes[name]), interned(name))
+             for name in codes if name in CATEGORY_COLUMNS},
+            {name: (_narrow(codes[name]), interned(name)) for name in codes if name in SET_COLUMNS},
+            {name: (np.frombuffer(bytes(buffers[name]), dtype=np.uint8),
+                    np.frombuffer(offsets[name], dtype=np.int64),
+                    np.frombuffer(text_missing[name], dtype=np.bool_))
+             for name in buffers},
+            size)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the columns, category lists and interned values."""
+        total = sum(values.nbytes for values in self.numeric.values())
+        total += self.dates.nbytes if self.dates is not None else 0
+        for codes, values in self.categories.values():
+            total += codes.nbytes + sum(sys.getsizeof(value) for value in values)
+        for codes, values in self.sets.values():
+            total += codes.nbytes + sum(sys.getsizeof(value) + sum(map(sys.getsizeof, value))
+                                        for value in values)
+        for arrays in self.texts.values():
+            total += sum(values.nbytes for values in arrays)
+        return total
+
+    def _text(self, name: str, position: int) -> Optional[str]:
+        buffer, offsets, missing = self.texts[name]
+        if missing[position]:
+            return None
+        return buffer[offsets[position]:offsets[position + 1]].tobytes().decode('utf-8')
+
+    def row(self, position: int) -> Dict:
+        """The assessment at ``position``; fields it never had are left out."""
+        assessment = {}
+        for name in self.fields:
+            value = self.value(name, position)
+            if value is not None:
+                assessment[name] = value
+        return assessment
+
+    def value(self, name: str, position: int):
+        if name in self.numeric:
+            value = int(self.numeric[name][position])
+            if value == MISSING:
+                return None
+            return bool(value) if name == 'can_deploy' else value
+        if name == 'date' and self.dates is not None:
+            date = self.dates[position]
+            return None if np.isnat(date) else str(date)
+        if name in self.categories:
+            codes, values = self.categories[name]
+            return values[codes[position]] if codes[position] != MISSING else None
+        if name in self.sets:
+            codes, values = self.sets[name]
+            return list(values[codes[position]]) if codes[position] != MISSING else None
+        if name not in self.texts:
+            raise KeyError(name)
+        text = self._text(name, position)
+        return json.loads(text) if name == 'evidence' and text is not None else text
+
+    def __iter__(self) -> Iterator[Dict]:
+        for position in range(len(self)):
+            yield self.row(position)
+
+    def text_column(self, name: str) -> np.ndarray:
+        """Decode a text column into an object array of strings (``None`` where missing)."""
+        buffer, offsets, missing = self.texts[name]
+        data, bounds = buffer.tobytes(), offsets.tolist()
+        values = np.empty(len(self), dtype=object)
+        values[:] = [data[start:end].decode('utf-8')
+                     for start, end in zip(bounds, bounds[1:])]
+        values[missing] = None
+        return values
+
+    def set_column(self, name: str) -> np.ndarray:
+        """Object array of tuples; rows with the same list share one tuple."""
+        codes, values = self.sets[name]
+        interned = np.empty(len(values) + 1, dtype=object)
+        interned[:-1] = values
+        # MISSING (-1) picks the trailing None
+        return interned[codes]
+
+    def to_frame(self, columns: Optional[Sequence[str]] = None):
+        """A pandas DataFrame of ``columns`` (default: every held field but ``evidence``).
+
+        Numeric columns are views on the stored arrays and categories become
+        ``pd.Categorical`` over the stored codes; only text, list and date
+        columns are converted.
+        """
+        import pandas as pd
+
+        columns = columns or [name for name in self.fields if name != 'evidence']
+        data = {}
+        for name in columns:
+            if name in self.numeric:
+                values = self.numeric[name]
+                missing = values == MISSING
+                if name == 'can_deploy':
+                    data[name] = pd.arrays.BooleanArray(values == 1, missing)
+                elif missing.any():
+                    data[name] = pd.arrays.IntegerArray(values, missing)
+                else:
+                    data[name] = values
+            elif name == 'date' and self.dates is not None:
+                data[name] = self.dates.astype('datetime64[s]')
+            elif name in self.categories:
+                codes, values = self.categories[name]
+                data[name] = pd.Categorical.from_codes(codes, categories=values)
+            elif name in self.sets:
+                data[name] = self.set_column(name)
+            elif name in self.texts:
+                data[name] = self.text_column(name)
+            else:
+                raise KeyError(name)
+        return pd.DataFrame(data, copy=False)
+
+def _narrow(codes: array) -> np.ndarray:
+    """Codes in the smallest signed integer type that holds them (and MISSING)."""
+    values = np.frombuffer(codes, dtype=np.int32)
+    largest = int(values.max()) if len(values) else 0
+    return values.astype(np.min_scalar_type(-max(largest, 1)))
@@ -0,0 +1,51 @@
+"""
+EU AI Act Toolkit - Core engine
+Rule base, keyword matcher and risk classifier without any UI dependency
+"""
+
+from .cache import ResultCache, rules_fingerprint
+from .classifier import (RISK_LEVELS, SCORING_WEIGHTS, RiskClassifier, compute_compliance_score,
+                         parse_data_types, scoring_weights)
+from .matcher import (MATCHING_MODES, KeywordMatcher, TokenMatcher, create_matcher, get_matcher,
+                      register_matcher)
+from .obligations import (RISK_OBLIGATIONS, Obligation, ObligationTable,
+                          get_obligation_table)
+from .rulepack import (RulePack, RulePackError, load_rule_pack, load_snapshot, save_snapshot,
+                       validate_rules)
+from .rules import EU_AI_ACT_RULES, RULE_CATEGORIES, RULE_TRANSLATIONS, rule_translations
+from .text import LANGUAGES, Stemmer, fold, tokenize
+
+__all__ = [
+    "EU_AI_ACT_RULES",
+    "LANGUAGES",
+    "MATCHING_MODES",
+    "RISK_LEVELS",
+    "RISK_OBLIGATIONS",
+    "RULE_CATEGORIES",
+    "RULE_TRANSLATIONS",
+    "SCORING_WEIGHTS",
+    "KeywordMatcher",
+    "Obligation",
+    "ObligationTable",
+    "ResultCache",
+    "RiskClassifier",
+    "RulePack",
+    "RulePackError",
+    "Stemmer",
+    "TokenMatcher",
+    "compute_compliance_score",
+    "create_matcher",
+    "fold",
+    "get_matcher",
+    "get_obligation_table",
+    "load_rule_pack",
+    "load_snapshot",
+    "parse_data_types",
+    "register_matcher",
+    "rule_translations",
+    "rules_fingerprint",
+    "save_snapshot",
+    "scoring_weights",
+    "tokenize",
+    "validate_rules",
+]
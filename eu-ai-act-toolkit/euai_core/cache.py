@@ -0,0 +1,129 @@
+"""
+EU AI Act Toolkit - Classification result cache
+Bounded LRU/TTL cache of rule matches with an optional on-disk SQLite tier
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+# Rule indices per category, in RULE_CATEGORIES order
+CachedMatches = Tuple[Tuple[int, ...], ...]
+
+def rules_fingerprint(rules: Dict) -> str:
+    """Stable version hash of a rule base; any rule change yields a new one."""
+    canonical = json.dumps(rules, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+class ResultCache:
+    """Thread-safe LRU cache of classification matches.
+
+    Entries are keyed on the rule-base fingerprint and the normalized input
+    text, so a changed rule base never hits entries computed under an older
+    one. At most ``max_size`` entries are kept in memory; with ``ttl``
+    (seconds) entries also expire. With ``path``, entries are written through
+    to a SQLite file, shared by every worker using it and kept across
+    restarts; memory misses fall back to that tier.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: Optional[float] = None,
+                 path: Optional[str] = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.path = path
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.disk_hits = self.evictions = 0
+
+        self._conn = None
+        if path is not None:
+            self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS results ("
+                               "key TEXT PRIMARY KEY, matches TEXT NOT NULL, expires REAL)")
+
+    @staticmethod
+    def _disk_key(key: Tuple[str, str]) -> str:
+        return hashlib.blake2b('\0'.join(key).encode('utf-8'), digest_size=16).hexdigest()
+
+    def get(self, key: Tuple[str, str]) -> Optional[CachedMatches]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                matches, expires = entry
+                if expires is None or expires > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return matches
+                del self._entries[key]
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT matches, expires FROM results WHERE key = ?",
+                    (self._disk_key(key),)).fetchone()
+                if row is not None and (row[1] is None or row[1] > now):
+                    matches = tuple(tuple(indices) for indices in json.loads(row[0]))
+                    self._store(key, matches, row[1])
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return matches
+
+            self.misses += 1
+            return None
+
+    def put(self, key: Tuple[str, str], matches: CachedMatches):
+        expires = time.time() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._store(key, matches, expires)
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO results (key, matches, expires) VALUES (?, ?, ?)",
+                    (self._disk_key(key), json.dumps(matches), expires))
+
+    def _store(self, key: Tuple[str, str], matches: CachedMatches, expires: Optional[float]):
+        self._entries[key] = (matches, expires)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'disk_hits': self.disk_hits,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+    def purge_expired(self) -> int:
+        """Drop expired entries from both tiers; returns how many were on disk."""
+        now = time.time()
+        with self._lock:
+            for key in [k for k, (_, expires) in self._entries.items()
+                        if expires is not None and expires <= now]:
+                del self._entries[key]
+            if self._conn is None:
+                return 0
+            return self._conn.execute("DELETE FROM results WHERE expires <= ?", (now,)).rowcount
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM results")
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
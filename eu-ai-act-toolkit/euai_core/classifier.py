@@ -0,0 +1,234 @@
+"""
+EU AI Act Toolkit - Risk classification engine
+Tiered risk classification, compliance scoring and recommendations
+"""
+
+from bisect import bisect_right
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from . import instrumentation
+from .cache import ResultCache, rules_fingerprint
+from .instrumentation import instrumented
+from .matcher import get_matcher
+from .obligations import ObligationTable, get_obligation_table
+from .rules import EU_AI_ACT_RULES, RULE_CATEGORIES
+
+def parse_data_types(data_types: Union[str, List[str], None]) -> List[str]:
+    """Normalize data types given as a list or a ``;``-separated string."""
+    if not data_types:
+        return []
+    if isinstance(data_types, str):
+        return [d.strip() for d in data_types.split(';') if d.strip()]
+    return list(data_types)
+
+RISK_LEVELS = ('unacceptable', 'high', 'limited', 'minimal')
+
+# Input fields searched for keywords, in the order they are joined
+MATCH_FIELDS = ('use_case', 'context', 'data_types')
+
+# Score weights shared by the per-record path and ``scoring.score_matrix``
+SCORING_WEIGHTS = {
+    'unacceptable_score': 100,
+    'high_base_score': 60,
+    'high_match_bonus': 10,
+    'high_max_bonus': 25,
+    'high_max_score': 95,
+    'limited_score': 35,
+    'minimal_score': 15,
+    'compliance_base': 50,
+    'compliance_per_data_type': 5,
+    'compliance_default': 85,
+}
+
+def scoring_weights(weights: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+    """``SCORING_WEIGHTS`` with the given overrides applied."""
+    unknown = set(weights or {}) - set(SCORING_WEIGHTS)
+    if unknown:
+        raise ValueError(f"Unknown scoring weights {sorted(unknown)}, "
+                         f"expected {list(SCORING_WEIGHTS)}")
+    return {**SCORING_WEIGHTS, **(weights or {})}
+
+def match_text(use_case: str, context: str, data_types: List[str]) -> str:
+    """The lowercased text keywords are searched in.
+
+    Data types keep their order: keywords may span adjacent values, so a
+    reordering can change what matches.
+    """
+    return f"{use_case} {context} {' '.join(data_types)}".lower()
+
+def compute_compliance_score(risk_level: str, data_types: List[str],
+                             weights: Optional[Dict[str, int]] = None) -> int:
+    weights = weights or SCORING_WEIGHTS
+    if risk_level == 'high':
+        return weights['compliance_base'] + len(data_types) * weights['compliance_per_data_type']
+    return weights['compliance_default']
+
+class RiskClassifier:
+    def __init__(self, rules: Optional[Dict] = None, cache: Optional[ResultCache] = None,
+                 matcher=None, weights: Optional[Dict[str, int]] = None):
+        # A prebuilt matcher (e.g. a TokenMatcher) brings its own rules
+        if matcher is not None:
+            rules = matcher.rules
+        self.rules = rules if rules is not None else EU_AI_ACT_RULES
+        self.weights = scoring_weights(weights)
+        self.matcher = matcher or get_matcher(self.rules)
+        self.cache = cache
+        self.obligations: ObligationTable = get_obligation_table(self.rules)
+        self.rule_count = sum(len(self.rules.get(category, [])) for category in RULE_CATEGORIES)
+        self.rules_version = None
+        if cache is not None:
+            self.rules_version = f"{rules_fingerprint(self.rules)}/{self.matcher.signature}"
+    
+    def match(self, use_case: str, context: str, data_types: List[str]) -> Dict[str, List[int]]:
+        text = match_text(use_case, context, data_types)
+        if self.cache is None:
+            return self.matcher.match(text)
+        
+        # Keyed by exactly the matched text, so cached results equal uncached ones
+        key = (self.rules_version, text)
+        cached = self.cache.get(key)
+        instrumentation.count('cache_hits' if cached is not None else 'cache_misses')
+        if cached is not None:
+            return {category: list(indices) for category, indices in zip(RULE_CATEGORIES, cached)}
+        matches = self.matcher.match(text)
+        self.cache.put(key, tuple(tuple(matches[category]) for category in RULE_CATEGORIES))
+        return matches
+    
+    def match_evidence(self, use_case: str, context: str,
+                       data_types: List[str]) -> Tuple[Dict[str, List[int]], List[Dict]]:
+        """Match like ``match`` and collect evidence for every rule hit in the same scan.
+
+        Each evidence item names the ``rule_id``, the ``keyword``, the
+        ``field`` it was found in and the ``start``/``end`` character offsets
+        and ``text`` within that field (``data_types`` joined with spaces).
+        The result cache is bypassed.
+        """
+        values = (use_case, context, ' '.join(data_types))
+        lowered = [value.lower() for value in values]
+        offsets = [0, len(lowered[0]) + 1, len(lowered[0]) + len(lowered[1]) + 2]
+        matches, spans = self.matcher.match_spans(' '.join(lowered))
+        
+        evidence = []
+        for (category, index), rule_spans in spans.items():
+            rule_id = self.rules[category][index].get('id')
+            for keyword, start, end in rule_spans:
+                field = bisect_right(offsets, start) - 1
+                value, low = values[field], lowered[field]
+                start, end = start - offsets[field], min(end - offsets[field], len(low))
+                # Lowercasing rarely changes lengths; then quote the lowered text
+                text = (value if len(value) == len(low) else low)[start:end]
+                evidence.append({'rule_id': rule_id, 'keyword': keyword,
+                                 'field': MATCH_FIELDS[field], 'start': start, 'end': end,
+                                 'text': text})
+        evidence.sort(key=lambda item: (MATCH_FIELDS.index(item['field']), item['start'],
+                                        str(item['rule_id'])))
+        return matches, evidence
+    
+    def classify(self, use_case: str, context: str, data_types: List[str],
+                 explain: bool = False) -> Dict:
+        """Classify one system; with ``explain`` the result also carries ``evidence``."""
+        recorder = instrumentation.recorder
+        if recorder is not None:
+            return self._classify_instrumented(recorder, use_case, context, data_types, explain)
+        if explain:
+            return self.classify_matches(*self.match_evidence(use_case, context, data_types))
+        return self.classify_matches(self.match(use_case, context, data_types))
+    
+    def _classify_instrumented(self, recorder: instrumentation.Recorder, use_case: str,
+                               context: str, data_types: List[str], explain: bool) -> Dict:
+        with recorder.span('classify'):
+            if explain:
+                matches, evidence = self.match_evidence(use_case, context, data_types)
+            else:
+                matches, evidence = self.match(use_case, context, data_types), None
+            result = self.classify_matches(matches, evidence)
+        recorder.count('rule_evaluations', self.rule_count)
+        recorder.count('rule_matches', sum(len(indices) for indices in matches.values()))
+        return result
+    
+    def classify_matches(self, matches: Dict[str, List[int]],
+                         evidence: Optional[List[Dict]] = None) -> Dict:
+        """Build the tiered classification from ``KeywordMatcher.match`` output.
+
+        Given ``evidence`` from ``match_evidence``, the items for the matched
+        rules are added to the result as ``evidence``.
+        """
+        result = self._classify_tiers(matches)
+        if evidence is not None:
+            matched = {rule.get('id') for rule in result['matched_rules']}
+            result['evidence'] = [item for item in evidence if item['rule_id'] in matched]
+        return result
+    
+    def _classify_tiers(self, matches: Dict[str, List[int]]) -> Dict:
+        weights = self.weights
+        # Check prohibited practices
+        if matches['prohibited_practices']:
+            practice = self.rules['prohibited_practices'][matches['prohibited_practices'][0]]
+            return {
+                'risk_level': 'unacceptable',
+                'risk_score': weights['unacceptable_score'],
+                'matched_rules': [practice],
+                'can_deploy': False,
+                'fine_amount': practice['fine']
+            }
+        
+        # Check high-risk systems
+        high_risk_matches = [self.rules['high_risk_systems'][i]
+                             for i in matches['high_risk_systems']]
+        
+        if high_risk_matches:
+            base_score = weights['high_base_score']
+            bonus = min(len(high_risk_matches) * weights['high_match_bonus'],
+                        weights['high_max_bonus'])
+            score = min(base_score + bonus, weights['high_max_score'])
+            
+            return {
+                'risk_level': 'high',
+                'risk_score': score,
+                'matched_rules': high_risk_matches,
+                'can_deploy': True,
+                'fine_amount': high_risk_matches[0]['fine']
+            }
+        
+        # Check limited risk
+        if matches['limited_risk_systems']:
+            system = self.rules['limited_risk_systems'][matches['limited_risk_systems'][0]]
+            return {
+                'risk_level': 'limited',
+                'risk_score': weights['limited_score'],
+                'matched_rules': [system],
+                'can_deploy': True,
+                'fine_amount': system['fine']
+            }
+        
+        return {
+            'risk_level': 'minimal',
+            'risk_score': weights['minimal_score'],
+            'matched_rules': [],
+            'can_deploy': True,
+            'fine_amount': 'N/A'
+        }
+    
+    def classify_batch(self, records: Iterable[Dict], explain: bool = False) -> Iterator[Dict]:
+        """Lazily classify records, yielding one result per record in input order.
+
+        Each record provides ``use_case``, ``context`` and ``data_types`` (a
+        list, or a ``;``-separated string as found in CSV inventories). The
+        input is consumed one record at a time, so memory stays bounded.
+        Leave ``explain`` off for maximum throughput.
+        """
+        classify = self.classify
+        for record in records:
+            yield classify(record.get('use_case') or '',
+                           record.get('context') or '',
+                           parse_data_types(record.get('data_types')), explain)
+    
+    @instrumented('recommendations')
+    def generate_recommendations(self, risk_level: str,
+                                 matched_rules: Iterable = ()) -> List[str]:
+        """Recommendations for a risk level, with detail for the matched rule ids.
+
+        Returns a new list; ``self.obligations.recommendations`` gives the
+        shared tuple without copying.
+        """
+        return list(self.obligations.recommendations(risk_level, matched_rules))
@@ -0,0 +1,203 @@
+"""
+EU AI Act Toolkit - Duplicate-aware classification
+Exact content hashing and MinHash/LSH near-duplicate grouping in front of RiskClassifier
+"""
+
+import hashlib
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .classifier import RiskClassifier, match_text, parse_data_types
+from .text import tokenize
+
+# Result key naming the duplicate group a record was assigned to
+GROUP_FIELD = 'duplicate_group'
+
+# Multiply-shift hashing works modulo 2**64, which uint64 arithmetic wraps to
+_HASH_BITS = 32
+
+class MinHasher:
+    """MinHash signatures of word shingles.
+
+    Texts are casefolded, accent-stripped and split into words; shingles are
+    runs of ``shingle_size`` consecutive words. The share of equal signature
+    positions estimates the Jaccard similarity of two shingle sets.
+    Shingles are hashed with ``hash()``, so signatures are only comparable
+    within one process.
+    """
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 2, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        # Odd multipliers keep every hash function a bijection on 64-bit words
+        self._a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+
+    def shingles(self, text: str) -> np.ndarray:
+        words = tokenize(text)
+        size = self.shingle_size
+        chunks = {tuple(words[i:i + size]) for i in range(max(len(words) - size + 1, 1))}
+        return np.fromiter(map(hash, chunks), dtype=np.int64, count=len(chunks)).view(np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        hashes = self.shingles(text)
+        permuted = self._a[:, None] * hashes[None, :] + self._b[:, None]
+        return (permuted >> np.uint64(_HASH_BITS)).min(axis=1)
+
+    @staticmethod
+    def similarity(a: np.ndarray, b: np.ndarray) -> float:
+        return float(np.count_nonzero(a == b)) / len(a)
+
+class DedupClassifier:
+    """Classifies one representative per group of duplicate records.
+
+    Records are compared on ``use_case``, ``context`` and their
+    ``data_types`` in order (keywords can span adjacent values). A record
+    whose lowercased text equals a representative's (the text
+    ``RiskClassifier`` matches against) shares its result; the
+    classification is then exactly what ``classify`` would return. With
+    ``near_duplicates``, a record that only differs slightly from an
+    earlier representative with the same data types (estimated Jaccard
+    similarity of their word shingles at least ``threshold``, found
+    through LSH banding of MinHash signatures) shares that result too.
+    Near-duplicate sharing trades exactness for work: a differing word
+    can hold a keyword.
+
+    With ``explain`` only exact duplicates with identical raw text share a
+    result, since evidence offsets point into the representative's text.
+
+    Groups form online in input order, each member compared to its group's
+    representative, so memory grows with the number of distinct records.
+    ``groups()`` and ``stats()`` expose the clusters for review. Results
+    carry their group id under ``GROUP_FIELD``.
+    """
+
+    def __init__(self, classifier: Optional[RiskClassifier] = None,
+                 near_duplicates: bool = True, threshold: float = 0.8, num_perm: int = 64,
+                 bands: int = 16, shingle_size: int = 2):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        if not 0 < threshold <= 1:
+            raise ValueError(f"threshold must be in (0, 1], got {threshold}")
+        self.classifier = classifier or RiskClassifier()
+        self.near_duplicates = near_duplicates
+        self.threshold = threshold
+        self.bands = bands
+        self.hasher = MinHasher(num_perm, shingle_size)
+        # Representative text -> group; near-duplicate member text -> (group, similarity)
+        self._exact: Dict[bytes, int] = {}
+        self._near: Dict[bytes, Tuple[int, float]] = {}
+        # (data types, band, band values) -> representative group ids
+        self._buckets: Dict[Tuple[bytes, int, bytes], List[int]] = {}
+        self._signatures: List[np.ndarray] = []
+        self._results: List[Dict] = []
+        self._group_stats: List[Dict] = []
+        self._records = 0
+
+    def _exact_key(self, use_case: str, context: str, data_types: List[str],
+                   explain: bool) -> bytes:
+        if explain:
+            text = '\x1f'.join((use_case, context, '\x1e'.join(data_types), 'explain'))
+        else:
+            # Exactly what RiskClassifier.match searches
+            text = match_text(use_case, context, data_types)
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+    def _find_near(self, signature: np.ndarray, scope: bytes) -> Tuple[Optional[int], float]:
+        """The most similar representative at or above ``threshold``, if any."""
+        rows = len(signature) // self.bands
+        best, best_similarity = None, self.threshold
+        seen = set()
+        for band in range(self.bands):
+            key = (scope, band, signature[band * rows:(band + 1) * rows].tobytes())
+            for group in self._buckets.get(key, ()):
+                if group in seen:
+                    continue
+                seen.add(group)
+                similarity = MinHasher.similarity(signature, self._signatures[group])
+                if similarity >= best_similarity:
+                    best, best_similarity = group, similarity
+        return best, best_similarity
+
+    def _index(self, group: int, signature: np.ndarray, scope: bytes):
+        rows = len(signature) // self.bands
+        for band in range(self.bands):
+            key = (scope, band, signature[band * rows:(band + 1) * rows].tobytes())
+            self._buckets.setdefault(key, []).append(group)
+
+    def _new_group(self, result: Dict, use_case: str, context: str, position: int,
+                   signature: Optional[np.ndarray]) -> int:
+        group = len(self._results)
+        self._results.append(result)
+        self._signatures.append(signature)
+        self._group_stats.append({
+            'group': group, 'representative': position, 'use_case': use_case,
+            'context': context, 'risk_level': result['risk_level'], 'size': 1,
+            'exact_duplicates': 0, 'near_duplicates': 0, 'min_similarity': 1.0,
+        })
+        return group
+
+    def classify(self, use_case: str, context: str, data_types: List[str],
+                 explain: bool = False) -> Dict:
+        position = self._records
+        self._records += 1
+        key = self._exact_key(use_case, context, data_types, explain)
+        group = self._exact.get(key)
+        if group is not None:
+            stats = self._group_stats[group]
+            stats['size'] += 1
+            stats['exact_duplicates'] += 1
+            return dict(self._results[group], **{GROUP_FIELD: group})
+
+        signature = scope = None
+        if self.near_duplicates and not explain:
+            # Copies of a near-duplicate member are near duplicates of the group too
+            group, similarity = self._near.get(key, (None, 0.0))
+            if group is None:
+                signature = self.hasher.signature(f"{use_case} {context}")
+                scope = '\x1e'.join(data_types).lower().encode('utf-8')
+                group, similarity = self._find_near(signature, scope)
+            if group is not None:
+                self._near[key] = (group, similarity)
+                stats = self._group_stats[group]
+                stats['size'] += 1
+                stats['near_duplicates'] += 1
+                stats['min_similarity'] = min(stats['min_similarity'], similarity)
+                return dict(self._results[group], **{GROUP_FIELD: group})
+
+        group = self._new_group(self.classifier.classify(use_case, context, data_types, explain),
+                                use_case, context, position, signature)
+        self._exact[key] = group
+        if signature is not None:
+            self._index(group, signature, scope)
+        return dict(self._results[group], **{GROUP_FIELD: group})
+
+    def classify_batch(self, records: Iterable[Dict], explain: bool = False) -> Iterator[Dict]:
+        """Like ``RiskClassifier.classify_batch``, classifying each group once."""
+        for record in records:
+            yield self.classify(record.get('use_case') or '', record.get('context') or '',
+                                parse_data_types(record.get('data_types')), explain)
+
+    def groups(self, min_size: int = 2) -> List[Dict]:
+        """Groups with at least ``min_size`` records, largest first.
+
+        Each names its ``representative`` (input position), its text and
+        risk level, its ``size`` split into ``exact_duplicates`` and
+        ``near_duplicates``, and the lowest estimated similarity of a member.
+        """
+        return sorted((dict(stats) for stats in self._group_stats if stats['size'] >= min_size),
+                      key=lambda stats: (-stats['size'], stats['group']))
+
+    def stats(self) -> Dict:
+        exact = sum(stats['exact_duplicates'] for stats in self._group_stats)
+        near = sum(stats['near_duplicates'] for stats in self._group_stats)
+        return {
+            'records': self._records,
+            # One classification per group
+            'groups': len(self._group_stats),
+            'exact_duplicates': exact,
+            'near_duplicates': near,
+            'duplicate_rate': (exact + near) / self._records if self._records else 0.0,
+        }
@@ -0,0 +1,326 @@
+"""
+EU AI Act Toolkit - Incremental re-classification
+Rule diffs, a rule/keyword dependency index over stored assessments and change reports
+"""
+
+import json
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .cache import rules_fingerprint
+from .classifier import RISK_LEVELS, RiskClassifier, compute_compliance_score, parse_data_types
+from .matcher import KeywordMatcher, TokenMatcher
+from .rules import RULE_CATEGORIES, rule_translations
+
+def rule_keywords(rule: Dict, matcher=None) -> Set[str]:
+    """Keywords ``matcher`` compiles for ``rule``: translations count for token matching."""
+    keywords = set(rule['keywords'])
+    if isinstance(matcher, TokenMatcher):
+        translations = rule_translations(rule)
+        for language in matcher.languages:
+            keywords.update(translations.get(language, ()))
+    return keywords
+
+class RuleDiff:
+    """Rules (by id) whose matches or results differ between two rule bases.
+
+    ``changed`` covers edited keywords, translations, fines, a move to
+    another category, and a new position relative to the other rules of the
+    category (the first prohibited or limited-risk match wins). Titles and
+    descriptions are not stored with assessments and do not count.
+    """
+
+    def __init__(self, added: Set[str], removed: Set[str], changed: Set[str],
+                 keywords_added: Set[str]):
+        self.added = added
+        self.removed = removed
+        self.changed = changed
+        # Keywords that may create new matches: those of added rules, and new
+        # keywords of changed ones
+        self.keywords_added = keywords_added
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    def to_dict(self) -> Dict:
+        return {'added': sorted(self.added), 'removed': sorted(self.removed),
+                'changed': sorted(self.changed), 'keywords_added': sorted(self.keywords_added)}
+
+def _rules_by_id(rules: Dict) -> Dict[str, Tuple[str, Dict]]:
+    return {str(rule['id']): (category, rule) for category in RULE_CATEGORIES
+            for rule in rules.get(category, [])}
+
+def diff_rules(old: Dict, new: Dict, matcher=None) -> RuleDiff:
+    """Compare two rule bases, as compiled by ``matcher`` (default: substring)."""
+    old_rules, new_rules = _rules_by_id(old), _rules_by_id(new)
+    added = set(new_rules) - set(old_rules)
+    removed = set(old_rules) - set(new_rules)
+    changed = set()
+    keywords_added = set()
+    for rule_id in added:
+        keywords_added |= rule_keywords(new_rules[rule_id][1], matcher)
+
+    for rule_id in set(old_rules) & set(new_rules):
+        (old_category, old_rule), (new_category, new_rule) = old_rules[rule_id], new_rules[rule_id]
+        old_keywords = rule_keywords(old_rule, matcher)
+        new_keywords = rule_keywords(new_rule, matcher)
+        if (old_category, old_keywords, old_rule.get('fine')) != (
+                new_category, new_keywords, new_rule.get('fine')):
+            changed.add(rule_id)
+            keywords_added |= new_keywords - old_keywords
+
+    for category in RULE_CATEGORIES:
+        # Rules kept in the category whose order relative to each other changed
+        kept = [str(rule['id']) for rule in new.get(category, [])
+                if old_rules.get(str(rule['id']), (None,))[0] == category]
+        before = [str(rule['id']) for rule in old.get(category, []) if str(rule['id']) in kept]
+        changed.update(rule_id for pair in zip(before, kept) if pair[0] != pair[1]
+                       for rule_id in pair)
+    return RuleDiff(added, removed, changed, keywords_added)
+
+def _match_text(record: Dict) -> Tuple[str, str, List[str]]:
+    return (record.get('use_case') or '', record.get('context') or '',
+            parse_data_types(record.get('data_types')))
+
+def _postings(keys: List[str], values: List[int]) -> Dict[str, np.ndarray]:
+    """Sorted, unique ids per key from parallel key/id lists."""
+    grouped: Dict[str, List[int]] = {}
+    for key, value in zip(keys, values):
+        grouped.setdefault(key, []).append(value)
+    return {key: np.unique(np.array(ids, dtype=np.int64)) for key, ids in grouped.items()}
+
+class DependencyIndex:
+    """Which stored assessments each rule id and keyword matched under ``rules``.
+
+    Built with one ``match_evidence`` pass over the assessments, then kept
+    up to date by ``reclassify``. Postings are sorted NumPy id arrays, so a
+    million assessments with a few hits each take tens of megabytes.
+    ``save()``/``load()`` keep the index next to a database.
+    """
+
+    def __init__(self, rules: Dict, signature: str, ids: np.ndarray,
+                 by_rule: Dict[str, np.ndarray], by_keyword: Dict[str, np.ndarray]):
+        self.rules = rules
+        self.signature = signature
+        self.ids = ids
+        self.by_rule = by_rule
+        self.by_keyword = by_keyword
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def build(cls, assessments: Iterable[Dict],
+              classifier: Optional[RiskClassifier] = None) -> 'DependencyIndex':
+        """Index stored assessments (with ids) as matched by ``classifier``."""
+        classifier = classifier or RiskClassifier()
+        index = cls(classifier.rules, classifier.matcher.signature,
+                    np.zeros(0, dtype=np.int64), {}, {})
+        index.add((record['id'], classifier.match_evidence(*_match_text(record))[1])
+                  for record in assessments)
+        return index
+
+    def add(self, entries: Iterable[Tuple[int, List[Dict]]]):
+        """Index ``(assessment id, evidence)`` pairs from ``match_evidence``."""
+        ids, rule_keys, rule_ids, keyword_keys, keyword_ids = [], [], [], [], []
+        for assessment_id, evidence in entries:
+            ids.append(assessment_id)
+            for item in evidence:
+                rule_keys.append(str(item['rule_id']))
+                rule_ids.append(assessment_id)
+                keyword_keys.append(item['keyword'])
+                keyword_ids.append(assessment_id)
+        self.ids = np.union1d(self.ids, np.array(ids, dtype=np.int64))
+        for postings, new in ((self.by_rule, _postings(rule_keys, rule_ids)),
+                              (self.by_keyword, _postings(keyword_keys, keyword_ids))):
+            for key, values in new.items():
+                postings[key] = np.union1d(postings[key], values) if key in postings else values
+
+    def remove(self, ids: np.ndarray):
+        """Forget the given assessment ids."""
+        ids = np.asarray(ids, dtype=np.int64)
+        if not len(ids):
+            return
+        self.ids = np.setdiff1d(self.ids, ids)
+        for postings in (self.by_rule, self.by_keyword):
+            for key in list(postings):
+                kept = postings[key][~np.isin(postings[key], ids)]
+                if len(kept):
+                    postings[key] = kept
+                else:
+                    del postings[key]
+
+    def affected(self, diff: RuleDiff) -> Tuple[np.ndarray, Set[str]]:
+        """Ids a rule diff can change, and the added keywords the index has never seen.
+
+        Assessments that matched a removed or changed rule are affected, as
+        are those already containing an added keyword. Keywords unknown to
+        the index need a text scan to find the assessments they now match.
+        """
+        postings = [self.by_rule[rule_id] for rule_id in diff.removed | diff.changed
+                    if rule_id in self.by_rule]
+        postings += [self.by_keyword[keyword] for keyword in diff.keywords_added
+                     if keyword in self.by_keyword]
+        ids = np.unique(np.concatenate(postings)) if postings else np.zeros(0, dtype=np.int64)
+        return ids, {keyword for keyword in diff.keywords_added if keyword not in self.by_keyword}
+
+    def save(self, path: str):
+        """Write the index to an ``.npz`` file, postings flattened per mapping."""
+        arrays = {}
+        for name, postings in (('rule', self.by_rule), ('keyword', self.by_keyword)):
+            keys = sorted(postings)
+            arrays[f"{name}_keys"] = np.array(keys, dtype=str)
+            arrays[f"{name}_offsets"] = np.cumsum([0] + [len(postings[key]) for key in keys])
+            arrays[f"{name}_ids"] = (np.concatenate([postings[key] for key in keys]) if keys
+                                     else np.zeros(0, dtype=np.int64))
+        np.savez_compressed(path, ids=self.ids, signature=np.array(self.signature),
+                            rules=np.array(json.dumps(self.rules, ensure_ascii=False)),
+                            version=np.array(rules_fingerprint(self.rules)), **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> 'DependencyIndex':
+        with np.load(path) as data:
+            rules = json.loads(str(data['rules']))
+            if str(data['version']) != rules_fingerprint(rules):
+                raise ValueError(f"{path} is corrupt: its rules do not match their fingerprint")
+            mappings = []
+            for name in ('rule', 'keyword'):
+                offsets, ids = data[f"{name}_offsets"], data[f"{name}_ids"]
+                mappings.append({key: ids[offsets[i]:offsets[i + 1]]
+                                 for i, key in enumerate(data[f"{name}_keys"].tolist())})
+            return cls(rules, str(data['signature']), data['ids'], *mappings)
+
+def _probe_matcher(matcher, keywords: Set[str]):
+    """A matcher for just ``keywords``, with the matching mode of ``matcher``."""
+    rules = {category: [] for category in RULE_CATEGORIES}
+    rules['limited_risk_systems'] = [{'id': keyword, 'title': keyword, 'keywords': [keyword],
+                                      'fine': ''} for keyword in sorted(keywords)]
+    if isinstance(matcher, TokenMatcher):
+        return TokenMatcher(rules, matcher.languages, matcher.max_edits)
+    return KeywordMatcher(rules)
+
+class ChangeReport:
+    """Outcome of ``reclassify``: what was re-evaluated and how results changed."""
+
+    def __init__(self, diff: RuleDiff, evaluated: int, scanned: int, changes: List[Dict]):
+        self.diff = diff
+        self.evaluated = evaluated
+        self.scanned = scanned
+        # One entry per updated assessment: id, system name, old/new results
+        self.changes = changes
+
+    @property
+    def moved(self) -> List[Dict]:
+        """Changes where the assessment moved to another risk tier."""
+        return [change for change in self.changes
+                if change['old_risk_level'] != change['new_risk_level']]
+
+    def transitions(self) -> Dict[Tuple[str, str], int]:
+        """``(old_level, new_level)`` -> number of systems, most severe tiers first."""
+        counts = Counter((change['old_risk_level'], change['new_risk_level'])
+                         for change in self.moved)
+        rank = {level: position for position, level in enumerate(RISK_LEVELS)}
+        return dict(sorted(counts.items(),
+                           key=lambda item: (rank.get(item[0][0], len(rank)),
+                                             rank.get(item[0][1], len(rank)))))
+
+    def to_dict(self) -> Dict:
+        return {
+            'rules': self.diff.to_dict(),
+            'evaluated': self.evaluated,
+            'scanned': self.scanned,
+            'updated': len(self.changes),
+            'moved': len(self.moved),
+            'transitions': [{'from': old, 'to': new, 'count': count}
+                            for (old, new), count in self.transitions().items()],
+            'changes': self.changes,
+        }
+
+def _results(classifier: RiskClassifier, record: Dict) -> Tuple[Dict, List[Dict]]:
+    """New result fields for a stored assessment, and its evidence for the index."""
+    use_case, context, data_types = _match_text(record)
+    matches, evidence = classifier.match_evidence(use_case, context, data_types)
+    result = classifier.classify_matches(matches, evidence if 'evidence' in record else None)
+    fields = {
+        'risk_level': result['risk_level'],
+        'risk_score': result['risk_score'],
+        'compliance_score': compute_compliance_score(result['risk_level'], data_types,
+                                                     classifier.weights),
+        'matched_rules': [rule.get('id', 'N/A') for rule in result['matched_rules']],
+        'can_deploy': result['can_deploy'],
+        'fine_amount': result['fine_amount'],
+    }
+    if 'evidence' in result:
+        fields['evidence'] = result['evidence']
+    return fields, evidence
+
+def reclassify(repository, classifier: RiskClassifier, index: DependencyIndex,
+               write: bool = True,
+               progress: Optional[Callable[[int, int], None]] = None) -> ChangeReport:
+    """Bring stored assessments from ``index.rules`` to ``classifier.rules``.
+
+    Only the assessments the rule diff can affect are re-evaluated: those
+    the index links to removed or changed rules or to added keywords, plus
+    any stored since the index was last updated. Keywords the index has not
+    seen cost one scan with a matcher holding only those keywords. Changed
+    results (risk level and score, compliance score, matched rules, fine,
+    deployability and stored evidence) are written back
+    with ``repository.update_results`` unless ``write`` is off, and the
+    index moves to the new rules.
+
+    ``progress(done, total)`` is called as affected assessments are evaluated.
+    """
+    if index.signature != classifier.matcher.signature:
+        raise ValueError(f"The index was built with {index.signature} matching, "
+                         f"not {classifier.matcher.signature}")
+    diff = diff_rules(index.rules, classifier.rules, classifier.matcher)
+    stored = np.array(repository.ids(), dtype=np.int64)
+    index.remove(np.setdiff1d(index.ids, stored))
+    affected, unseen = index.affected(diff)
+    affected = np.union1d(affected, np.setdiff1d(stored, index.ids))
+
+    records: Dict[int, Dict] = {}
+    scanned = 0
+    if unseen:
+        probe = _probe_matcher(classifier.matcher, unseen)
+        found = []
+        for record in repository.iter_all():
+            scanned += 1
+            use_case, context, data_types = _match_text(record)
+            text = f"{use_case} {context} {' '.join(data_types)}".lower()
+            if probe.match(text)['limited_risk_systems']:
+                found.append(record['id'])
+                records[record['id']] = record
+        affected = np.union1d(affected, np.array(found, dtype=np.int64))
+
+    changes, updates, entries = [], [], []
+    for done, assessment_id in enumerate(affected.tolist(), 1):
+        record = records.pop(assessment_id, None) or repository.get(assessment_id)
+        if record is None:
+            continue
+        fields, evidence = _results(classifier, record)
+        entries.append((assessment_id, evidence))
+        if any(record.get(name) != fields[name] for name in fields):
+            updates.append(dict(fields, id=assessment_id))
+            changes.append({
+                'id': assessment_id,
+                'system_name': record.get('system_name'),
+                'old_risk_level': record.get('risk_level'),
+                'new_risk_level': fields['risk_level'],
+                'old_risk_score': record.get('risk_score'),
+                'new_risk_score': fields['risk_score'],
+                'old_matched_rules': record.get('matched_rules') or [],
+                'new_matched_rules': fields['matched_rules'],
+            })
+        if progress is not None:
+            progress(done, len(affected))
+
+    if write:
+        if updates:
+            repository.update_results(updates)
+        index.remove(affected)
+        index.add(entries)
+        index.rules = classifier.rules
+    return ChangeReport(diff, len(entries), scanned, changes)
@@ -0,0 +1,253 @@
+"""
+EU AI Act Toolkit - Instrumentation
+Opt-in timing spans and counters with Prometheus text and JSON trace exporters
+"""
+
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+# Upper bounds (seconds) of the span duration histogram buckets
+SPAN_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+MAX_TRACE_EVENTS = 100_000
+
+# The active recorder; ``None`` while instrumentation is disabled. Hot paths
+# test it before doing any work, so disabled instrumentation costs one lookup
+recorder: Optional['Recorder'] = None
+_exporter: Optional['ThreadingHTTPServer'] = None
+_NULL_SPAN = nullcontext()
+
+class _Span:
+    __slots__ = ('recorder', 'name', 'attrs', 'start')
+
+    def __init__(self, recorder: 'Recorder', name: str, attrs: Optional[Dict]):
+        self.recorder = recorder
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.recorder.record(self.name, self.start, time.perf_counter() - self.start, self.attrs)
+
+class Recorder:
+    """Collects span durations, counters and (optionally) trace events.
+
+    Spans are aggregated per name into a count, sum, max and a histogram over
+    ``SPAN_BUCKETS``. With ``trace`` on, the last ``max_trace_events`` spans
+    are also kept as Chrome trace events (viewable in Perfetto or
+    chrome://tracing) and written to ``trace_path`` by ``write_trace``.
+    """
+
+    def __init__(self, trace: bool = False, trace_path: Optional[str] = None,
+                 max_trace_events: int = MAX_TRACE_EVENTS):
+        self.trace_path = trace_path
+        self.started = time.time()
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._spans: Dict[str, List] = {}
+        self._counters: Dict[str, int] = {}
+        self._events = deque(maxlen=max_trace_events) if trace or trace_path else None
+
+    def span(self, name: str, **attrs) -> _Span:
+        return _Span(self, name, attrs or None)
+
+    def record(self, name: str, start: float, seconds: float, attrs: Optional[Dict] = None):
+        """Add one span of ``seconds`` that began at ``time.perf_counter()`` value ``start``."""
+        with self._lock:
+            stats = self._spans.get(name)
+            if stats is None:
+                stats = self._spans[name] = [0, 0.0, 0.0, [0] * len(SPAN_BUCKETS)]
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = max(stats[2], seconds)
+            for position, bound in enumerate(SPAN_BUCKETS):
+                if seconds <= bound:
+                    stats[3][position] += 1
+                    break
+            if self._events is not None:
+                event = {'name': name, 'ph': 'X', 'pid': os.getpid(),
+                         'tid': threading.get_ident(),
+                         'ts': round((start - self._origin) * 1e6, 1),
+                         'dur': round(seconds * 1e6, 1)}
+                if attrs:
+                    event['args'] = attrs
+                self._events.append(event)
+
+    def count(self, name: str, value: int = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def reset(self):
+        with self._lock:
+            self._spans.clear()
+            self._counters.clear()
+            if self._events is not None:
+                self._events.clear()
+
+    def snapshot(self) -> Dict:
+        """JSON-friendly span statistics and counters."""
+        with self._lock:
+            spans = {name: {'count': count, 'total_ms': round(total * 1000, 3),
+                            'mean_ms': round(total / count * 1000, 3),
+                            'max_ms': round(longest * 1000, 3)}
+                     for name, (count, total, longest, _) in sorted(self._spans.items())}
+            return {'spans': spans, 'counters': dict(sorted(self._counters.items())),
+                    'uptime_s': round(time.time() - self.started, 3)}
+
+    def prometheus(self) -> str:
+        """Span histograms and counters in the Prometheus text exposition format."""
+        with self._lock:
+            spans = {name: (count, total, list(buckets))
+                     for name, (count, total, _, buckets) in sorted(self._spans.items())}
+            counters = sorted(self._counters.items())
+        lines = ['# HELP euai_span_seconds Duration of instrumented operations.',
+                 '# TYPE euai_span_seconds histogram']
+        for name, (count, total, buckets) in spans.items():
+            cumulative = 0
+            for bound, hits in zip(SPAN_BUCKETS, buckets):
+                cumulative += hits
+                lines.append(f'euai_span_seconds_bucket{{name="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'euai_span_seconds_bucket{{name="{name}",le="+Inf"}} {count}')
+            lines.append(f'euai_span_seconds_sum{{name="{name}"}} {total:.6f}')
+            lines.append(f'euai_span_seconds_count{{name="{name}"}} {count}')
+        lines += ['# HELP euai_events_total Instrumentation counters.',
+                  '# TYPE euai_events_total counter']
+        lines += [f'euai_events_total{{name="{name}"}} {value}' for name, value in counters]
+        return '\n'.join(lines) + '\n'
+
+    def trace(self) -> Dict:
+        """Recorded spans as a Chrome trace, with the counters as metadata."""
+        with self._lock:
+            events = list(self._events or ())
+            counters = dict(self._counters)
+        return {'traceEvents': events, 'displayTimeUnit': 'ms',
+                'otherData': {'counters': counters, 'started': self.started}}
+
+    def write_trace(self, path: Optional[str] = None) -> Optional[str]:
+        path = path or self.trace_path
+        if path is None:
+            return None
+        partial = f"{path}.tmp"
+        with open(partial, 'w', encoding='utf-8') as f:
+            json.dump(self.trace(), f)
+        os.replace(partial, path)
+        return path
+
+def enable(trace: bool = False, trace_path: Optional[str] = None,
+           max_trace_events: int = MAX_TRACE_EVENTS) -> Recorder:
+    """Start recording (or return the active recorder).
+
+    With ``trace_path`` the trace is also written there at interpreter exit.
+    """
+    global recorder
+    if recorder is None:
+        recorder = Recorder(trace, trace_path, max_trace_events)
+        if trace_path:
+            atexit.register(recorder.write_trace)
+    return recorder
+
+def disable() -> Optional[Recorder]:
+    """Stop recording; returns the recorder that was active, for a last export."""
+    global recorder
+    previous, recorder = recorder, None
+    if previous is not None and previous.trace_path:
+        atexit.unregister(previous.write_trace)
+    return previous
+
+def span(name: str, **attrs):
+    """Context manager timing a block as ``name``; a shared no-op while disabled."""
+    active = recorder
+    return _NULL_SPAN if active is None else active.span(name, **attrs)
+
+def count(name: str, value: int = 1):
+    active = recorder
+    if active is not None:
+        active.count(name, value)
+
+def instrumented(name: Optional[str] = None) -> Callable:
+    """Decorator timing every call of a function as a span (default: its qualified name)."""
+    def decorate(fn: Callable) -> Callable:
+        span_name = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            active = recorder
+            if active is None:
+                return fn(*args, **kwargs)
+            with active.span(span_name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+@functools.lru_cache(maxsize=None)
+def _exporter_handler() -> type:
+    """The exporter's request handler; http.server is only imported once serving."""
+    from http.server import BaseHTTPRequestHandler
+
+    class ExporterHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            active = recorder
+            path = self.path.split('?', 1)[0]
+            if path == '/metrics':
+                body = (active.prometheus() if active else '').encode('utf-8')
+                content_type = 'text/plain; version=0.0.4; charset=utf-8'
+            elif path in ('/trace', '/stats'):
+                data = ((active.trace() if path == '/trace' else active.snapshot())
+                        if active else {})
+                body = json.dumps(data).encode('utf-8')
+                content_type = 'application/json'
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return ExporterHandler
+
+def serve_metrics(port: int, host: str = '127.0.0.1') -> 'ThreadingHTTPServer':
+    """Serve ``/metrics`` (Prometheus text), ``/stats`` and ``/trace`` (JSON) on a daemon thread.
+
+    Only one exporter runs per process; later calls return it.
+    """
+    global _exporter
+    if _exporter is None:
+        from http.server import ThreadingHTTPServer
+        _exporter = ThreadingHTTPServer((host, port), _exporter_handler())
+        _exporter.daemon_threads = True
+        threading.Thread(target=_exporter.serve_forever, name='euai-metrics',
+                         daemon=True).start()
+    return _exporter
+
+def configure_from_env(environ: Optional[Dict[str, str]] = None) -> Optional[Recorder]:
+    """Enable instrumentation from ``EUAI_*`` environment variables.
+
+    ``EUAI_INSTRUMENT=1``, ``EUAI_TRACE_PATH`` or ``EUAI_METRICS_PORT`` each
+    turn recording on; a trace path also records trace events, and a port
+    starts ``serve_metrics``. Returns the active recorder, if any.
+    """
+    environ = os.environ if environ is None else environ
+    trace_path = environ.get('EUAI_TRACE_PATH') or None
+    port = environ.get('EUAI_METRICS_PORT')
+    if environ.get('EUAI_INSTRUMENT', '').lower() in ('1', 'true', 'yes') or trace_path or port:
+        enable(trace_path=trace_path)
+        if port:
+            serve_metrics(int(port))
+    return recorder
@@ -0,0 +1,326 @@
+"""
+EU AI Act Toolkit - Keyword matching engine
+Compiles a rule base once and finds every rule hit in one pass over the text
+"""
+
+import re
+import threading
+from itertools import chain, combinations, compress
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from .rules import RULE_CATEGORIES, rule_translations
+from .text import LANGUAGES, Stemmer, edit_distance, tokenize
+
+MATCHING_MODES = ('substring', 'token')
+
+# (category, rule index) -> [(keyword, start, end)] for every rule hit
+Spans = Dict[Tuple[str, int], List[Tuple[str, int, int]]]
+
+CHUNK_PATTERN = re.compile(r"\S+")
+WORD_PATTERN = re.compile("[\\w\u0300-\u036f]+")
+
+def _group_hits(hits: Iterable[Tuple[str, int]]) -> Dict[str, List[int]]:
+    matches: Dict[str, List[int]] = {category: [] for category in RULE_CATEGORIES}
+    for category, index in hits:
+        matches[category].append(index)
+    for indices in matches.values():
+        indices.sort()
+    return matches
+
+class KeywordMatcher:
+    """Precompiled matcher that finds every rule hit in one pass over the text.
+
+    Keywords are compiled into a single trie-shaped regex wrapped in a
+    lookahead, so each position yields the longest keyword starting there.
+    Every keyword contained in that match is implied as well, which keeps
+    the results identical to testing each keyword with ``keyword in text``.
+
+    Small rule bases are cheaper to check with one C-level substring search
+    per distinct keyword, so the regex is only used from
+    ``REGEX_MIN_KEYWORDS`` keywords upwards unless ``use_regex`` is given.
+
+    ``match_spans`` runs the same scan and also records where each keyword
+    occurs: the regex yields the longest keyword at every position, and the
+    other keywords starting there are exactly its prefixes.
+    """
+
+    REGEX_MIN_KEYWORDS = 200
+    signature = 'substring'
+
+    def __init__(self, rules: Dict, use_regex: Optional[bool] = None):
+        self.rules = rules
+        self._keyword_rules: Dict[str, List[Tuple[str, int]]] = {}
+        self._always: List[Tuple[str, int]] = []
+
+        for category in RULE_CATEGORIES:
+            for index, rule in enumerate(rules.get(category, [])):
+                for keyword in rule['keywords']:
+                    if keyword:
+                        self._keyword_rules.setdefault(keyword, []).append((category, index))
+                    else:
+                        # An empty keyword is a substring of every text
+                        self._always.append((category, index))
+
+        if use_regex is None:
+            use_regex = len(self._keyword_rules) >= self.REGEX_MIN_KEYWORDS
+
+        self._pattern = None
+        self._implied: Dict[str, FrozenSet[Tuple[str, int]]] = {}
+        self._prefixes: Dict[str, Tuple[str, ...]] = {}
+        if use_regex and self._keyword_rules:
+            # A hit on one keyword implies a hit on every keyword it contains
+            for keyword in self._keyword_rules:
+                hits = set()
+                for other, targets in self._keyword_rules.items():
+                    if other in keyword:
+                        hits.update(targets)
+                self._implied[keyword] = frozenset(hits)
+                self._prefixes[keyword] = tuple(other for other in self._keyword_rules
+                                                if keyword.startswith(other))
+
+            trie = self._build_trie(self._keyword_rules)
+            self._pattern = re.compile(f"(?=({self._trie_pattern(trie)}))")
+
+    @staticmethod
+    def _build_trie(keywords) -> Dict:
+        trie: Dict = {}
+        for keyword in keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[''] = True
+        return trie
+
+    @classmethod
+    def _trie_pattern(cls, node: Dict) -> str:
+        terminal = '' in node
+        branches = [re.escape(char) + cls._trie_pattern(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        pattern = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        # Greedy optional tail: prefer the longest keyword at this position
+        if terminal:
+            pattern = f"(?:{pattern})?"
+        return pattern
+
+    def match(self, text: str) -> Dict[str, List[int]]:
+        """Return, per rule category, the sorted indices of rules hit in text."""
+        hits = set(self._always)
+        if self._pattern is not None:
+            implied = self._implied
+            for keyword in set(self._pattern.findall(text)):
+                hits.update(implied[keyword])
+        else:
+            for keyword, targets in self._keyword_rules.items():
+                if keyword in text:
+                    hits.update(targets)
+        return _group_hits(hits)
+
+    def match_spans(self, text: str) -> Tuple[Dict[str, List[int]], Spans]:
+        """Like ``match``, also returning the keyword spans behind every hit."""
+        spans: Spans = {target: [] for target in self._always}
+        keyword_rules = self._keyword_rules
+
+        def add(keyword: str, start: int):
+            for target in keyword_rules[keyword]:
+                spans.setdefault(target, []).append((keyword, start, start + len(keyword)))
+
+        if self._pattern is not None:
+            prefixes = self._prefixes
+            for found in self._pattern.finditer(text):
+                for keyword in prefixes[found.group(1)]:
+                    add(keyword, found.start())
+        else:
+            for keyword in keyword_rules:
+                start = text.find(keyword)
+                while start != -1:
+                    add(keyword, start)
+                    start = text.find(keyword, start + 1)
+        return _group_hits(spans), spans
+
+class TokenMatcher:
+    """Matches keywords as whole stemmed terms instead of raw substrings.
+
+    Keywords, and the rule translations (``rule_translations``) for
+    ``languages``, are folded, tokenized and stemmed by ``text.Stemmer`` into
+    term sequences indexed by their first term. A description is normalized the same way and scanned
+    once, so "employees" matches "employee", "embauché" matches "embauche",
+    and "hiring" no longer matches inside unrelated words.
+
+    With ``max_edits``, terms of at least ``FUZZY_MIN_LENGTH`` characters
+    that are not in the keyword vocabulary also match vocabulary terms within
+    that many edits, found through a deletion-neighbourhood index.
+
+    ``match_spans`` reports each phrase hit from the start of the raw word
+    holding its first term to the end of the one holding its last term.
+    """
+
+    FUZZY_MIN_LENGTH = 5
+    MAX_MEMOIZED_CHUNKS = 100_000
+
+    def __init__(self, rules: Dict, languages: Iterable[str] = LANGUAGES, max_edits: int = 0):
+        self.rules = rules
+        self.languages = tuple(languages)
+        self.max_edits = max_edits
+        self.stemmer = Stemmer(self.languages)
+        self.signature = f"token:{','.join(self.languages)}:{max_edits}"
+        self._always: List[Tuple[str, int]] = []
+        # Term sequence -> the keyword it was compiled from, for match spans
+        self._keywords: Dict[Tuple[str, ...], str] = {}
+
+        phrase_rules: Dict[Tuple[str, ...], Set[Tuple[str, int]]] = {}
+        for category in RULE_CATEGORIES:
+            for index, rule in enumerate(rules.get(category, [])):
+                translations = rule_translations(rule)
+                keywords = list(rule['keywords'])
+                for language in self.languages:
+                    keywords.extend(translations.get(language, ()))
+                for keyword in keywords:
+                    if not keyword:
+                        self._always.append((category, index))
+                        continue
+                    terms = tuple(self.stemmer.terms(keyword))
+                    if terms:
+                        phrase_rules.setdefault(terms, set()).add((category, index))
+                        self._keywords.setdefault(terms, keyword)
+
+        # First term -> [(remaining terms, rule hits)]
+        self._phrases: Dict[str, List[Tuple[Tuple[str, ...], FrozenSet[Tuple[str, int]]]]] = {}
+        for terms, targets in phrase_rules.items():
+            self._phrases.setdefault(terms[0], []).append((terms[1:], frozenset(targets)))
+        self._vocabulary = frozenset(term for terms in phrase_rules for term in terms)
+
+        self._deletions: Dict[str, Set[str]] = {}
+        if max_edits:
+            for term in self._vocabulary:
+                if len(term) >= self.FUZZY_MIN_LENGTH:
+                    for variant in self._variants(term):
+                        self._deletions.setdefault(variant, set()).add(term)
+        # Whitespace-separated chunk of raw text -> vocabulary terms per token
+        self._chunks: Dict[str, Tuple[Tuple[str, ...], ...]] = {}
+
+    def _variants(self, term: str) -> Set[str]:
+        variants = {term}
+        for edits in range(1, self.max_edits + 1):
+            for positions in combinations(range(len(term)), edits):
+                variants.add(''.join(c for i, c in enumerate(term) if i not in positions))
+        return variants
+
+    def _resolve(self, term: str) -> Tuple[str, ...]:
+        """Vocabulary terms a stemmed description term stands for."""
+        if term in self._vocabulary:
+            return (term,)
+        if self.max_edits and len(term) >= self.FUZZY_MIN_LENGTH:
+            candidates = set()
+            for variant in self._variants(term):
+                candidates.update(self._deletions.get(variant, ()))
+            return tuple(sorted(c for c in candidates
+                                if edit_distance(term, c, self.max_edits) <= self.max_edits))
+        return ()
+
+    def _learn(self, chunk: str) -> Tuple[Tuple[str, ...], ...]:
+        """Normalize one chunk of raw text and memoize its resolved tokens."""
+        stemmer = self.stemmer
+        resolved = tuple(self._resolve(stemmer.stem(token)) for token in tokenize(chunk)
+                         if token not in stemmer.stopwords)
+        if len(self._chunks) >= self.MAX_MEMOIZED_CHUNKS:
+            self._chunks.clear()
+        self._chunks[chunk] = resolved
+        return resolved
+
+    def match(self, text: str) -> Dict[str, List[int]]:
+        """Return, per rule category, the sorted indices of rules hit in text."""
+        # Normalization is memoized per whitespace-separated chunk, so the
+        # per-record cost is a split and C-level dict lookups
+        chunks = text.split()
+        known = list(map(self._chunks.get, chunks))
+        if None in known:
+            learn = self._learn
+            known = [learn(chunk) if tokens is None else tokens
+                     for chunk, tokens in zip(chunks, known)]
+        resolved = list(chain.from_iterable(known))
+
+        hits = set(self._always)
+        if any(resolved):
+            phrases = self._phrases
+            for position in compress(range(len(resolved)), resolved):
+                for term in resolved[position]:
+                    for rest, targets in phrases.get(term, ()):
+                        if not rest:
+                            hits.update(targets)
+                        elif position + len(rest) < len(resolved) and all(
+                                expected in resolved[position + 1 + offset]
+                                for offset, expected in enumerate(rest)):
+                            hits.update(targets)
+        return _group_hits(hits)
+
+    def _positioned(self, text: str) -> List[Tuple[Tuple[str, ...], int, int]]:
+        """Resolved terms of ``text`` with the span of the raw word each came from."""
+        positioned = []
+        stopwords = self.stemmer.stopwords
+        for chunk_match in CHUNK_PATTERN.finditer(text):
+            chunk, base = chunk_match.group(), chunk_match.start()
+            resolved = self._chunks.get(chunk)
+            if resolved is None:
+                resolved = self._learn(chunk)
+            if not resolved:
+                continue
+            words = [(base + word.start(), base + word.end())
+                     for word in WORD_PATTERN.finditer(chunk)
+                     for token in tokenize(word.group()) if token not in stopwords]
+            if len(words) != len(resolved):
+                # Folding changed the word boundaries: fall back to the chunk
+                words = [(base, chunk_match.end())] * len(resolved)
+            positioned.extend((terms, start, end) for terms, (start, end) in zip(resolved, words))
+        return positioned
+
+    def match_spans(self, text: str) -> Tuple[Dict[str, List[int]], Spans]:
+        """Like ``match``, also returning the keyword spans behind every hit."""
+        positioned = self._positioned(text)
+        spans: Spans = {target: [] for target in self._always}
+        phrases, keywords = self._phrases, self._keywords
+        for position, (candidates, start, _) in enumerate(positioned):
+            for term in candidates:
+                for rest, targets in phrases.get(term, ()):
+                    last = position + len(rest)
+                    if last < len(positioned) and all(
+                            expected in positioned[position + 1 + offset][0]
+                            for offset, expected in enumerate(rest)):
+                        span = (keywords[(term,) + rest], start, positioned[last][2])
+                        for target in targets:
+                            spans.setdefault(target, []).append(span)
+        return _group_hits(spans), spans
+
+_MATCHER_CACHE: Dict[int, KeywordMatcher] = {}
+_MATCHER_CACHE_LOCK = threading.Lock()
+# Bounded so reloaded rule packs do not keep every superseded index alive
+MAX_CACHED_MATCHERS = 8
+
+def register_matcher(matcher: KeywordMatcher) -> KeywordMatcher:
+    """Make a prebuilt matcher (e.g. from a snapshot) the one used for its rules."""
+    with _MATCHER_CACHE_LOCK:
+        _MATCHER_CACHE.pop(id(matcher.rules), None)
+        _MATCHER_CACHE[id(matcher.rules)] = matcher
+        while len(_MATCHER_CACHE) > MAX_CACHED_MATCHERS:
+            del _MATCHER_CACHE[next(iter(_MATCHER_CACHE))]
+    return matcher
+
+def create_matcher(rules: Dict, matching: str = 'substring',
+                   languages: Iterable[str] = LANGUAGES, max_edits: int = 0):
+    """Build the matcher for a matching mode from ``MATCHING_MODES``."""
+    if matching == 'substring':
+        return get_matcher(rules)
+    if matching == 'token':
+        return TokenMatcher(rules, languages=languages, max_edits=max_edits)
+    raise ValueError(f"Unknown matching mode '{matching}', expected one of {MATCHING_MODES}")
+
+def get_matcher(rules: Dict) -> KeywordMatcher:
+    """Return the compiled matcher for a rule base, building it on first use.
+
+    Rule bases are treated as immutable once compiled.
+    """
+    matcher = _MATCHER_CACHE.get(id(rules))
+    if matcher is None or matcher.rules is not rules:
+        matcher = register_matcher(KeywordMatcher(rules))
+    return matcher
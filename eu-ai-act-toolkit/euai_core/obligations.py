@@ -0,0 +1,199 @@
+"""
+EU AI Act Toolkit - Obligations
+Recommendation and obligation tables compiled once per rule base
+"""
+
+import threading
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .rules import RULE_CATEGORIES
+
+class Obligation(NamedTuple):
+    """A recommendation with its legal basis, the date it applies from and
+    the evidence that shows it is met."""
+    id: str
+    text: str
+    article: Optional[str] = None
+    deadline: Optional[str] = None
+    evidence: Tuple[str, ...] = ()
+    rule_id: Optional[str] = None
+
+    def to_dict(self) -> Dict:
+        return dict(self._asdict(), evidence=list(self.evidence))
+
+# Dates the obligations of each risk tier apply from (Article 113)
+PROHIBITIONS_APPLY = '2025-02-02'
+HIGH_RISK_APPLIES = '2026-08-02'
+TRANSPARENCY_APPLIES = '2026-08-02'
+
+CATEGORY_DEADLINES = {
+    'prohibited_practices': PROHIBITIONS_APPLY,
+    'high_risk_systems': HIGH_RISK_APPLIES,
+    'limited_risk_systems': TRANSPARENCY_APPLIES,
+}
+
+# Obligations of every system in a risk tier, in recommendation order
+RISK_OBLIGATIONS = {
+    'unacceptable': (
+        Obligation('unacceptable.prohibited', "⛔ PROHIBITED - Cannot be deployed in EU",
+                   'Article 5', PROHIBITIONS_APPLY, ("Decommissioning or withdrawal record",)),
+        Obligation('unacceptable.alternatives', "Consider alternative approaches"),
+        Obligation('unacceptable.legal_review', "Consult legal experts immediately",
+                   evidence=("Legal opinion",)),
+    ),
+    'high': (
+        Obligation('high.risk_management', "📋 Establish risk management system (Article 9)",
+                   'Article 9', HIGH_RISK_APPLIES, ("Risk management plan", "Risk register")),
+        Obligation('high.data_governance', "📊 Implement data governance (Article 10)",
+                   'Article 10', HIGH_RISK_APPLIES,
+                   ("Data governance policy", "Training data provenance and bias examination")),
+        Obligation('high.technical_documentation',
+                   "📄 Prepare technical documentation (Article 11)",
+                   'Article 11', HIGH_RISK_APPLIES, ("Technical documentation (Annex IV)",)),
+        Obligation('high.human_oversight', "👤 Design human oversight mechanisms (Article 14)",
+                   'Article 14', HIGH_RISK_APPLIES,
+                   ("Human oversight procedure", "Operator training records")),
+        Obligation('high.conformity_assessment', "🛡️ Conduct conformity assessment",
+                   'Article 43', HIGH_RISK_APPLIES,
+                   ("Conformity assessment report", "EU declaration of conformity")),
+    ),
+    'limited': (
+        Obligation('limited.inform_users', "ℹ️ Inform users of AI interaction (Article 52)",
+                   'Article 52', TRANSPARENCY_APPLIES, ("User-facing AI disclosure",)),
+        Obligation('limited.label_content', "🏷️ Label AI-generated content",
+                   'Article 52', TRANSPARENCY_APPLIES, ("Content labelling mechanism",)),
+        Obligation('limited.transparency_records', "📝 Document transparency measures",
+                   evidence=("Transparency documentation",)),
+    ),
+    'minimal': (
+        Obligation('minimal.none', "✅ No mandatory compliance"),
+        Obligation('minimal.voluntary', "💡 Consider voluntary guidelines"),
+        Obligation('minimal.inventory', "📋 Document for internal governance",
+                   evidence=("AI inventory entry",)),
+    ),
+}
+
+def _rule_obligation(category: str, rule: Dict) -> Obligation:
+    """The obligation a matched rule adds, citing its own article or annex."""
+    rule_id = str(rule['id'])
+    basis = rule.get('article') or rule.get('annex')
+    cited = f" ({basis})" if basis else ''
+    deadline = CATEGORY_DEADLINES[category]
+    if category == 'prohibited_practices':
+        return Obligation(f"{rule_id}.prohibited", f"⛔ {rule['title']} is prohibited{cited}",
+                          basis, deadline, ("Decommissioning or withdrawal record",), rule_id)
+    if category == 'high_risk_systems':
+        return Obligation(f"{rule_id}.classification",
+                          f"📌 Record the high-risk classification as {rule['title']}{cited}",
+                          basis, deadline, ("Classification rationale",), rule_id)
+    return Obligation(f"{rule_id}.transparency",
+                      f"ℹ️ Meet the transparency duty for {rule['title']}{cited}",
+                      basis, deadline, ("Transparency notice",), rule_id)
+
+def rule_obligations(category: str, rule: Dict) -> Tuple[Obligation, ...]:
+    """Obligations added by one rule: a generic one citing the rule, then its
+    rule pack ``obligations`` (see ``rulepack.validate_rules``)."""
+    rule_id = str(rule['id'])
+    obligations = [_rule_obligation(category, rule)]
+    for position, item in enumerate(rule.get('obligations') or (), 1):
+        obligations.append(Obligation(
+            str(item.get('id') or f"{rule_id}.{position}"), item['text'],
+            item.get('article'), item.get('deadline') or CATEGORY_DEADLINES[category],
+            tuple(item.get('evidence') or ()), rule_id))
+    return tuple(obligations)
+
+# Memoized lookup keys per kind; real rule combinations stay far below this
+MAX_MEMO_KEYS = 4096
+
+class ObligationTable:
+    """Recommendations and obligations of a rule base, keyed by risk level
+    and matched rule ids.
+
+    Tier obligations and the obligations of every rule are compiled once.
+    Lookups are memoized per key and return the same immutable tuples, so
+    assessments and batch results hold references into the table rather
+    than copies. Only keys made of a known risk level and known rule ids are
+    memoized, at most ``MAX_MEMO_KEYS`` per lookup kind, so arbitrary ids
+    from API clients cannot grow the table.
+    """
+
+    def __init__(self, rules: Dict,
+                 tiers: Optional[Dict[str, Tuple[Obligation, ...]]] = None):
+        self.rules = rules
+        self.tiers = tiers if tiers is not None else RISK_OBLIGATIONS
+        self.by_rule: Dict[str, Tuple[Obligation, ...]] = {}
+        for category in RULE_CATEGORIES:
+            for rule in rules.get(category, []):
+                if 'id' in rule:
+                    self.by_rule[str(rule['id'])] = rule_obligations(category, rule)
+        self._obligations: Dict[Tuple, Tuple[Obligation, ...]] = {}
+        self._recommendations: Dict[Tuple, Tuple[str, ...]] = {}
+        self._ids: Dict[Tuple, Tuple[str, ...]] = {}
+
+    def _remember(self, memo: Dict[Tuple, Tuple], key: Tuple, value: Tuple) -> Tuple:
+        if (len(memo) < MAX_MEMO_KEYS and key[0] in self.tiers
+                and all(str(rule_id) in self.by_rule for rule_id in key[1:])):
+            # Concurrent first lookups may both build; the first stored wins
+            return memo.setdefault(key, value)
+        return value
+
+    def obligations(self, risk_level: str, rule_ids: Iterable = ()) -> Tuple[Obligation, ...]:
+        """Tier obligations, then those of each matched rule; unknown ids are skipped."""
+        key = (risk_level, *rule_ids)
+        cached = self._obligations.get(key)
+        if cached is None:
+            obligations = list(self.tiers.get(risk_level, self.tiers['minimal']))
+            for rule_id in key[1:]:
+                obligations.extend(self.by_rule.get(str(rule_id), ()))
+            cached = self._remember(self._obligations, key, tuple(obligations))
+        return cached
+
+    def recommendations(self, risk_level: str, rule_ids: Iterable = ()) -> Tuple[str, ...]:
+        key = (risk_level, *rule_ids)
+        cached = self._recommendations.get(key)
+        if cached is None:
+            texts = tuple(obligation.text for obligation in self.obligations(risk_level, key[1:]))
+            cached = self._remember(self._recommendations, key, texts)
+        return cached
+
+    def obligation_ids(self, risk_level: str, rule_ids: Iterable = ()) -> Tuple[str, ...]:
+        key = (risk_level, *rule_ids)
+        cached = self._ids.get(key)
+        if cached is None:
+            ids = tuple(obligation.id for obligation in self.obligations(risk_level, key[1:]))
+            cached = self._remember(self._ids, key, ids)
+        return cached
+
+    def for_assessment(self, assessment: Dict) -> Tuple[Obligation, ...]:
+        """Obligations of a stored assessment, from its risk level and matched rules."""
+        return self.obligations(assessment.get('risk_level') or 'minimal',
+                                assessment.get('matched_rules') or ())
+
+    def recommendations_for(self, assessment: Dict) -> Tuple[str, ...]:
+        """Recommendation texts of a stored assessment, looked up on read."""
+        return self.recommendations(assessment.get('risk_level') or 'minimal',
+                                    assessment.get('matched_rules') or ())
+
+_TABLE_CACHE: Dict[int, ObligationTable] = {}
+_TABLE_CACHE_LOCK = threading.Lock()
+# Bounded like the matcher cache, for reloaded rule packs
+MAX_CACHED_TABLES = 8
+
+def get_obligation_table(rules: Dict) -> ObligationTable:
+    """Return the obligation table of a rule base, compiling it on first use.
+
+    Rule bases are treated as immutable once compiled.
+    """
+    table = _TABLE_CACHE.get(id(rules))
+    if table is None or table.rules is not rules:
+        table = ObligationTable(rules)
+        with _TABLE_CACHE_LOCK:
+            _TABLE_CACHE.pop(id(rules), None)
+            _TABLE_CACHE[id(rules)] = table
+            while len(_TABLE_CACHE) > MAX_CACHED_TABLES:
+                del _TABLE_CACHE[next(iter(_TABLE_CACHE))]
+    return table
+
+def obligation_dicts(obligations: Iterable[Obligation]) -> List[Dict]:
+    """JSON-ready view of obligations, e.g. for API responses."""
+    return [obligation.to_dict() for obligation in obligations]
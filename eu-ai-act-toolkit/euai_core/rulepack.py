@@ -0,0 +1,272 @@
+"""
+EU AI Act Toolkit - Rule packs
+Loads, validates, compiles and hot-reloads JSON/YAML rule packs
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .cache import ResultCache, rules_fingerprint
+from .classifier import RiskClassifier
+from .matcher import KeywordMatcher, create_matcher, register_matcher
+from .rules import RULE_CATEGORIES
+
+# Bumped whenever the pickled matcher layout changes
+SNAPSHOT_FORMAT = 2
+
+REQUIRED_RULE_FIELDS = ('id', 'title', 'keywords', 'fine')
+
+class RulePackError(ValueError):
+    """Raised for rule packs that cannot be read or fail validation."""
+
+def parse_rule_pack(text: str, path: str = '<string>') -> Dict:
+    """Parse a JSON or YAML rule pack; YAML needs PyYAML."""
+    if path.endswith(('.yaml', '.yml')):
+        try:
+            import yaml
+        except ImportError:
+            raise RulePackError("PyYAML is required to load YAML rule packs") from None
+        try:
+            return yaml.safe_load(text)
+        except yaml.YAMLError as e:
+            raise RulePackError(f"{path}: invalid YAML: {e}") from None
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError as e:
+        raise RulePackError(f"{path}: invalid JSON: {e}") from None
+
+def validate_rules(rules, path: str = '<rules>') -> Dict:
+    """Check a rule base and return it normalized.
+
+    Every category of ``RULE_CATEGORIES`` is present, and keywords are
+    stripped and lowercased since classification matches lowercased text.
+    """
+    if not isinstance(rules, dict):
+        raise RulePackError(f"{path}: a rule pack maps categories to lists of rules")
+    unknown = set(rules) - set(RULE_CATEGORIES)
+    if unknown:
+        raise RulePackError(f"{path}: unknown categories {sorted(unknown)}, "
+                            f"expected {list(RULE_CATEGORIES)}")
+
+    seen_ids = set()
+    normalized: Dict[str, List[Dict]] = {}
+    for category in RULE_CATEGORIES:
+        category_rules = rules.get(category) or []
+        if not isinstance(category_rules, list):
+            raise RulePackError(f"{path}: '{category}' must be a list of rules")
+        normalized[category] = []
+        for position, rule in enumerate(category_rules):
+            where = f"{path}: {category}[{position}]"
+            if not isinstance(rule, dict):
+                raise RulePackError(f"{where} must be a mapping")
+            missing = [field for field in REQUIRED_RULE_FIELDS if field not in rule]
+            if missing:
+                raise RulePackError(f"{where} is missing {missing}")
+            if rule['id'] in seen_ids:
+                raise RulePackError(f"{where} duplicates rule id '{rule['id']}'")
+            seen_ids.add(rule['id'])
+            keywords = rule['keywords']
+            if (not isinstance(keywords, list) or not keywords
+                    or not all(isinstance(k, str) and k.strip() for k in keywords)):
+                raise RulePackError(f"{where} needs a non-empty list of non-empty keywords")
+            rule = dict(rule, keywords=[k.strip().lower() for k in keywords])
+            if 'translations' in rule:
+                rule['translations'] = _validate_translations(rule['translations'], where)
+            if 'obligations' in rule:
+                rule['obligations'] = _validate_obligations(rule['obligations'], where)
+            normalized[category].append(rule)
+    return normalized
+
+def _validate_translations(translations, where: str) -> Dict[str, List[str]]:
+    if not isinstance(translations, dict):
+        raise RulePackError(f"{where}: 'translations' maps languages to keyword lists")
+    normalized = {}
+    for language, keywords in translations.items():
+        if (not isinstance(keywords, list)
+                or not all(isinstance(k, str) and k.strip() for k in keywords)):
+            raise RulePackError(f"{where}: translations['{language}'] needs non-empty keywords")
+        normalized[language] = [k.strip().lower() for k in keywords]
+    return normalized
+
+# Optional text fields of a rule's ``obligations`` items
+OBLIGATION_FIELDS = ('id', 'article', 'deadline')
+
+def _validate_obligations(obligations, where: str) -> List[Dict]:
+    if not isinstance(obligations, list):
+        raise RulePackError(f"{where}: 'obligations' must be a list")
+    normalized = []
+    for position, item in enumerate(obligations):
+        at = f"{where}: obligations[{position}]"
+        if isinstance(item, str):
+            item = {'text': item}
+        if not isinstance(item, dict) or not isinstance(item.get('text'), str):
+            raise RulePackError(f"{at} needs a 'text'")
+        for field in OBLIGATION_FIELDS:
+            if item.get(field) is not None and not isinstance(item[field], str):
+                raise RulePackError(f"{at}: '{field}' must be a string")
+        evidence = item.get('evidence') or []
+        if not isinstance(evidence, list) or not all(isinstance(e, str) for e in evidence):
+            raise RulePackError(f"{at}: 'evidence' must be a list of strings")
+        normalized.append(dict(item, evidence=evidence))
+    return normalized
+
+def load_rule_pack(path: str) -> Dict:
+    """Read and validate a JSON/YAML rule pack file."""
+    with open(path, encoding='utf-8') as f:
+        return validate_rules(parse_rule_pack(f.read(), path), path)
+
+def save_snapshot(matcher, path: str, source_hash: Optional[str] = None):
+    """Pickle a compiled matcher (with its rules) for fast worker start-up.
+
+    Written to a temporary file and renamed, so readers never see a partial
+    snapshot.
+    """
+    payload = {
+        'format': SNAPSHOT_FORMAT,
+        'version': rules_fingerprint(matcher.rules),
+        'source_hash': source_hash,
+        'matcher': matcher,
+    }
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+def load_snapshot(path: str, source_hash: Optional[str] = None):
+    """Load a pickled matcher, registering substring matchers for their rules.
+
+    Returns None when the snapshot is missing, from another format version,
+    or (given ``source_hash``) compiled from a different source file.
+    Snapshots are pickles: only load files you wrote yourself.
+    """
+    try:
+        with open(path, 'rb') as f:
+            payload = pickle.load(f)
+    except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+        return None
+    if not isinstance(payload, dict) or payload.get('format') != SNAPSHOT_FORMAT:
+        return None
+    if source_hash is not None and payload.get('source_hash') != source_hash:
+        return None
+    matcher = payload['matcher']
+    return register_matcher(matcher) if isinstance(matcher, KeywordMatcher) else matcher
+
+class RulePack:
+    """A rule pack file compiled into a classifier that can be hot-swapped.
+
+    ``classifier`` always refers to a fully compiled ``RiskClassifier``.
+    ``reload()`` compiles a changed file off to the side and then replaces
+    that reference in one assignment, so in-flight classifications finish on
+    the rules they started with and never wait for a reload. Invalid files
+    are rejected and the previous rules stay active (see ``last_error``).
+
+    With ``snapshot_path``, the compiled index is pickled after each compile
+    and reused on start-up while the source file is unchanged. ``path`` may
+    also be a ``.pkl`` snapshot itself. ``matcher_options`` are passed to
+    ``create_matcher`` (e.g. ``matching='token'``).
+    """
+
+    def __init__(self, path: str, cache: Optional[ResultCache] = None,
+                 snapshot_path: Optional[str] = None, **matcher_options):
+        self.path = path
+        self.cache = cache
+        self.snapshot_path = snapshot_path
+        self.matcher_options = matcher_options
+        self.last_error: Optional[Exception] = None
+        self.source_hash: Optional[str] = None
+        self.classifier: Optional[RiskClassifier] = None
+        self.version: Optional[str] = None
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+        self._stat = None
+        if not self.reload():
+            raise self.last_error
+
+    @property
+    def rules(self) -> Dict:
+        return self.classifier.rules
+
+    def _compile(self, data: bytes, source_hash: str):
+        if self.path.endswith(('.pkl', '.pickle')):
+            matcher = load_snapshot(self.path)
+            if matcher is None:
+                raise RulePackError(f"{self.path}: not a rule pack snapshot")
+            return matcher
+        if self.snapshot_path:
+            matcher = load_snapshot(self.snapshot_path, source_hash)
+            if matcher is not None:
+                return matcher
+        rules = validate_rules(parse_rule_pack(data.decode('utf-8'), self.path), self.path)
+        matcher = create_matcher(rules, **self.matcher_options)
+        if self.snapshot_path:
+            save_snapshot(matcher, self.snapshot_path, source_hash)
+        return matcher
+
+    def reload(self) -> bool:
+        """Recompile if the file content changed; returns True when rules were swapped."""
+        with self._reload_lock:
+            try:
+                stat = os.stat(self.path)
+                with open(self.path, 'rb') as f:
+                    data = f.read()
+                # Snapshots are only reused for the same source and matcher options
+                options = json.dumps(self.matcher_options, sort_keys=True, default=list)
+                source_hash = hashlib.sha256(data + options.encode('utf-8')).hexdigest()
+                self._stat = (stat.st_mtime_ns, stat.st_size)
+                if source_hash == self.source_hash:
+                    return False
+                matcher = self._compile(data, source_hash)
+            except (OSError, RulePackError) as e:
+                self.last_error = e
+                return False
+            self.classifier = RiskClassifier(cache=self.cache, matcher=matcher)
+            self.version = rules_fingerprint(matcher.rules)
+            self.source_hash = source_hash
+            self.last_error = None
+            return True
+
+    def watch(self, interval: float = 2.0):
+        """Poll the file every ``interval`` seconds and reload it on change."""
+        if self._watcher is not None:
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, args=(interval,), daemon=True)
+        self._watcher.start()
+
+    def _watch(self, interval: float):
+        while not self._stop.wait(interval):
+            try:
+                stat = os.stat(self.path)
+            except OSError:
+                continue
+            if (stat.st_mtime_ns, stat.st_size) != self._stat:
+                self.reload()
+
+    def stop(self):
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    # Classifier interface, always served by the current rules
+
+    def classify(self, use_case: str, context: str, data_types: List[str],
+                 explain: bool = False) -> Dict:
+        return self.classifier.classify(use_case, context, data_types, explain)
+
+    def classify_batch(self, records: Iterable[Dict], explain: bool = False) -> Iterator[Dict]:
+        # One batch is classified entirely with the rules current at its start
+        return self.classifier.classify_batch(records, explain)
+
+    @property
+    def obligations(self):
+        return self.classifier.obligations
+
+    def generate_recommendations(self, risk_level: str,
+                                 matched_rules: Iterable = ()) -> List[str]:
+        return self.classifier.generate_recommendations(risk_level, matched_rules)
@@ -0,0 +1,163 @@
+"""
+EU AI Act Toolkit - Rule base
+Prohibited, high-risk and limited-risk rules with their keywords and fines
+"""
+
+from typing import Dict, List
+
+# Rule categories, in the order classify() evaluates them
+RULE_CATEGORIES = ("prohibited_practices", "high_risk_systems", "limited_risk_systems")
+
+# EU AI Act Knowledge Base
+EU_AI_ACT_RULES = {
+    "prohibited_practices": [
+        {
+            "id": "P1",
+            "article": "Article 5(1)(a)",
+            "title": "Subliminal Manipulation",
+            "description": "AI systems using subliminal techniques beyond consciousness",
+            "keywords": ["subliminal", "subconscious", "manipulative"],
+            "fine": "€35M or 7% global turnover"
+        },
+        {
+            "id": "P2",
+            "article": "Article 5(1)(b)",
+            "title": "Exploitation of Vulnerabilities",
+            "description": "Systems exploiting vulnerabilities of specific groups",
+            "keywords": ["children", "vulnerable", "disability", "exploitation"],
+            "fine": "€35M or 7% global turnover"
+        },
+        {
+            "id": "P3",
+            "article": "Article 5(1)(c)",
+            "title": "Social Scoring",
+            "description": "Social scoring by public authorities",
+            "keywords": ["social scoring", "social credit", "citizen scoring"],
+            "fine": "€35M or 7% global turnover"
+        }
+    ],
+    "high_risk_systems": [
+        {
+            "id": "HR1",
+            "annex": "Annex III(1)",
+            "title": "Biometric Identification",
+            "description": "Biometric identification and categorization",
+            "keywords": ["biometric", "facial recognition", "fingerprint", "iris"],
+            "sector": "Critical Infrastructure",
+            "fine": "€15M or 3% global turnover"
+        },
+        {
+            "id": "HR2",
+            "annex": "Annex III(2)",
+            "title": "Education Assessment",
+            "description": "AI in education and vocational training",
+            "keywords": ["education", "student assessment", "exam proctoring"],
+            "sector": "Education",
+            "fine": "€15M or 3% global turnover"
+        },
+        {
+            "id": "HR3",
+            "annex": "Annex III(3)",
+            "title": "Employment & Recruitment",
+            "description": "AI for recruitment and hiring decisions",
+            "keywords": ["recruitment", "hiring", "cv screening", "employee"],
+            "sector": "Employment",
+            "fine": "€15M or 3% global turnover"
+        },
+        {
+            "id": "HR4",
+            "annex": "Annex III(4)",
+            "title": "Essential Services",
+            "description": "Access to essential services",
+            "keywords": ["credit scoring", "insurance", "healthcare access"],
+            "sector": "Essential Services",
+            "fine": "€15M or 3% global turnover"
+        },
+        {
+            "id": "HR5",
+            "annex": "Annex III(5)",
+            "title": "Law Enforcement",
+            "description": "AI for law enforcement purposes",
+            "keywords": ["predictive policing", "crime prediction"],
+            "sector": "Law Enforcement",
+            "fine": "€15M or 3% global turnover"
+        }
+    ],
+    "limited_risk_systems": [
+        {
+            "id": "LR1",
+            "article": "Article 52(1)",
+            "title": "AI Interaction Transparency",
+            "description": "Systems interacting with humans",
+            "keywords": ["chatbot", "conversational ai", "virtual assistant"],
+            "fine": "€7.5M or 1.5% global turnover"
+        },
+        {
+            "id": "LR2",
+            "article": "Article 52(3)",
+            "title": "Deepfakes & Synthetic Media",
+            "description": "AI-generated content",
+            "keywords": ["deepfake", "synthetic media", "ai-generated"],
+            "fine": "€7.5M or 1.5% global turnover"
+        }
+    ]
+}
+
+# Keyword translations of the built-in rules, read only by token matching.
+# Kept out of the rule dicts so classification results keep their shape.
+RULE_TRANSLATIONS = {
+    "P1": {
+        "fr": ["subliminal", "subconscient", "manipulation", "manipulateur"],
+        "de": ["unterschwellig", "unterbewusst", "manipulativ", "manipulation"],
+        "es": ["subliminal", "subconsciente", "manipulación", "manipulador"]
+    },
+    "P2": {
+        "fr": ["enfants", "vulnérable", "handicap", "exploitation"],
+        "de": ["kinder", "schutzbedürftig", "behinderung", "ausnutzung"],
+        "es": ["niños", "vulnerable", "discapacidad", "explotación"]
+    },
+    "P3": {
+        "fr": ["notation sociale", "crédit social", "notation des citoyens"],
+        "de": ["sozialkredit", "soziale bewertung", "bürgerbewertung"],
+        "es": ["puntuación social", "crédito social", "puntuación ciudadana"]
+    },
+    "HR1": {
+        "fr": ["biométrique", "reconnaissance faciale", "empreinte digitale", "iris"],
+        "de": ["biometrisch", "gesichtserkennung", "fingerabdruck", "iris"],
+        "es": ["biométrico", "reconocimiento facial", "huella dactilar", "iris"]
+    },
+    "HR2": {
+        "fr": ["éducation", "évaluation des étudiants", "surveillance des examens"],
+        "de": ["bildung", "schülerbewertung", "prüfungsaufsicht"],
+        "es": ["educación", "evaluación de estudiantes", "supervisión de exámenes"]
+    },
+    "HR3": {
+        "fr": ["recrutement", "embauche", "tri de cv", "salarié", "employé"],
+        "de": ["personalauswahl", "rekrutierung", "bewerberauswahl", "lebenslauf", "mitarbeiter"],
+        "es": ["reclutamiento", "contratación", "selección de personal", "empleado"]
+    },
+    "HR4": {
+        "fr": ["notation de crédit", "score de crédit", "assurance", "accès aux soins"],
+        "de": ["bonitätsprüfung", "kreditwürdigkeit", "versicherung", "zugang zur gesundheitsversorgung"],
+        "es": ["calificación crediticia", "puntuación crediticia", "aseguradora", "acceso a la sanidad"]
+    },
+    "HR5": {
+        "fr": ["police prédictive", "prédiction de la criminalité"],
+        "de": ["vorausschauende polizeiarbeit", "kriminalitätsprognose"],
+        "es": ["policía predictiva", "predicción del delito"]
+    },
+    "LR1": {
+        "fr": ["chatbot", "agent conversationnel", "assistant virtuel"],
+        "de": ["chatbot", "sprachassistent", "virtueller assistent"],
+        "es": ["chatbot", "asistente virtual", "ia conversacional"]
+    },
+    "LR2": {
+        "fr": ["deepfake", "hypertrucage", "médias synthétiques", "généré par ia"],
+        "de": ["deepfake", "synthetische medien", "ki-generiert"],
+        "es": ["deepfake", "medios sintéticos", "generado por ia"]
+    }
+}
+
+def rule_translations(rule: Dict) -> Dict[str, List[str]]:
+    """Keyword translations by language: the rule's own, else the built-in ones for its id."""
+    return rule.get('translations') or RULE_TRANSLATIONS.get(rule.get('id'), {})
@@ -0,0 +1,143 @@
+"""
+EU AI Act Toolkit - Vectorized scoring
+Re-scores whole portfolios from rule-match and data-type indicator matrices with NumPy
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .cache import rules_fingerprint
+from .classifier import RISK_LEVELS, RiskClassifier, parse_data_types, scoring_weights
+from .rules import RULE_CATEGORIES
+
+def rule_columns(rules: Dict) -> List[Tuple[str, int]]:
+    """``(category, index)`` of every rule, in the column order of a rule-hit matrix."""
+    return [(category, index) for category in RULE_CATEGORIES
+            for index in range(len(rules.get(category, [])))]
+
+def score_matrix(rule_hits: np.ndarray, data_type_counts: np.ndarray, rules: Dict,
+                 weights: Optional[Dict[str, int]] = None) -> Dict[str, np.ndarray]:
+    """Score every record at once.
+
+    ``rule_hits`` is a boolean records x rules matrix in ``rule_columns(rules)``
+    order, and ``data_type_counts`` the number of data types per record, or a
+    records x data types count matrix. Returns arrays of ``risk_level``,
+    ``risk_score``, ``compliance_score`` and ``can_deploy``, equal to what
+    ``RiskClassifier.classify`` and ``compute_compliance_score`` give per
+    record with the same ``weights``.
+    """
+    weights = scoring_weights(weights)
+    rule_hits = np.asarray(rule_hits, dtype=bool)
+    counts = np.asarray(data_type_counts, dtype=np.int64)
+    if counts.ndim == 2:
+        counts = counts.sum(axis=1)
+
+    bounds = np.cumsum([0] + [len(rules.get(category, [])) for category in RULE_CATEGORIES])
+    if rule_hits.ndim != 2 or rule_hits.shape[1] != bounds[-1]:
+        raise ValueError(f"rule_hits must have one column per rule ({bounds[-1]}), "
+                         f"got shape {rule_hits.shape}")
+    per_category = {category: rule_hits[:, bounds[i]:bounds[i + 1]]
+                    for i, category in enumerate(RULE_CATEGORIES)}
+
+    prohibited = per_category['prohibited_practices'].any(axis=1)
+    high_matches = per_category['high_risk_systems'].sum(axis=1, dtype=np.int64)
+    high = ~prohibited & (high_matches > 0)
+    limited = ~prohibited & ~high & per_category['limited_risk_systems'].any(axis=1)
+
+    # Index into RISK_LEVELS, which is ordered from most to least severe
+    level = np.full(len(rule_hits), RISK_LEVELS.index('minimal'), dtype=np.int8)
+    level[limited] = RISK_LEVELS.index('limited')
+    level[high] = RISK_LEVELS.index('high')
+    level[prohibited] = RISK_LEVELS.index('unacceptable')
+
+    high_score = np.minimum(
+        weights['high_base_score'] + np.minimum(high_matches * weights['high_match_bonus'],
+                                                weights['high_max_bonus']),
+        weights['high_max_score'])
+    level_scores = np.array([weights['unacceptable_score'], 0,
+                             weights['limited_score'], weights['minimal_score']], dtype=np.int64)
+    risk_score = np.where(high, high_score, level_scores[level])
+
+    compliance_score = np.where(
+        high, weights['compliance_base'] + counts * weights['compliance_per_data_type'],
+        weights['compliance_default'])
+
+    return {
+        'risk_level': np.array(RISK_LEVELS)[level],
+        'risk_score': risk_score,
+        'compliance_score': compliance_score,
+        'can_deploy': ~prohibited,
+    }
+
+class ScoringMatrix:
+    """Rule-match and data-type indicators of a portfolio, ready for re-scoring.
+
+    Building the matrix runs the keyword matcher once per record; ``score()``
+    then re-scores the whole portfolio with any weights in a few vectorized
+    passes. ``save()``/``load()`` keep the matrix next to a database so
+    weight changes never re-match text. ``ids`` carries the record ``id``
+    values (or -1) so scores can be written back.
+    """
+
+    def __init__(self, rule_hits: np.ndarray, data_type_counts: np.ndarray, rules: Dict,
+                 data_types: Iterable[str], ids: Optional[np.ndarray] = None):
+        self.rule_hits = rule_hits
+        self.data_type_counts = data_type_counts
+        self.rules = rules
+        self.data_types = list(data_types)
+        self.ids = ids if ids is not None else np.full(len(rule_hits), -1, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.rule_hits)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict],
+                     classifier: Optional[RiskClassifier] = None) -> 'ScoringMatrix':
+        """Match records (as for ``classify_batch``) into indicator matrices."""
+        classifier = classifier or RiskClassifier()
+        columns = {column: position
+                   for position, column in enumerate(rule_columns(classifier.rules))}
+        data_type_columns: Dict[str, int] = {}
+        hit_rows, hit_columns, type_rows, type_columns, ids = [], [], [], [], []
+
+        for row, record in enumerate(records):
+            data_types = parse_data_types(record.get('data_types'))
+            matches = classifier.match(record.get('use_case') or '',
+                                       record.get('context') or '', data_types)
+            for category, indices in matches.items():
+                for index in indices:
+                    hit_rows.append(row)
+                    hit_columns.append(columns[category, index])
+            for data_type in data_types:
+                type_rows.append(row)
+                type_columns.append(data_type_columns.setdefault(data_type,
+                                                                 len(data_type_columns)))
+            ids.append(record.get('id', -1))
+
+        rule_hits = np.zeros((len(ids), len(columns)), dtype=bool)
+        rule_hits[hit_rows, hit_columns] = True
+        # Counts rather than flags: a repeated data type counts twice per record too
+        data_type_counts = np.zeros((len(ids), len(data_type_columns)), dtype=np.uint16)
+        np.add.at(data_type_counts, (type_rows, type_columns), 1)
+        return cls(rule_hits, data_type_counts, classifier.rules, data_type_columns,
+                   np.array(ids, dtype=np.int64))
+
+    def score(self, weights: Optional[Dict[str, int]] = None) -> Dict[str, np.ndarray]:
+        return score_matrix(self.rule_hits, self.data_type_counts, self.rules, weights)
+
+    def save(self, path: str):
+        """Write the matrices to a compressed ``.npz`` file."""
+        np.savez_compressed(path, rule_hits=self.rule_hits,
+                            data_type_counts=self.data_type_counts,
+                            data_types=np.array(self.data_types, dtype=str), ids=self.ids,
+                            version=np.array(rules_fingerprint(self.rules)))
+
+    @classmethod
+    def load(cls, path: str, rules: Dict) -> 'ScoringMatrix':
+        """Read a saved matrix; ``rules`` must be the rule base it was built with."""
+        with np.load(path) as data:
+            if str(data['version']) != rules_fingerprint(rules):
+                raise ValueError(f"{path} was built with a different rule base")
+            return cls(data['rule_hits'], data['data_type_counts'], rules,
+                       data['data_types'].tolist(), data['ids'])
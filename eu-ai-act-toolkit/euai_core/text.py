@@ -0,0 +1,106 @@
+"""
+EU AI Act Toolkit - Text normalization
+Unicode folding, tokenization and light stemming for English, French, German and Spanish
+"""
+
+import re
+import unicodedata
+from typing import Dict, Iterable, List
+
+LANGUAGES = ('en', 'fr', 'de', 'es')
+
+# Inflectional suffixes, stripped on accent-free casefolded tokens. These are
+# deliberately light: keywords and descriptions go through the same stemmer,
+# so consistency matters more than linguistic accuracy.
+SUFFIXES = {
+    'en': ('ations', 'ation', 'ments', 'ment', 'ings', 'ing', 'ies', 'ers', 'er',
+           'ed', 'es', 's', 'e', 'y'),
+    'fr': ('issements', 'issement', 'ations', 'ation', 'ements', 'ement', 'euses', 'euse',
+           'eurs', 'eur', 'ives', 'ive', 'ifs', 'if', 'ees', 'ee', 'es', 'er', 'e', 's'),
+    'de': ('erinnen', 'erin', 'ungen', 'ung', 'heiten', 'heit', 'keiten', 'keit',
+           'lichen', 'liche', 'lich', 'en', 'er', 'es', 'em', 'e', 'n', 's'),
+    'es': ('aciones', 'acion', 'amientos', 'amiento', 'imientos', 'imiento', 'idades', 'idad',
+           'ores', 'or', 'as', 'os', 'es', 'a', 'o', 's'),
+}
+
+# Dropped from both keywords and descriptions, so "tri de CV" matches "tri des CV"
+STOPWORDS = {
+    'en': {'a', 'an', 'and', 'by', 'for', 'in', 'of', 'on', 'or', 'the', 'to', 'with'},
+    'fr': {'au', 'aux', 'd', 'de', 'des', 'du', 'en', 'et', 'l', 'la', 'le', 'les', 'par',
+           'pour', 'un', 'une'},
+    'de': {'das', 'dem', 'den', 'der', 'des', 'die', 'ein', 'eine', 'fur', 'und', 'von',
+           'zum', 'zur'},
+    'es': {'a', 'al', 'de', 'del', 'el', 'en', 'la', 'las', 'los', 'para', 'por', 'un',
+           'una', 'y'},
+}
+
+MIN_STEM_LENGTH = 3
+MAX_STEM_CACHE = 100_000
+
+TOKEN_PATTERN = re.compile(r"\w+")
+COMBINING_MARKS = re.compile("[\u0300-\u036f]+")
+
+def fold(text: str) -> str:
+    """Casefold and strip accents (``Ärztin`` -> ``arztin``)."""
+    text = text.casefold()
+    if text.isascii():
+        return text
+    return COMBINING_MARKS.sub('', unicodedata.normalize('NFKD', text))
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(fold(text))
+
+class Stemmer:
+    """Suffix-stripping stemmer over the union of the given languages.
+
+    The longest matching suffix is removed as long as ``MIN_STEM_LENGTH``
+    characters remain. Stems are memoized, since descriptions reuse a small
+    vocabulary.
+    """
+
+    def __init__(self, languages: Iterable[str] = LANGUAGES):
+        self.languages = tuple(languages)
+        unknown = set(self.languages) - set(LANGUAGES)
+        if unknown:
+            raise ValueError(f"Unsupported languages {sorted(unknown)}, expected {LANGUAGES}")
+        self.suffixes = tuple(sorted({s for lang in self.languages for s in SUFFIXES[lang]},
+                                     key=len, reverse=True))
+        self.stopwords = frozenset(w for lang in self.languages for w in STOPWORDS[lang])
+        self._stems: Dict[str, str] = {}
+
+    def stem(self, token: str) -> str:
+        stem = self._stems.get(token)
+        if stem is None:
+            stem = token
+            for suffix in self.suffixes:
+                if token.endswith(suffix) and len(token) - len(suffix) >= MIN_STEM_LENGTH:
+                    stem = token[:-len(suffix)]
+                    break
+            if len(self._stems) >= MAX_STEM_CACHE:
+                self._stems.clear()
+            self._stems[token] = stem
+        return stem
+
+    def terms(self, text: str) -> List[str]:
+        """Fold, tokenize, drop stopwords and stem ``text``."""
+        stopwords, stem = self.stopwords, self.stem
+        return [stem(token) for token in tokenize(text) if token not in stopwords]
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance, or ``limit + 1`` once it exceeds ``limit``."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous2 is not None and i > 1 and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return min(previous[-1], limit + 1)
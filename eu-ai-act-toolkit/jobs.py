@@ -0,0 +1,192 @@
+"""
+EU AI Act Toolkit - Background jobs
+Bounded thread-pool job queue with job ids, progress polling and backpressure
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+JOB_STATES = ('queued', 'running', 'done', 'failed', 'cancelled')
+FINISHED_STATES = ('done', 'failed', 'cancelled')
+
+class QueueFull(RuntimeError):
+    """Raised by ``JobQueue.submit`` when ``max_pending`` jobs are already waiting or running."""
+
+class JobCancelled(Exception):
+    """Raised inside a job by ``Job.update`` once the job was cancelled."""
+
+class Job:
+    """Handle on one background job, shared by the worker and the pollers.
+
+    The job function receives it as first argument and reports progress with
+    ``update(done, total)``. Every change bumps ``version``, so pollers can
+    wait for the next change with ``wait_change`` instead of sleeping.
+    """
+
+    def __init__(self, description: str = '', total: Optional[int] = None):
+        self.id = uuid.uuid4().hex
+        self.description = description
+        self.status = 'queued'
+        self.done = 0
+        self.total = total
+        self.result = None
+        self.error: Optional[str] = None
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.version = 0
+        self._cancel = threading.Event()
+        self._changed = threading.Condition()
+        self._future = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def _set(self, **fields):
+        with self._changed:
+            for name, value in fields.items():
+                setattr(self, name, value)
+            self.version += 1
+            self._changed.notify_all()
+
+    def update(self, done: int, total: Optional[int] = None):
+        """Report progress; raises ``JobCancelled`` once cancellation was requested."""
+        if self._cancel.is_set():
+            raise JobCancelled(self.id)
+        self._set(done=done, total=total if total is not None else self.total)
+
+    def cancel(self) -> bool:
+        """Cancel a queued job, or ask a running one to stop at its next ``update``."""
+        if self.is_finished:
+            return False
+        self._cancel.set()
+        if self._future is not None and self._future.cancel():
+            self._set(status='cancelled', finished=time.time())
+        return True
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the job finished; returns whether it did within ``timeout``."""
+        with self._changed:
+            return self._changed.wait_for(lambda: self.is_finished, timeout)
+
+    def wait_change(self, version: int, timeout: Optional[float] = None) -> int:
+        """Block until ``version`` moved on (or the job finished); returns the new version."""
+        with self._changed:
+            self._changed.wait_for(lambda: self.version > version or self.is_finished, timeout)
+            return self.version
+
+    def progress(self) -> Optional[float]:
+        if self.status == 'done':
+            return 1.0
+        return self.done / self.total if self.total else None
+
+    def snapshot(self) -> Dict:
+        """JSON-friendly state of the job, without its result."""
+        with self._changed:
+            return {
+                'id': self.id,
+                'description': self.description,
+                'status': self.status,
+                'done': self.done,
+                'total': self.total,
+                'progress': self.progress(),
+                'error': self.error,
+                'created': self.created,
+                'started': self.started,
+                'finished': self.finished,
+                'version': self.version,
+            }
+
+    def _run(self, fn: Callable, args, kwargs):
+        if self._cancel.is_set():
+            self._set(status='cancelled', finished=time.time())
+            return
+        self._set(status='running', started=time.time())
+        try:
+            result = fn(self, *args, **kwargs)
+        except JobCancelled:
+            self._set(status='cancelled', finished=time.time())
+        except Exception as e:
+            self._set(status='failed', error=f"{type(e).__name__}: {e}", finished=time.time())
+        else:
+            self._set(status='done', result=result, finished=time.time())
+
+class JobQueue:
+    """Runs submitted functions on a fixed pool of worker threads.
+
+    ``workers`` bounds concurrency. At most ``max_pending`` jobs may be queued
+    or running at once; beyond that ``submit`` raises ``QueueFull`` (or waits
+    up to ``timeout`` seconds with ``block``), so callers get backpressure
+    instead of an unbounded backlog. The last ``keep_finished`` finished jobs
+    stay available to ``get`` for polling.
+
+    Threads keep submissions non-blocking for the caller; CPU-heavy jobs can
+    still fan out over processes, e.g. with ``ParallelClassifier``.
+    """
+
+    def __init__(self, workers: int = 2, max_pending: int = 100, keep_finished: int = 1000):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.keep_finished = keep_finished
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='euai-job')
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._jobs: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    def submit(self, fn: Callable, *args, description: str = '', total: Optional[int] = None,
+               block: bool = False, timeout: Optional[float] = None, **kwargs) -> Job:
+        """Queue ``fn(job, *args, **kwargs)`` and return its ``Job`` right away."""
+        if not self._slots.acquire(blocking=block, timeout=timeout if block else None):
+            raise QueueFull(f"{self.max_pending} jobs already pending")
+        job = Job(description, total)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        try:
+            job._future = self._executor.submit(job._run, fn, args, kwargs)
+        except RuntimeError:
+            self._slots.release()
+            raise
+        job._future.add_done_callback(lambda _: self._slots.release())
+        return job
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.is_finished]
+        for job_id in finished[:max(0, len(finished) - self.keep_finished)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        job = self.get(job_id)
+        return job.cancel() if job is not None else False
+
+    def jobs(self) -> List[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def stats(self) -> Dict:
+        counts = {state: 0 for state in JOB_STATES}
+        for job in self.jobs():
+            counts[job.status] += 1
+        return {'workers': self.workers, 'max_pending': self.max_pending, **counts}
+
+    def shutdown(self, wait: bool = True, cancel_pending: bool = False):
+        if cancel_pending:
+            for job in self.jobs():
+                if job.status == 'queued':
+                    job.cancel()
+        self._executor.shutdown(wait=wait)
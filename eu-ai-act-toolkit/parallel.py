@@ -0,0 +1,119 @@
+"""
+EU AI Act Toolkit - Multi-core classification engine
+Fans records out over a process pool and merges results in input order
+"""
+
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from euai_core import RULE_CATEGORIES, RiskClassifier, parse_data_types
+from streaming import iter_chunks
+
+# Per-worker classifier, built once by the pool initializer
+_worker_classifier: Optional[RiskClassifier] = None
+
+def _init_worker(matcher):
+    # Workers reuse the parent's compiled index instead of rebuilding it
+    global _worker_classifier
+    _worker_classifier = RiskClassifier(matcher=matcher)
+
+def _match_chunk(chunk: List[Tuple[str, str, List[str]]]) -> List[Tuple[Tuple[int, ...], ...]]:
+    # Tuples of rule indices per category pickle far smaller than dicts
+    match = _worker_classifier.match
+    results = []
+    for use_case, context, data_types in chunk:
+        matches = match(use_case, context, data_types)
+        results.append(tuple(tuple(matches[category]) for category in RULE_CATEGORIES))
+    return results
+
+def _explain_chunk(chunk: List[Tuple[str, str, List[str]]]) -> List[Tuple[Tuple, List[Dict]]]:
+    match_evidence = _worker_classifier.match_evidence
+    results = []
+    for use_case, context, data_types in chunk:
+        matches, evidence = match_evidence(use_case, context, data_types)
+        results.append((tuple(tuple(matches[category]) for category in RULE_CATEGORIES),
+                        evidence))
+    return results
+
+class ParallelClassifier:
+    """Classifies records over a ``ProcessPoolExecutor``.
+
+    The compiled rule base is sent to each worker once, through the pool
+    initializer.
+    Workers only return rule indices; the tiered result dicts are rebuilt in
+    the parent so they are identical to ``RiskClassifier.classify``. At most
+    ``max_pending`` chunks are in flight, which bounds memory on large inputs.
+    Recommendations come from the same rules, without the pool.
+    """
+
+    def __init__(self, rules: Optional[Dict] = None, workers: Optional[int] = None,
+                 chunk_size: int = 1000, max_pending: Optional[int] = None, matcher=None):
+        self.classifier = RiskClassifier(rules, matcher=matcher)
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.max_pending = max_pending or self.workers * 2
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # Request threads may share one classifier; only one of them starts the pool
+        self._executor_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                     initializer=_init_worker,
+                                                     initargs=(self.classifier.matcher,))
+            return self._executor
+
+    def close(self):
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+    @property
+    def obligations(self):
+        return self.classifier.obligations
+
+    def generate_recommendations(self, risk_level: str,
+                                 matched_rules: Iterable = ()) -> List[str]:
+        return self.classifier.generate_recommendations(risk_level, matched_rules)
+
+    def classify_batch(self, records: Iterable[Dict], explain: bool = False) -> Iterator[Dict]:
+        """Classify records in parallel, yielding results in input order.
+
+        With ``explain``, workers also return the match evidence.
+        """
+        items = ((record.get('use_case') or '',
+                  record.get('context') or '',
+                  parse_data_types(record.get('data_types')))
+                 for record in records)
+        chunks = iter_chunks(items, self.chunk_size)
+        task = _explain_chunk if explain else _match_chunk
+        pending = deque()
+
+        for chunk in chunks:
+            pending.append(self.executor.submit(task, chunk))
+            if len(pending) >= self.max_pending:
+                yield from self._merge(pending.popleft().result(), explain)
+
+        while pending:
+            yield from self._merge(pending.popleft().result(), explain)
+
+    def _merge(self, chunk_results: List, explain: bool = False) -> Iterator[Dict]:
+        classify_matches = self.classifier.classify_matches
+        if explain:
+            for matches, evidence in chunk_results:
+                yield classify_matches(dict(zip(RULE_CATEGORIES, matches)), evidence)
+            return
+        for matches in chunk_results:
+            yield classify_matches(dict(zip(RULE_CATEGORIES, matches)))
@@ -0,0 +1,102 @@
+"""
+EU AI Act Toolkit - Incremental re-classification
+Re-evaluates only the stored assessments a rule change can affect
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import List, Optional
+
+from cli import (add_rules_arguments, matcher_from_args, matcher_options_from_args,
+                 rule_pack_from_args)
+from euai_core import EU_AI_ACT_RULES, RiskClassifier, create_matcher, load_rule_pack
+from euai_core.incremental import ChangeReport, DependencyIndex, reclassify
+from storage import open_repository
+from streaming import RecordWriter, detect_format, open_text
+
+# Change report columns, one row per updated assessment
+REPORT_FIELDS = ['id', 'system_name', 'old_risk_level', 'new_risk_level', 'old_risk_score',
+                 'new_risk_score', 'old_matched_rules', 'new_matched_rules']
+
+def write_report(report: ChangeReport, path: str):
+    """Write the changed assessments to CSV/JSONL, or the whole report to ``.json``."""
+    if path.endswith('.json'):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report.to_dict(), f, ensure_ascii=False, indent=2)
+        return
+    fmt = detect_format(path)
+    rows = report.changes
+    if fmt == 'csv':
+        rows = [dict(row, old_matched_rules=';'.join(row['old_matched_rules']),
+                     new_matched_rules=';'.join(row['new_matched_rules'])) for row in rows]
+    with open_text(path, 'w') as stream:
+        RecordWriter(stream, fmt, REPORT_FIELDS).write_chunk(rows)
+
+def print_summary(report: ChangeReport, stream=sys.stderr):
+    diff = report.diff
+    stream.write(f"Rules: {len(diff.added)} added, {len(diff.removed)} removed, "
+                 f"{len(diff.changed)} changed\n")
+    scan = f" (one scan of {report.scanned} for new keywords)" if report.scanned else ''
+    stream.write(f"Re-evaluated {report.evaluated} assessments{scan}, "
+                 f"updated {len(report.changes)}\n")
+    for (old, new), count in report.transitions().items():
+        stream.write(f"  {old} -> {new}: {count}\n")
+    for change in report.moved:
+        stream.write(f"  #{change['id']} {change['system_name']}: "
+                     f"{change['old_risk_level']} -> {change['new_risk_level']}\n")
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='euai-reclassify',
+        description="Bring stored assessments up to date with a changed rule base")
+    parser.add_argument('database', help="Assessment database (.db SQLite or .euailog log)")
+    parser.add_argument('--index',
+                        help="Dependency index file (default: DATABASE.rules-index.npz)")
+    parser.add_argument('--previous-rules',
+                        help="Rule pack the stored assessments were classified with, used "
+                             "when the index does not exist yet (default: built-in rules)")
+    parser.add_argument('--report',
+                        help="Write changed assessments to CSV/JSONL, or the full report to .json")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="Report the changes without writing them or the index")
+    add_rules_arguments(parser)
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    index_path = args.index or f"{args.database}.rules-index.npz"
+    try:
+        rule_pack = rule_pack_from_args(args)
+        classifier = rule_pack.classifier if rule_pack else RiskClassifier(
+            matcher=matcher_from_args(args))
+        previous = load_rule_pack(args.previous_rules) if args.previous_rules else EU_AI_ACT_RULES
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    repository = open_repository(args.database)
+    try:
+        if os.path.exists(index_path):
+            index = DependencyIndex.load(index_path)
+        else:
+            sys.stderr.write(f"Indexing {repository.count()} assessments into {index_path}\n")
+            index = DependencyIndex.build(repository.iter_all(), RiskClassifier(
+                matcher=create_matcher(previous, **matcher_options_from_args(args))))
+        try:
+            report = reclassify(repository, classifier, index, write=not args.dry_run)
+        except ValueError as e:
+            parser.error(f"{e}; delete {index_path} to rebuild it")
+        if not args.dry_run:
+            index.save(index_path)
+    finally:
+        repository.close()
+
+    print_summary(report)
+    if args.report:
+        write_report(report, args.report)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
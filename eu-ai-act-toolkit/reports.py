@@ -0,0 +1,701 @@
+"""
+EU AI Act Toolkit - Audit reports
+Renders per-system and portfolio reports (HTML, PDF) into a zip archive
+"""
+
+import argparse
+import functools
+import html
+import math
+import os
+import re
+import sys
+import time
+import zipfile
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from string import Template
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from euai_core import EU_AI_ACT_RULES, RISK_LEVELS, get_obligation_table, load_rule_pack
+from storage import open_repository
+from streaming import detect_format, iter_chunks, read_assessments
+
+REPORT_FORMATS = ('html', 'pdf')
+
+# Gauge colors and bands, as drawn by charts.create_risk_gauge/create_compliance_chart
+RISK_COLORS = {
+    'unacceptable': '#d32f2f',
+    'high': '#f57c00',
+    'limited': '#fbc02d',
+    'minimal': '#388e3c',
+}
+RISK_STEPS = ((0, 25, '#e8f5e9'), (25, 50, '#fffde7'), (50, 75, '#fff3e0'), (75, 100, '#ffebee'))
+COMPLIANCE_STEPS = ((0, 50, '#ffebee'), (50, 80, '#fff3e0'), (80, 100, '#e8f5e9'))
+
+SYSTEM_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>$system_name - EU AI Act assessment</title>
+<style>
+body { font-family: sans-serif; max-width: 60rem; margin: 2rem auto; color: #222; }
+.banner { padding: 1rem; border-left: 5px solid $risk_color; background: #f8f9fa; }
+.charts img, .charts svg { width: 45%; }
+table { border-collapse: collapse; width: 100%; }
+th, td { text-align: left; padding: 0.3rem 0.5rem; border-bottom: 1px solid #ddd; }
+</style>
+</head>
+<body>
+<div class="banner">
+<h1>$risk_level RISK</h1>
+<h2>$system_name</h2>
+<p>Assessment #$id of $date &middot; sector: $sector</p>
+</div>
+<div class="charts">$risk_chart $compliance_chart</div>
+<table>
+<tr><th>Risk score</th><td>$risk_score/100</td></tr>
+<tr><th>Compliance</th><td>$compliance_score%</td></tr>
+<tr><th>Can deploy</th><td>$can_deploy</td></tr>
+<tr><th>Potential fine</th><td>$fine_amount</td></tr>
+<tr><th>Matched rules</th><td>$matched_rules</td></tr>
+</table>
+<h3>System</h3>
+<table>
+<tr><th>Use case</th><td>$use_case</td></tr>
+<tr><th>Context</th><td>$context</td></tr>
+<tr><th>Data types</th><td>$data_types</td></tr>
+</table>
+<h3>Obligations</h3>
+<table>
+<tr><th>#</th><th>Obligation</th><th>Basis</th><th>Applies from</th><th>Evidence needed</th></tr>
+$obligations
+</table>
+$evidence
+<p><small>Generated $generated by the EU AI Act Toolkit. Not legal advice.</small></p>
+</body>
+</html>
+"""
+
+PORTFOLIO_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>EU AI Act portfolio report</title>
+<style>
+body { font-family: sans-serif; max-width: 70rem; margin: 2rem auto; color: #222; }
+table { border-collapse: collapse; width: 100%; }
+th, td { text-align: left; padding: 0.3rem 0.5rem; border-bottom: 1px solid #ddd; }
+</style>
+</head>
+<body>
+<h1>EU AI Act portfolio report</h1>
+<p>$total systems &middot; mean risk score $mean_risk &middot;
+mean compliance $mean_compliance% &middot; $blocked cannot be deployed</p>
+$distribution_chart
+<h3>Risk levels</h3>
+<table>$risk_levels</table>
+<h3>Sectors</h3>
+<table>$sectors</table>
+<h3>Systems</h3>
+<table>
+<tr><th>#</th><th>System</th><th>Sector</th><th>Risk level</th><th>Risk</th><th>Compliance</th></tr>
+$systems
+</table>
+<p><small>Generated $generated by the EU AI Act Toolkit. Not legal advice.</small></p>
+</body>
+</html>
+"""
+
+def load_templates(directory: Optional[str] = None) -> Dict[str, str]:
+    """Report templates, with ``system.html``/``portfolio.html`` from ``directory``
+    replacing the built-in ones.
+
+    Templates are ``string.Template`` text; placeholders receive HTML-escaped
+    values and rendered fragments (see docs/api_reference.md).
+    """
+    templates = {'system': SYSTEM_TEMPLATE, 'portfolio': PORTFOLIO_TEMPLATE}
+    for name in templates if directory else ():
+        path = os.path.join(directory, f"{name}.html")
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                templates[name] = f.read()
+    return templates
+
+# Charts
+
+Wedge = Tuple[float, float, float, str]
+
+def gauge(kind: str, value: int, risk_level: str = '') -> Tuple[str, str, Tuple[Wedge, ...]]:
+    """Name, title and wedges of a ``'risk'`` or ``'compliance'`` gauge.
+
+    Wedges are (radius fraction, start, end, color) over a 0-100 half circle
+    and are painted in order: the color bands, the value bar, then a white
+    hub that leaves both as rings.
+    """
+    value = max(0, min(int(value or 0), 100))
+    if kind == 'risk':
+        name, title, steps = f"risk-{value}-{risk_level}", "Risk Score", RISK_STEPS
+        color = RISK_COLORS.get(risk_level, '#757575')
+    else:
+        name, title, steps = f"compliance-{value}", "Compliance", COMPLIANCE_STEPS
+        color = '#388e3c' if value >= 80 else '#f57c00'
+    wedges = tuple((1.0, low, high, band) for low, high, band in steps)
+    return name, title, wedges + ((0.85, 0, value, color), (0.6, 0, 100, '#ffffff'))
+
+def _angle(value: float) -> float:
+    # 0 is the left end of the half circle, 100 the right end
+    return 180 + 1.8 * value
+
+def _point(cx: float, cy: float, radius: float, value: float) -> Tuple[float, float]:
+    angle = math.radians(_angle(value))
+    return cx + radius * math.cos(angle), cy + radius * math.sin(angle)
+
+@functools.lru_cache(maxsize=2048)
+def gauge_svg(kind: str, value: int, risk_level: str = '') -> str:
+    """SVG of a gauge, rendered once per process for each distinct value."""
+    value = max(0, min(int(value or 0), 100))
+    _, title, wedges = gauge(kind, value, risk_level)
+    cx, cy, radius = 100, 110, 90
+    paths = []
+    for fraction, start, end, color in wedges:
+        if end <= start:
+            continue
+        r = radius * fraction
+        x1, y1 = _point(cx, cy, r, start)
+        x2, y2 = _point(cx, cy, r, end)
+        paths.append(f'<path d="M {cx} {cy} L {x1:.2f} {y1:.2f} A {r:.2f} {r:.2f} 0 0 1 '
+                     f'{x2:.2f} {y2:.2f} Z" fill="{color}"/>')
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 200 140" '
+            f'role="img" aria-label="{title}: {value}">'
+            f'<text x="{cx}" y="14" font-size="14" text-anchor="middle">{title}</text>'
+            f'{"".join(paths)}'
+            f'<text x="{cx}" y="{cy}" font-size="30" text-anchor="middle">{value}</text></svg>')
+
+def distribution_svg(counts: Dict[str, int]) -> str:
+    """Bar chart of assessments per risk level."""
+    width, bar_height, gap = 400, 24, 8
+    top = max(counts.values(), default=0) or 1
+    bars = []
+    for row, level in enumerate(RISK_LEVELS):
+        y = row * (bar_height + gap)
+        length = (width - 160) * counts.get(level, 0) / top
+        bars.append(f'<text x="0" y="{y + 17}" font-size="13">{level}</text>'
+                    f'<rect x="100" y="{y}" width="{length:.1f}" height="{bar_height}" '
+                    f'fill="{RISK_COLORS[level]}"/>'
+                    f'<text x="{106 + length:.1f}" y="{y + 17}" font-size="13">'
+                    f'{counts.get(level, 0)}</text>')
+    height = len(RISK_LEVELS) * (bar_height + gap)
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}" '
+            f'width="{width}" role="img" aria-label="Risk distribution">{"".join(bars)}</svg>')
+
+# PDF (fpdf2, pure Python)
+
+# Core PDF fonts are Latin-1; emoji and other symbols are dropped
+PDF_REPLACEMENTS = str.maketrans({'€': 'EUR ', '–': '-', '—': '-', '‘': "'", '’': "'",
+                                  '“': '"', '”': '"', '…': '...', '≥': '>=', '≤': '<='})
+
+def pdf_text(value) -> str:
+    text = str(value if value is not None else '').translate(PDF_REPLACEMENTS)
+    return text.encode('latin-1', 'ignore').decode('latin-1').strip()
+
+def require_pdf():
+    """The fpdf2 ``FPDF`` class; PDF reports need the optional fpdf2 package."""
+    try:
+        from fpdf import FPDF
+    except ImportError:
+        raise ImportError("fpdf2 is required for PDF reports (pip install fpdf2)") from None
+    return FPDF
+
+def _new_pdf():
+    pdf = require_pdf()(format='A4')
+    pdf.set_auto_page_break(True, margin=15)
+    pdf.add_page()
+    return pdf
+
+def _rgb(color: str) -> Tuple[int, int, int]:
+    return int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
+
+def _draw_gauge(pdf, x: float, y: float, width: float, kind: str, value: int,
+                risk_level: str = ''):
+    """Draw a gauge's wedges as PDF vector paths; no image is embedded."""
+    _, title, wedges = gauge(kind, value, risk_level)
+    radius = width / 2
+    pdf.set_font('Helvetica', size=10)
+    pdf.set_xy(x, y)
+    pdf.cell(width, 5, title, align='C')
+    cy = y + 6 + radius
+    for fraction, start, end, color in wedges:
+        if end <= start:
+            continue
+        r = radius * fraction
+        pdf.set_fill_color(*_rgb(color))
+        pdf.solid_arc(x + radius - r, cy - r, 2 * r, _angle(start), _angle(end), style='F')
+    pdf.set_font('Helvetica', 'B', 16)
+    pdf.set_xy(x, cy - 9)
+    pdf.cell(width, 8, str(max(0, min(int(value or 0), 100))), align='C')
+
+# Wrapped lines per (text, font, width); obligation texts repeat across systems
+_wrapped_lines: Dict[Tuple, List[str]] = {}
+MAX_WRAPPED_LINES = 4096
+
+def _pdf_paragraph(pdf, height: float, text: str):
+    """``multi_cell`` over the full width, reusing the line breaks of earlier calls."""
+    width = pdf.epw - (pdf.get_x() - pdf.l_margin)
+    if pdf.get_string_width(text) <= width - 2 * pdf.c_margin:
+        pdf.cell(width, height, text, new_x='LMARGIN', new_y='NEXT')
+        return
+    key = (text, pdf.font_family, pdf.font_style, pdf.font_size_pt, width)
+    lines = _wrapped_lines.get(key)
+    if lines is None:
+        lines = pdf.multi_cell(width, height, text, dry_run=True, output='LINES')
+        if len(_wrapped_lines) < MAX_WRAPPED_LINES:
+            _wrapped_lines[key] = lines
+    x = pdf.get_x()
+    for line in lines:
+        pdf.set_x(x)
+        pdf.cell(width, height, line, new_x='LMARGIN', new_y='NEXT')
+
+def _pdf_heading(pdf, text: str):
+    pdf.ln(3)
+    pdf.set_font('Helvetica', 'B', 12)
+    pdf.multi_cell(0, 7, pdf_text(text), new_x='LMARGIN', new_y='NEXT')
+    pdf.set_font('Helvetica', size=10)
+
+def _pdf_rows(pdf, rows: Iterable[Tuple[str, str]]):
+    for label, value in rows:
+        pdf.set_font('Helvetica', 'B', 10)
+        pdf.cell(40, 6, pdf_text(label))
+        pdf.set_font('Helvetica', size=10)
+        _pdf_paragraph(pdf, 6, pdf_text(value) or '-')
+
+# Rendering
+
+def _join(values) -> str:
+    if isinstance(values, (list, tuple)):
+        return ', '.join(str(value) for value in values)
+    return str(values or '')
+
+def report_name(assessment: Dict, position: int) -> str:
+    """Archive path stem of a system report: ``systems/000042-cv-screening-ai``."""
+    slug = re.sub(r'[^a-z0-9]+', '-', str(assessment.get('system_name') or '').lower())
+    number = str(assessment.get('id') or '')
+    number = int(number) if number.isdigit() else position
+    return f"systems/{number:06d}-{slug.strip('-')[:60] or 'system'}"
+
+class ReportRenderer:
+    """Renders one system's reports and the portfolio report.
+
+    Obligations come from the obligation table of ``rules`` (the built-in
+    rules by default), looked up from each assessment's risk level and
+    matched rules. With ``inline_charts`` HTML reports embed their gauges;
+    otherwise they link to ``charts/<name>.svg`` in the archive, written
+    once per distinct gauge.
+    """
+
+    def __init__(self, formats: Iterable[str] = ('html',), templates: Optional[Dict] = None,
+                 rules: Optional[Dict] = None, inline_charts: bool = False):
+        self.formats = tuple(formats)
+        unknown = set(self.formats) - set(REPORT_FORMATS)
+        if unknown:
+            raise ValueError(f"Unknown report formats {sorted(unknown)}, "
+                             f"expected {list(REPORT_FORMATS)}")
+        templates = templates or load_templates()
+        self.system_template = Template(templates['system'])
+        self.portfolio_template = Template(templates['portfolio'])
+        self.obligations = get_obligation_table(rules if rules is not None else EU_AI_ACT_RULES)
+        self.inline_charts = inline_charts
+        self.generated = date.today().isoformat()
+
+    def charts(self, assessment: Dict) -> List[Tuple[str, int, str]]:
+        level = assessment.get('risk_level') or 'minimal'
+        return [('risk', int(assessment.get('risk_score') or 0), level),
+                ('compliance', int(assessment.get('compliance_score') or 0), '')]
+
+    def _chart_html(self, kind: str, value: int, risk_level: str) -> str:
+        if self.inline_charts:
+            return gauge_svg(kind, value, risk_level)
+        name, title, _ = gauge(kind, value, risk_level)
+        return f'<img src="../charts/{name}.svg" alt="{title}: {value}">'
+
+    def system_html(self, assessment: Dict) -> str:
+        e = html.escape
+        rows = []
+        for position, obligation in enumerate(self.obligations.for_assessment(assessment), 1):
+            rows.append(f"<tr><td>{position}</td><td>{e(obligation.text)}</td>"
+                        f"<td>{e(obligation.article or '')}</td>"
+                        f"<td>{e(obligation.deadline or '')}</td>"
+                        f"<td>{e(', '.join(obligation.evidence))}</td></tr>")
+        evidence = ''
+        if assessment.get('evidence'):
+            items = ''.join(f"<li><strong>{e(str(item.get('rule_id')))}</strong>: "
+                            f"&quot;{e(str(item.get('keyword')))}&quot; in "
+                            f"{e(str(item.get('field')))}</li>"
+                            for item in assessment['evidence'])
+            evidence = f"<h3>Why this classification</h3><ul>{items}</ul>"
+        level = assessment.get('risk_level') or 'minimal'
+        risk_chart, compliance_chart = (self._chart_html(*chart)
+                                        for chart in self.charts(assessment))
+        return self.system_template.safe_substitute(
+            id=e(str(assessment.get('id') or '')),
+            system_name=e(str(assessment.get('system_name') or 'Unnamed system')),
+            date=e(str(assessment.get('date') or '')),
+            sector=e(str(assessment.get('sector') or '')),
+            use_case=e(str(assessment.get('use_case') or '')),
+            context=e(str(assessment.get('context') or '')),
+            data_types=e(_join(assessment.get('data_types'))),
+            risk_level=e(level.upper()),
+            risk_color=RISK_COLORS.get(level, '#757575'),
+            risk_score=e(str(assessment.get('risk_score', ''))),
+            compliance_score=e(str(assessment.get('compliance_score', ''))),
+            can_deploy="Yes" if assessment.get('can_deploy') else "No",
+            fine_amount=e(str(assessment.get('fine_amount') or 'N/A')),
+            matched_rules=e(_join(assessment.get('matched_rules')) or 'None'),
+            risk_chart=risk_chart, compliance_chart=compliance_chart,
+            obligations='\n'.join(rows), evidence=evidence, generated=self.generated)
+
+    def system_pdf(self, assessment: Dict) -> bytes:
+        pdf = _new_pdf()
+        level = assessment.get('risk_level') or 'minimal'
+        pdf.set_fill_color(*_rgb(RISK_COLORS.get(level, '#757575')))
+        pdf.rect(10, 10, 3, 18, style='F')
+        pdf.set_xy(16, 10)
+        pdf.set_font('Helvetica', 'B', 16)
+        pdf.cell(0, 9, f"{level.upper()} RISK", new_x='LMARGIN', new_y='NEXT')
+        pdf.set_x(16)
+        pdf.set_font('Helvetica', size=12)
+        pdf.cell(0, 8, pdf_text(assessment.get('system_name') or 'Unnamed system'),
+                 new_x='LMARGIN', new_y='NEXT')
+
+        top = pdf.get_y() + 4
+        for column, chart in enumerate(self.charts(assessment)):
+            _draw_gauge(pdf, 25 + column * 95, top, 60, *chart)
+        pdf.set_xy(10, top + 45)
+        _pdf_rows(pdf, [
+            ("Assessment", f"#{assessment.get('id') or ''} of {assessment.get('date') or ''}"),
+            ("Sector", assessment.get('sector')),
+            ("Risk score", f"{assessment.get('risk_score', '')}/100"),
+            ("Compliance", f"{assessment.get('compliance_score', '')}%"),
+            ("Can deploy", "Yes" if assessment.get('can_deploy') else "No"),
+            ("Potential fine", assessment.get('fine_amount') or 'N/A'),
+            ("Matched rules", _join(assessment.get('matched_rules')) or 'None'),
+            ("Use case", assessment.get('use_case')),
+            ("Context", assessment.get('context')),
+            ("Data types", _join(assessment.get('data_types'))),
+        ])
+
+        _pdf_heading(pdf, "Obligations")
+        for position, obligation in enumerate(self.obligations.for_assessment(assessment), 1):
+            pdf.set_font('Helvetica', size=10)
+            _pdf_paragraph(pdf, 5, f"{position}. {pdf_text(obligation.text)}")
+            detail = [obligation.article,
+                      f"applies from {obligation.deadline}" if obligation.deadline else None,
+                      f"evidence: {', '.join(obligation.evidence)}" if obligation.evidence
+                      else None]
+            detail = ' - '.join(part for part in detail if part)
+            if detail:
+                pdf.set_font('Helvetica', 'I', 8)
+                _pdf_paragraph(pdf, 4, f"    {pdf_text(detail)}")
+
+        if assessment.get('evidence'):
+            _pdf_heading(pdf, "Why this classification")
+            for item in assessment['evidence']:
+                pdf.multi_cell(0, 5, pdf_text(f"{item.get('rule_id')}: \"{item.get('keyword')}\" "
+                                              f"in {item.get('field')}"),
+                               new_x='LMARGIN', new_y='NEXT')
+        pdf.ln(4)
+        pdf.set_font('Helvetica', 'I', 8)
+        pdf.multi_cell(0, 4, f"Generated {self.generated} by the EU AI Act Toolkit. "
+                             f"Not legal advice.", new_x='LMARGIN', new_y='NEXT')
+        return bytes(pdf.output())
+
+    def system_files(self, assessment: Dict, position: int) -> List[Tuple[str, bytes]]:
+        """``(archive path, content)`` of each requested format for one system."""
+        stem = report_name(assessment, position)
+        files = []
+        if 'html' in self.formats:
+            files.append((f"{stem}.html", self.system_html(assessment).encode('utf-8')))
+        if 'pdf' in self.formats:
+            files.append((f"{stem}.pdf", self.system_pdf(assessment)))
+        return files
+
+    def portfolio_html(self, portfolio: 'Portfolio') -> str:
+        e = html.escape
+        levels = ''.join(f"<tr><th>{level}</th><td>{portfolio.by_level.get(level, 0)}</td></tr>"
+                         for level in RISK_LEVELS)
+        sectors = ''.join(f"<tr><th>{e(sector)}</th><td>{count}</td></tr>"
+                          for sector, count in portfolio.by_sector.most_common())
+        systems = []
+        for row in portfolio.rows:
+            name = e(row['system_name'])
+            if portfolio.link_format:
+                name = f'<a href="{e(row["stem"])}.{portfolio.link_format}">{name}</a>'
+            systems.append(f"<tr><td>{e(str(row['id']))}</td><td>{name}</td>"
+                           f"<td>{e(row['sector'])}</td><td>{e(row['risk_level'])}</td>"
+                           f"<td>{row['risk_score']}</td><td>{row['compliance_score']}%</td></tr>")
+        summary = portfolio.summary()
+        return self.portfolio_template.safe_substitute(
+            total=summary['total'], mean_risk=f"{summary['mean_risk']:.1f}",
+            mean_compliance=f"{summary['mean_compliance']:.1f}", blocked=summary['blocked'],
+            distribution_chart=distribution_svg(portfolio.by_level), risk_levels=levels,
+            sectors=sectors, systems='\n'.join(systems), generated=self.generated)
+
+    def portfolio_pdf(self, portfolio: 'Portfolio') -> bytes:
+        pdf = _new_pdf()
+        summary = portfolio.summary()
+        pdf.set_font('Helvetica', 'B', 16)
+        pdf.cell(0, 10, "EU AI Act portfolio report", new_x='LMARGIN', new_y='NEXT')
+        pdf.set_font('Helvetica', size=10)
+        pdf.multi_cell(0, 5, f"{summary['total']} systems - mean risk score "
+                             f"{summary['mean_risk']:.1f} - mean compliance "
+                             f"{summary['mean_compliance']:.1f}% - {summary['blocked']} cannot "
+                             f"be deployed", new_x='LMARGIN', new_y='NEXT')
+
+        _pdf_heading(pdf, "Risk levels")
+        top = max(portfolio.by_level.values(), default=0) or 1
+        for level in RISK_LEVELS:
+            count = portfolio.by_level.get(level, 0)
+            y = pdf.get_y()
+            pdf.cell(30, 6, level)
+            pdf.set_fill_color(*_rgb(RISK_COLORS[level]))
+            if count:
+                pdf.rect(40, y + 1, 120 * count / top, 4, style='F')
+            pdf.set_x(165)
+            pdf.cell(0, 6, str(count), new_x='LMARGIN', new_y='NEXT')
+
+        _pdf_heading(pdf, "Sectors")
+        _pdf_rows(pdf, [(sector, str(count))
+                        for sector, count in portfolio.by_sector.most_common()])
+
+        _pdf_heading(pdf, "Systems")
+        widths = (15, 70, 45, 25, 15, 20)
+        pdf.set_font('Helvetica', 'B', 9)
+        for width, label in zip(widths, ("#", "System", "Sector", "Risk level", "Risk",
+                                         "Compl.")):
+            pdf.cell(width, 6, label)
+        pdf.ln()
+        pdf.set_font('Helvetica', size=9)
+        for row in portfolio.rows:
+            values = (row['id'], row['system_name'], row['sector'], row['risk_level'],
+                      row['risk_score'], f"{row['compliance_score']}%")
+            for width, value in zip(widths, values):
+                text = pdf_text(value)
+                while text and pdf.get_string_width(text) > width - 1:
+                    text = text[:-1]
+                pdf.cell(width, 5, text)
+            pdf.ln()
+        return bytes(pdf.output())
+
+class Portfolio:
+    """Portfolio totals and one summary row per system, gathered as reports stream by."""
+
+    def __init__(self, link_format: Optional[str] = None):
+        self.link_format = link_format
+        self.by_level: Counter = Counter()
+        self.by_sector: Counter = Counter()
+        self.rows: List[Dict] = []
+        self._risk_total = self._compliance_total = 0
+        self.blocked = 0
+
+    def add(self, assessment: Dict, stem: str):
+        level = assessment.get('risk_level') or 'minimal'
+        risk_score = int(assessment.get('risk_score') or 0)
+        compliance_score = int(assessment.get('compliance_score') or 0)
+        self.by_level[level] += 1
+        self.by_sector[assessment.get('sector') or 'Unspecified'] += 1
+        self._risk_total += risk_score
+        self._compliance_total += compliance_score
+        self.blocked += not assessment.get('can_deploy', True)
+        self.rows.append({'id': assessment.get('id') or len(self.rows) + 1,
+                          'system_name': str(assessment.get('system_name') or ''),
+                          'sector': str(assessment.get('sector') or ''),
+                          'risk_level': level, 'risk_score': risk_score,
+                          'compliance_score': compliance_score, 'stem': stem})
+
+    def summary(self) -> Dict:
+        total = len(self.rows)
+        return {
+            'total': total,
+            'by_level': dict(self.by_level),
+            'mean_risk': self._risk_total / total if total else 0.0,
+            'mean_compliance': self._compliance_total / total if total else 0.0,
+            'blocked': self.blocked,
+        }
+
+# Worker pool
+
+# Per-worker renderer, built once by the pool initializer
+_worker_renderer: Optional[ReportRenderer] = None
+
+def _init_worker(formats: Tuple[str, ...], templates: Dict, rules: Optional[Dict]):
+    global _worker_renderer
+    _worker_renderer = ReportRenderer(formats, templates, rules)
+
+def _render_chunk(chunk: List[Tuple[int, Dict]]) -> List[List[Tuple[str, bytes]]]:
+    return [_worker_renderer.system_files(assessment, position) for position, assessment in chunk]
+
+Chunk = List[Tuple[int, Dict]]
+
+def _render_serial(renderer: ReportRenderer,
+                   chunks: Iterator[Chunk]) -> Iterator[Tuple[Chunk, List[List]]]:
+    for chunk in chunks:
+        yield chunk, [renderer.system_files(assessment, position)
+                      for position, assessment in chunk]
+
+def _render_parallel(executor: ProcessPoolExecutor, chunks: Iterator[Chunk],
+                     max_pending: int) -> Iterator[Tuple[Chunk, List[List]]]:
+    pending = deque()
+    for chunk in chunks:
+        pending.append((chunk, executor.submit(_render_chunk, chunk)))
+        if len(pending) >= max_pending:
+            chunk, future = pending.popleft()
+            yield chunk, future.result()
+    while pending:
+        chunk, future = pending.popleft()
+        yield chunk, future.result()
+
+def write_reports(assessments: Iterable[Dict], target: Union[str, BinaryIO],
+                  formats: Iterable[str] = ('html',), workers: int = 1, chunk_size: int = 20,
+                  templates: Optional[Dict] = None, rules: Optional[Dict] = None,
+                  portfolio: bool = True, progress=None) -> Dict:
+    """Render reports for every assessment and stream them into a zip archive.
+
+    System reports are rendered chunk by chunk on ``workers`` processes
+    (``0`` for every core) and written in input order as chunks finish; at
+    most two chunks per worker are in flight, so memory stays bounded. Gauge
+    SVGs for HTML reports are written to ``charts/`` once each. The
+    portfolio report (``portfolio.html``/``.pdf``) is rendered last from
+    per-system summary rows. ``target`` is a path or a binary stream.
+    ``progress(done)`` is called after each chunk.
+
+    Returns ``systems``, ``files``, ``charts``, ``bytes``, ``seconds`` and
+    ``systems_per_sec``.
+    """
+    formats = tuple(formats)
+    templates = templates or load_templates()
+    renderer = ReportRenderer(formats, templates, rules)
+    if 'pdf' in formats:
+        require_pdf()
+    workers = workers or os.cpu_count() or 1
+    collected = Portfolio(link_format=formats[0] if formats else None)
+    start = time.perf_counter()
+    files = written = 0
+    charts_written = set()
+
+    chunks = iter_chunks(enumerate(assessments, 1), chunk_size)
+    executor = None
+    if workers > 1:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                       initargs=(formats, templates, rules))
+    try:
+        with zipfile.ZipFile(target, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            results = (_render_parallel(executor, chunks, workers * 2) if executor
+                       else _render_serial(renderer, chunks))
+            for chunk, chunk_files in results:
+                for (position, assessment), system_files in zip(chunk, chunk_files):
+                    for name, content in system_files:
+                        archive.writestr(name, content)
+                        files += 1
+                        written += len(content)
+                    if 'html' in formats:
+                        for kind, value, level in renderer.charts(assessment):
+                            name = gauge(kind, value, level)[0]
+                            if name not in charts_written:
+                                charts_written.add(name)
+                                archive.writestr(f"charts/{name}.svg",
+                                                 gauge_svg(kind, value, level))
+                    collected.add(assessment, report_name(assessment, position))
+                if progress is not None:
+                    progress(len(collected.rows))
+
+            if portfolio:
+                for fmt in formats:
+                    content = (renderer.portfolio_html(collected).encode('utf-8') if fmt == 'html'
+                               else renderer.portfolio_pdf(collected))
+                    archive.writestr(f"portfolio.{fmt}", content)
+                    files += 1
+                    written += len(content)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    elapsed = time.perf_counter() - start
+    return {
+        'systems': len(collected.rows),
+        'files': files,
+        'charts': len(charts_written),
+        'bytes': written,
+        'seconds': elapsed,
+        'systems_per_sec': len(collected.rows) / elapsed if elapsed > 0 else 0.0,
+    }
+
+def _assessments(source: str) -> Tuple[Iterator[Dict], Optional[object]]:
+    """Assessments from a CSV/JSONL export, or else from a database, and what to close."""
+    try:
+        detect_format(source)
+    except ValueError:
+        repository = open_repository(source)
+        return repository.iter_all(), repository
+    return read_assessments(source), None
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='euai-report',
+        description="Render EU AI Act audit reports for stored assessments into a zip archive")
+    parser.add_argument('source',
+                        help="Assessment database (.db, .euailog) or CSV/JSONL export")
+    parser.add_argument('-o', '--output', default='reports.zip',
+                        help="Zip archive to write (default: %(default)s)")
+    parser.add_argument('--formats', default='html',
+                        help="Comma-separated report formats: html, pdf (default: %(default)s)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Rendering processes; 0 uses every CPU core (default: 1)")
+    parser.add_argument('--chunk-size', type=int, default=20,
+                        help="Systems rendered per worker task (default: %(default)s)")
+    parser.add_argument('--templates',
+                        help="Directory with system.html and/or portfolio.html templates")
+    parser.add_argument('--rules',
+                        help="JSON/YAML rule pack whose obligations to report "
+                             "(default: built-in rules)")
+    parser.add_argument('--no-portfolio', action='store_true',
+                        help="Only render per-system reports")
+    parser.add_argument('--progress', action='store_true',
+                        help="Report progress on stderr after every chunk")
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    formats = tuple(fmt.strip() for fmt in args.formats.split(',') if fmt.strip())
+    try:
+        rules = load_rule_pack(args.rules) if args.rules else None
+        templates = load_templates(args.templates)
+        ReportRenderer(formats, templates, rules)
+        if 'pdf' in formats:
+            require_pdf()
+    except (ImportError, OSError, ValueError) as e:
+        parser.error(str(e))
+
+    def progress(done: int):
+        sys.stderr.write(f"\r{done} systems")
+        sys.stderr.flush()
+
+    assessments, repository = _assessments(args.source)
+    try:
+        stats = write_reports(assessments, args.output, formats, workers=args.workers,
+                              chunk_size=args.chunk_size, templates=templates, rules=rules,
+                              portfolio=not args.no_portfolio,
+                              progress=progress if args.progress else None)
+    finally:
+        if repository is not None:
+            repository.close()
+    if args.progress:
+        sys.stderr.write('\n')
+    sys.stderr.write(f"Rendered {stats['systems']} systems into {stats['files']} reports "
+                     f"({stats['bytes'] / 1e6:.1f} MB) in {stats['seconds']:.2f}s "
+                     f"({stats['systems_per_sec']:,.0f} systems/sec)\n")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
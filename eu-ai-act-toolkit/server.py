@@ -0,0 +1,400 @@
+"""
+EU AI Act Toolkit - Headless HTTP API
+Classification endpoints served by one long-lived, preloaded classifier
+"""
+
+import argparse
+import json
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, Iterator, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from euai_core import RiskClassifier, instrumentation
+from jobs import JobQueue, QueueFull
+from cli import (EVIDENCE_FIELD, RESULT_FIELDS, add_cache_arguments, add_instrumentation_arguments,
+                 add_rules_arguments, build_result, cache_from_args, instrumentation_from_args,
+                 matcher_from_args, rule_pack_from_args)
+
+class LatencyStats:
+    """Request counts and latency percentiles per endpoint.
+
+    Keeps the most recent ``window`` latencies of each endpoint.
+    """
+
+    def __init__(self, window: int = 10000):
+        self.window = window
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, deque] = {}
+        self._counts: Dict[str, int] = {}
+        self._errors: Dict[str, int] = {}
+        self.started = time.time()
+
+    def record(self, endpoint: str, seconds: float, error: bool = False):
+        with self._lock:
+            if endpoint not in self._latencies:
+                self._latencies[endpoint] = deque(maxlen=self.window)
+                self._counts[endpoint] = 0
+                self._errors[endpoint] = 0
+            self._latencies[endpoint].append(seconds)
+            self._counts[endpoint] += 1
+            self._errors[endpoint] += error
+
+    @staticmethod
+    def _percentile(ordered: List[float], q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            samples = {endpoint: sorted(values) for endpoint, values in self._latencies.items()}
+            counts, errors = dict(self._counts), dict(self._errors)
+        endpoints = {}
+        for endpoint, ordered in samples.items():
+            endpoints[endpoint] = {
+                'requests': counts[endpoint],
+                'errors': errors[endpoint],
+                **{f'p{int(q * 100)}_ms': round(self._percentile(ordered, q) * 1000, 3)
+                   for q in (0.5, 0.9, 0.99)},
+                'max_ms': round(ordered[-1] * 1000, 3),
+            }
+        return {'uptime_seconds': round(time.time() - self.started, 1), 'endpoints': endpoints}
+
+class MicroBatcher:
+    """Coalesces concurrent single-record requests into ``classify_batch`` calls.
+
+    A background thread waits up to ``max_wait`` seconds after the first
+    queued record for up to ``max_batch`` records, then classifies them in
+    one call. This lets a process-pool classifier use every core even when
+    clients send one record per request.
+    """
+
+    def __init__(self, classifier, max_batch: int = 256, max_wait: float = 0.002):
+        self.classifier = classifier
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, record: Dict) -> Future:
+        future: Future = Future()
+        self._queue.put((record, future))
+        return future
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            try:
+                results = list(self.classifier.classify_batch(record for record, _ in batch))
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+def classification(record: Dict, result: Dict) -> Dict:
+    """API view of a classification: the result fields only."""
+    row = build_result(record, result)
+    return {field: row[field] for field in RESULT_FIELDS + [EVIDENCE_FIELD] if field in row}
+
+# Longest long-poll a client may request on GET /jobs/<id>
+MAX_JOB_WAIT = 30.0
+
+class ClassificationService:
+    """Endpoint logic, independent of the HTTP transport.
+
+    Batches submitted to ``/jobs`` run on ``jobs``, a background ``JobQueue``.
+    """
+
+    # Records classified between two progress updates of a batch job
+    JOB_PROGRESS_EVERY = 500
+
+    def __init__(self, classifier=None, batcher: Optional[MicroBatcher] = None,
+                 jobs: Optional[JobQueue] = None):
+        self.classifier = classifier or RiskClassifier()
+        self.jobs = jobs or JobQueue()
+        # Recommendations follow the classifier's rules when it can provide them
+        self.recommender = (self.classifier if hasattr(self.classifier, 'generate_recommendations')
+                            else RiskClassifier())
+        self.batcher = batcher
+        self.stats = LatencyStats()
+
+    def classify(self, record: Dict, explain: bool = False) -> Dict:
+        if explain:
+            result = next(iter(self.classifier.classify_batch([record], explain=True)))
+        elif self.batcher is not None:
+            result = self.batcher.submit(record).result()
+        else:
+            result = next(iter(self.classifier.classify_batch([record])))
+        return classification(record, result)
+
+    def _classifications(self, records: List[Dict], explain: bool = False) -> Iterator[Dict]:
+        results = (self.classifier.classify_batch(records, explain=True) if explain
+                   else self.classifier.classify_batch(records))
+        return (classification(record, result) for record, result in zip(records, results))
+
+    def classify_batch(self, records: List[Dict], explain: bool = False) -> List[Dict]:
+        return list(self._classifications(records, explain))
+
+    def _batch_job(self, job, records: List[Dict], explain: bool) -> List[Dict]:
+        results = []
+        for result in self._classifications(records, explain):
+            results.append(result)
+            if len(results) % self.JOB_PROGRESS_EVERY == 0:
+                job.update(len(results))
+        job.update(len(results))
+        return results
+
+    def submit_batch(self, records: List[Dict], explain: bool = False) -> Dict:
+        """Queue a batch job and return its state; raises ``QueueFull`` when saturated."""
+        if not isinstance(records, list):
+            raise TypeError("records must be a list")
+        job = self.jobs.submit(self._batch_job, records, explain,
+                               description=f"classify {len(records)} records", total=len(records))
+        return job.snapshot()
+
+    def job_status(self, job_id: str, since: Optional[int] = None,
+                   wait: float = 0) -> Optional[Dict]:
+        """State of a job, with ``results`` once done.
+
+        With ``since`` (a ``version`` from an earlier response), waits up to
+        ``wait`` seconds for the next change, so clients can long-poll.
+        """
+        job = self.jobs.get(job_id)
+        if job is None:
+            return None
+        if since is not None and wait > 0:
+            job.wait_change(since, min(wait, MAX_JOB_WAIT))
+        status = job.snapshot()
+        if status['status'] == 'done':
+            status['results'] = job.result
+        return status
+
+    def metrics(self) -> Dict:
+        metrics = self.stats.snapshot()
+        cache = getattr(self.classifier, 'cache', None)
+        if cache is not None:
+            metrics['cache'] = cache.stats()
+        metrics['jobs'] = self.jobs.stats()
+        version = getattr(self.classifier, 'version', None)
+        if version is not None:
+            error = self.classifier.last_error
+            metrics['rules'] = {'version': version, 'last_error': str(error) if error else None}
+        recorder = instrumentation.recorder
+        if recorder is not None:
+            metrics['instrumentation'] = recorder.snapshot()
+        return metrics
+
+    def recommendations(self, risk_level: str, rule_ids: Iterable = ()) -> Dict:
+        """Recommendations and obligation detail for a risk level and matched rule ids."""
+        obligations = self.recommender.obligations.obligations(risk_level, rule_ids)
+        return {'risk_level': risk_level,
+                'recommendations': [obligation.text for obligation in obligations],
+                'obligations': [obligation.to_dict() for obligation in obligations]}
+
+class APIRequestHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps client connections alive between requests
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are separate writes; without TCP_NODELAY each
+    # response on a kept-alive connection waits out a delayed ACK
+    disable_nagle_algorithm = True
+    server_version = 'EUAIToolkit/1.0'
+    service: ClassificationService = None
+
+    def log_message(self, format, *args):
+        # Per-request logging costs more than the classification itself
+        pass
+
+    def _send_json(self, status: int, payload, headers: Optional[Dict[str, str]] = None):
+        # Plain strings are sent as text (the Prometheus exposition format)
+        if isinstance(payload, str):
+            body, content_type = payload.encode('utf-8'), 'text/plain; version=0.0.4; charset=utf-8'
+        else:
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            content_type = 'application/json; charset=utf-8'
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(length) or b'null')
+
+    def _dispatch(self, method: str):
+        start = time.perf_counter()
+        url = urlparse(self.path)
+        endpoint = url.path.rstrip('/') or '/'
+        status, headers = 200, None
+        try:
+            status, payload = self._route(method, endpoint, url)
+        except QueueFull as e:
+            # Backpressure: the client should retry once jobs have drained
+            status, payload, headers = 503, {'error': str(e)}, {'Retry-After': '1'}
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            status, payload = 400, {'error': f"Invalid request: {e}"}
+        except Exception as e:
+            status, payload = 500, {'error': str(e)}
+        self._send_json(status, payload, headers)
+        if not endpoint.startswith('/metrics'):
+            # One latency series for all job ids
+            route = '/jobs/{id}' if endpoint.startswith('/jobs/') else endpoint
+            elapsed = time.perf_counter() - start
+            self.service.stats.record(f"{method} {route}", elapsed, error=status >= 400)
+            recorder = instrumentation.recorder
+            if recorder is not None:
+                recorder.record(f"{method} {route}", start, elapsed)
+
+    def _route(self, method: str, endpoint: str, url):
+        service = self.service
+        explain = parse_qs(url.query).get('explain', ['0'])[0].lower() in ('1', 'true', 'yes')
+        if method == 'POST' and endpoint == '/classify':
+            return 200, service.classify(self._read_json(), explain)
+        if method == 'POST' and endpoint == '/classify_batch':
+            body = self._read_json()
+            records = body['records'] if isinstance(body, dict) else body
+            return 200, {'results': service.classify_batch(records, explain)}
+        if method == 'POST' and endpoint == '/jobs':
+            body = self._read_json()
+            records = body['records'] if isinstance(body, dict) else body
+            return 202, service.submit_batch(records, explain)
+        if endpoint.startswith('/jobs/'):
+            job_id = endpoint[len('/jobs/'):]
+            if method == 'DELETE':
+                if not service.jobs.cancel(job_id):
+                    return 404, {'error': f"No pending job {job_id}"}
+                return 200, {'cancelled': True}
+            query = parse_qs(url.query)
+            since = int(query['since'][0]) if 'since' in query else None
+            status = service.job_status(job_id, since, float(query.get('wait', ['0'])[0]))
+            if status is None:
+                return 404, {'error': f"No job {job_id}"}
+            return 200, status
+        if endpoint == '/recommendations':
+            if method == 'POST':
+                body = self._read_json()
+                risk_level, rule_ids = body['risk_level'], body.get('matched_rules') or []
+                if not isinstance(rule_ids, list) or not all(isinstance(r, str)
+                                                             for r in rule_ids):
+                    raise ValueError("matched_rules must be a list of rule id strings")
+            else:
+                query = parse_qs(url.query)
+                risk_level = query['risk_level'][0]
+                rule_ids = [r for r in query.get('matched_rules', [''])[0].split(',') if r]
+            return 200, service.recommendations(risk_level, rule_ids)
+        if method == 'GET' and endpoint == '/metrics':
+            return 200, service.metrics()
+        if method == 'GET' and endpoint == '/metrics/prometheus':
+            recorder = instrumentation.recorder
+            if recorder is None:
+                return 404, {'error': "Instrumentation is off; start with --instrument"}
+            return 200, recorder.prometheus()
+        if method == 'GET' and endpoint == '/health':
+            return 200, {'status': 'ok'}
+        return 404, {'error': f"No endpoint {method} {endpoint}"}
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+
+def create_server(host: str = '127.0.0.1', port: int = 8000,
+                  service: Optional[ClassificationService] = None) -> ThreadingHTTPServer:
+    handler = type('BoundAPIRequestHandler', (APIRequestHandler,),
+                   {'service': service or ClassificationService()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='euai-api', description="Serve EU AI Act classification over HTTP")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Classifier processes; 0 uses every CPU core (default: 1)")
+    parser.add_argument('--batch-window-ms', type=float, default=0,
+                        help="Coalesce /classify requests arriving within this window "
+                             "into one batch (default: 0, disabled)")
+    parser.add_argument('--max-batch', type=int, default=256,
+                        help="Largest coalesced batch (default: 256)")
+    parser.add_argument('--job-workers', type=int, default=2,
+                        help="Background threads running /jobs batches (default: 2)")
+    parser.add_argument('--max-jobs', type=int, default=100,
+                        help="Queued or running jobs before /jobs answers 503 (default: 100)")
+    parser.add_argument('--reload-interval', type=float, default=2.0,
+                        help="Seconds between rule pack change checks; 0 disables hot reload "
+                             "(default: 2)")
+    add_rules_arguments(parser)
+    add_cache_arguments(parser)
+    add_instrumentation_arguments(parser)
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    instrumentation_from_args(args)
+    cache = cache_from_args(args)
+    if cache is not None and args.workers != 1:
+        parser.error("the result cache requires --workers 1")
+
+    try:
+        rule_pack = rule_pack_from_args(args, cache)
+        matcher = matcher_from_args(args, rule_pack)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    classifier = rule_pack or RiskClassifier(cache=cache, matcher=matcher)
+    if args.workers != 1:
+        from parallel import ParallelClassifier
+        # A process pool holds its own copy of the rules, so it is not hot-reloaded
+        classifier = ParallelClassifier(matcher=matcher, workers=args.workers or None,
+                                        chunk_size=64)
+    elif rule_pack is not None and args.reload_interval > 0:
+        rule_pack.watch(args.reload_interval)
+    batcher = None
+    if args.batch_window_ms > 0:
+        batcher = MicroBatcher(classifier, max_batch=args.max_batch,
+                               max_wait=args.batch_window_ms / 1000)
+
+    jobs = JobQueue(workers=args.job_workers, max_pending=args.max_jobs)
+    server = create_server(args.host, args.port, ClassificationService(classifier, batcher, jobs))
+    print(f"Serving EU AI Act classification on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        jobs.shutdown(cancel_pending=True)
+        if rule_pack is not None:
+            rule_pack.stop()
+        if hasattr(classifier, 'close'):
+            classifier.close()
+        if cache is not None:
+            cache.close()
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,4 +1,3 @@
-```python
 """
 Setup configuration for EU AI Act Toolkit
 """
@@ -20,6 +19,8 @@ setup(
     long_description_content_type="text/markdown",
     url="https://github.com/yourusername/eu-ai-act-toolkit",
     packages=find_packages(),
+    py_modules=["app", "assessment_log", "changes", "charts", "cli", "columnar", "jobs",
+                "parallel", "reclassify", "reports", "server", "storage", "streaming"],
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: Legal Industry",
@@ -36,17 +37,25 @@ setup(
     ],
     python_requires=">=3.8",
     install_requires=[
-        "streamlit>=1.31.0",
+        "streamlit>=1.37.0",
         "pandas>=2.1.4",
         "plotly>=5.18.0",
+        "numpy>=1.24",
     ],
+    extras_require={
+        "yaml": ["PyYAML>=6.0"],
+        "pdf": ["fpdf2>=2.7"],
+    },
     entry_points={
         'console_scripts': [
             'euai-toolkit=app:main',
+            'euai-classify=cli:main',
+            'euai-api=server:main',
+            'euai-reclassify=reclassify:main',
+            'euai-report=reports:main',
         ],
     },
     include_package_data=True,
     zip_safe=False,
 )
-```
 
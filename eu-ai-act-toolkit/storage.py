@@ -0,0 +1,508 @@
+"""
+EU AI Act Toolkit - Assessment persistence
+Repository interface for assessments with an indexed SQLite backend
+"""
+
+import json
+import sqlite3
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Columns derived from the classification, rewritten by ``update_results``
+RESULT_COLUMNS = ('risk_level', 'risk_score', 'compliance_score', 'matched_rules',
+                  'recommendations', 'can_deploy', 'fine_amount', 'evidence')
+
+# Columns holding lists, stored as JSON text
+JSON_COLUMNS = ('data_types', 'matched_rules', 'recommendations', 'evidence')
+
+COLUMNS = ['id', 'system_name', 'use_case', 'context', 'data_types', 'sector',
+           'risk_level', 'risk_score', 'compliance_score', 'matched_rules',
+           'recommendations', 'can_deploy', 'fine_amount', 'date', 'evidence']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS assessments (
+    id INTEGER PRIMARY KEY,
+    system_name TEXT NOT NULL,
+    use_case TEXT,
+    context TEXT,
+    data_types TEXT,
+    sector TEXT,
+    risk_level TEXT NOT NULL,
+    risk_score INTEGER NOT NULL,
+    compliance_score INTEGER,
+    matched_rules TEXT,
+    recommendations TEXT,
+    can_deploy INTEGER,
+    fine_amount TEXT,
+    date TEXT NOT NULL,
+    evidence TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_assessments_date ON assessments (date, id);
+CREATE INDEX IF NOT EXISTS idx_assessments_risk_level ON assessments (risk_level, date);
+CREATE INDEX IF NOT EXISTS idx_assessments_sector ON assessments (sector, date);
+CREATE TABLE IF NOT EXISTS assessment_stats (
+    dimension TEXT NOT NULL,
+    key TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    risk_score_sum INTEGER NOT NULL,
+    compliance_score_sum INTEGER NOT NULL,
+    PRIMARY KEY (dimension, key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS assessment_meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+) WITHOUT ROWID;
+INSERT OR IGNORE INTO assessment_meta VALUES ('data_version', 0);
+"""
+
+# Bumped whenever the triggers change; older databases get them recreated
+SCHEMA_VERSION = 2
+
+# Aggregate dimensions and the key each one groups rows by
+STAT_DIMENSIONS = {
+    'total': "''",
+    'risk_level': "{row}.risk_level",
+    'sector': "COALESCE({row}.sector, '')",
+    'date': "{row}.date",
+    'risk_level_sector': "{row}.risk_level || char(31) || COALESCE({row}.sector, '')",
+}
+
+def _stats_delta(row: str, sign: int) -> str:
+    """SQL adding (sign=1) or removing (sign=-1) one row from every aggregate."""
+    neg = '-' if sign < 0 else ''
+    values = ',\n        '.join(
+        f"('{dimension}', {key.format(row=row)}, {sign}, {neg}{row}.risk_score, "
+        f"{neg}COALESCE({row}.compliance_score, 0))"
+        for dimension, key in STAT_DIMENSIONS.items())
+    return f"""
+    INSERT INTO assessment_stats (dimension, key, count, risk_score_sum, compliance_score_sum)
+    VALUES {values}
+    ON CONFLICT (dimension, key) DO UPDATE SET
+        count = count + excluded.count,
+        risk_score_sum = risk_score_sum + excluded.risk_score_sum,
+        compliance_score_sum = compliance_score_sum + excluded.compliance_score_sum;"""
+
+def _stats_prune(row: str) -> str:
+    """SQL dropping the now-empty buckets a removed row belonged to."""
+    keys = ', '.join(f"('{dimension}', {key.format(row=row)})"
+                     for dimension, key in STAT_DIMENSIONS.items() if dimension != 'total')
+    return f"""
+    DELETE FROM assessment_stats WHERE count = 0 AND (dimension, key) IN (VALUES {keys});"""
+
+_BUMP_VERSION = """
+    UPDATE assessment_meta SET value = value + 1 WHERE key = 'data_version';"""
+
+# Keep assessment_stats and the data version up to date with O(1) work per written row
+STATS_TRIGGERS = f"""
+DROP TRIGGER IF EXISTS trg_assessments_stats_insert;
+DROP TRIGGER IF EXISTS trg_assessments_stats_delete;
+DROP TRIGGER IF EXISTS trg_assessments_stats_update;
+DROP TRIGGER IF EXISTS trg_assessments_version_update;
+CREATE TRIGGER trg_assessments_stats_insert AFTER INSERT ON assessments BEGIN
+{_stats_delta('NEW', 1)}
+{_BUMP_VERSION}
+END;
+CREATE TRIGGER trg_assessments_stats_delete AFTER DELETE ON assessments BEGIN
+{_stats_delta('OLD', -1)}
+{_stats_prune('OLD')}
+{_BUMP_VERSION}
+END;
+CREATE TRIGGER trg_assessments_stats_update
+AFTER UPDATE OF risk_level, sector, date, risk_score, compliance_score ON assessments BEGIN
+{_stats_delta('OLD', -1)}
+{_stats_delta('NEW', 1)}
+{_stats_prune('OLD')}
+END;
+CREATE TRIGGER trg_assessments_version_update AFTER UPDATE ON assessments BEGIN
+{_BUMP_VERSION}
+END;
+"""
+
+class AssessmentRepository:
+    """Storage interface used by the UI for assessments.
+
+    Listings are ordered newest first (by ``date``, then ``id``).
+    """
+
+    def add(self, assessment: Dict) -> Dict:
+        """Store an assessment, assigning its ``id`` when missing."""
+        raise NotImplementedError
+
+    def add_many(self, assessments: Iterable[Dict]) -> int:
+        raise NotImplementedError
+
+    def seed(self, assessments: Iterable[Dict]) -> int:
+        """Add ``assessments`` only if the repository is empty, as one write.
+
+        Processes opening the same store concurrently seed it at most once.
+        Returns the number of assessments added.
+        """
+        raise NotImplementedError
+
+    def get(self, assessment_id: int) -> Optional[Dict]:
+        raise NotImplementedError
+
+    def delete(self, assessment_id: int) -> bool:
+        raise NotImplementedError
+
+    def update_scores(self, scores: Iterable[Tuple[int, str, int, int]]) -> int:
+        """Apply ``(id, risk_level, risk_score, compliance_score)`` re-scores in bulk."""
+        raise NotImplementedError
+
+    def update_results(self, results: Iterable[Dict]) -> int:
+        """Overwrite the ``RESULT_COLUMNS`` of assessments in bulk.
+
+        Each result carries the ``id`` and every result column; ``evidence``
+        may be left out to keep the stored evidence.
+        """
+        raise NotImplementedError
+
+    def ids(self) -> List[int]:
+        """Ids of every stored assessment."""
+        return [assessment['id'] for assessment in self.iter_all()]
+
+    def count(self, risk_level: Optional[str] = None, sector: Optional[str] = None,
+              date_from: Optional[str] = None, date_to: Optional[str] = None) -> int:
+        """Count assessments, optionally matching the same filters as ``list``."""
+        raise NotImplementedError
+
+    def count_by_level(self) -> Dict[str, int]:
+        raise NotImplementedError
+
+    def average_risk_score(self) -> float:
+        raise NotImplementedError
+
+    def summary(self) -> Dict:
+        """Return the dashboard aggregates without scanning assessments.
+
+        Keys: ``total``, ``mean_risk_score``, ``mean_compliance_score`` and
+        per-bucket counts in ``by_risk_level``, ``by_sector`` and ``by_date``.
+        """
+        raise NotImplementedError
+
+    def data_version(self) -> int:
+        """Return a counter that changes whenever any assessment is written."""
+        raise NotImplementedError
+
+    def recent(self, limit: int = 3) -> List[Dict]:
+        return self.list(limit=limit)
+
+    def list(self, risk_level: Optional[str] = None, sector: Optional[str] = None,
+             date_from: Optional[str] = None, date_to: Optional[str] = None,
+             limit: Optional[int] = None, offset: int = 0,
+             before: Optional[Tuple[str, int]] = None) -> List[Dict]:
+        """List matching assessments, newest first.
+
+        ``before`` is a ``(date, id)`` keyset cursor, normally the key of the
+        last row of the previous page; it is cheaper than a large ``offset``.
+        """
+        raise NotImplementedError
+
+    def scores_by_date(self) -> List[Tuple[str, int]]:
+        """Return ``(date, risk_score)`` pairs in ascending date order."""
+        raise NotImplementedError
+
+    def timeline(self, bucket: str = 'day') -> List[Tuple[str, int, int, float, int]]:
+        """Return ``(period_start, count, min, mean, max)`` risk scores per bucket.
+
+        ``bucket`` is ``'day'`` or ``'week'`` (weeks start on Monday).
+        """
+        raise NotImplementedError
+
+    def iter_all(self) -> Iterator[Dict]:
+        """Stream every assessment, oldest first."""
+        raise NotImplementedError
+
+    def to_columns(self, fields: Optional[Sequence[str]] = None):
+        """Load ``fields`` (default: all) of every assessment, oldest first, as
+        compact ``columnar.AssessmentColumns``."""
+        from columnar import FIELDS, AssessmentColumns
+        return AssessmentColumns.from_records(self.iter_all(), fields or FIELDS)
+
+def open_repository(path: str) -> AssessmentRepository:
+    """Open the repository stored at ``path``: an append-only ``assessment_log``
+    for ``.euailog`` files, SQLite otherwise."""
+    from assessment_log import LOG_SUFFIX, LogRepository
+    if path.endswith(LOG_SUFFIX):
+        return LogRepository(path)
+    return SQLiteRepository(path)
+
+class SQLiteRepository(AssessmentRepository):
+    """SQLite-backed repository in WAL mode.
+
+    ``date``, ``risk_level`` and ``sector`` are indexed, so recent items,
+    per-level counts and filtered history are index-backed queries. One
+    connection is shared across threads and serialized with a lock.
+    """
+
+    def __init__(self, path: str = 'assessments.db'):
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(assessments)")}
+            if 'evidence' not in columns:
+                # Databases created before match evidence was stored
+                self._conn.execute("ALTER TABLE assessments ADD COLUMN evidence TEXT")
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < SCHEMA_VERSION:
+                self._conn.executescript(STATS_TRIGGERS)
+                self.rebuild_stats()
+                self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def rebuild_stats(self):
+        """Recompute the aggregate store from scratch with one scan per dimension."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM assessment_stats")
+            for dimension, key in STAT_DIMENSIONS.items():
+                key = key.format(row='assessments')
+                group_by = f" GROUP BY {key}" if dimension != 'total' else ''
+                self._conn.execute(
+                    f"INSERT INTO assessment_stats "
+                    f"SELECT '{dimension}', {key}, COUNT(*), COALESCE(SUM(risk_score), 0), "
+                    f"COALESCE(SUM(compliance_score), 0) FROM assessments{group_by}")
+
+    def _stat(self, dimension: str, key: str) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT count FROM assessment_stats WHERE dimension = ? AND key = ?",
+                (dimension, key)).fetchone()
+        return row[0] if row else 0
+
+    def _stats(self, dimension: str) -> Dict[str, Tuple[int, int, int]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, count, risk_score_sum, compliance_score_sum "
+                "FROM assessment_stats WHERE dimension = ?", (dimension,)).fetchall()
+        return {row[0]: tuple(row[1:]) for row in rows}
+
+    @staticmethod
+    def _to_row(assessment: Dict) -> Tuple:
+        values = []
+        for column in COLUMNS:
+            value = assessment.get(column)
+            if column in JSON_COLUMNS and value is not None:
+                value = json.dumps(value, ensure_ascii=False)
+            elif column == 'can_deploy' and value is not None:
+                value = int(value)
+            values.append(value)
+        return tuple(values)
+
+    @staticmethod
+    def _from_row(row: sqlite3.Row) -> Dict:
+        assessment = {}
+        for column in row.keys():
+            value = row[column]
+            if value is None:
+                # Fields the assessment never had are left out
+                continue
+            if column in JSON_COLUMNS:
+                value = json.loads(value)
+            elif column == 'can_deploy':
+                value = bool(value)
+            assessment[column] = value
+        return assessment
+
+    def _insert(self, assessment: Dict) -> Dict:
+        cursor = self._conn.execute(
+            f"INSERT INTO assessments ({', '.join(COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(COLUMNS))})",
+            self._to_row(assessment))
+        if assessment.get('id') is None:
+            assessment = dict(assessment, id=cursor.lastrowid)
+        return assessment
+
+    def add(self, assessment: Dict) -> Dict:
+        with self._lock, self._conn:
+            return self._insert(assessment)
+
+    def add_many(self, assessments: Iterable[Dict]) -> int:
+        with self._lock, self._conn:
+            cursor = self._conn.executemany(
+                f"INSERT INTO assessments ({', '.join(COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(COLUMNS))})",
+                (self._to_row(assessment) for assessment in assessments))
+        return cursor.rowcount
+
+    def seed(self, assessments: Iterable[Dict]) -> int:
+        with self._lock, self._conn:
+            # Take the write lock before checking, so concurrent seeders serialize
+            self._conn.execute("BEGIN IMMEDIATE")
+            if self._conn.execute("SELECT 1 FROM assessments LIMIT 1").fetchone():
+                return 0
+            cursor = self._conn.executemany(
+                f"INSERT INTO assessments ({', '.join(COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(COLUMNS))})",
+                (self._to_row(assessment) for assessment in assessments))
+        return cursor.rowcount
+
+    def get(self, assessment_id: int) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM assessments WHERE id = ?",
+                                     (assessment_id,)).fetchone()
+        return self._from_row(row) if row else None
+
+    def delete(self, assessment_id: int) -> bool:
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM assessments WHERE id = ?", (assessment_id,))
+        return cursor.rowcount > 0
+
+    def update_scores(self, scores: Iterable[Tuple[int, str, int, int]]) -> int:
+        # One transaction; the triggers keep the aggregates in step row by row
+        with self._lock, self._conn:
+            cursor = self._conn.executemany(
+                "UPDATE assessments SET risk_level = ?, risk_score = ?, compliance_score = ? "
+                "WHERE id = ?",
+                ((level, risk, compliance, assessment_id)
+                 for assessment_id, level, risk, compliance in scores))
+        return cursor.rowcount
+
+    def update_results(self, results: Iterable[Dict]) -> int:
+        assignments = ', '.join("evidence = COALESCE(?, evidence)" if column == 'evidence'
+                                else f"{column} = ?" for column in RESULT_COLUMNS)
+
+        def values(result: Dict) -> Tuple:
+            row = dict(zip(COLUMNS, self._to_row(result)))
+            return (*(row[column] for column in RESULT_COLUMNS), result['id'])
+
+        with self._lock, self._conn:
+            cursor = self._conn.executemany(
+                f"UPDATE assessments SET {assignments} WHERE id = ?", map(values, results))
+        return cursor.rowcount
+
+    def ids(self) -> List[int]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT id FROM assessments")]
+
+    def count(self, risk_level: Optional[str] = None, sector: Optional[str] = None,
+              date_from: Optional[str] = None, date_to: Optional[str] = None) -> int:
+        if date_from is None and date_to is None:
+            # Served from the aggregate store
+            if risk_level is not None and sector is not None:
+                return self._stat('risk_level_sector', f"{risk_level}\x1f{sector}")
+            if risk_level is not None:
+                return self._stat('risk_level', risk_level)
+            if sector is not None:
+                return self._stat('sector', sector)
+            return self._stat('total', '')
+
+        where, params = self._filter(risk_level, sector, date_from, date_to)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM assessments{where}",
+                                      params).fetchone()[0]
+
+    def count_by_level(self) -> Dict[str, int]:
+        return {level: stats[0] for level, stats in self._stats('risk_level').items()}
+
+    def average_risk_score(self) -> float:
+        return self.summary()['mean_risk_score']
+
+    def data_version(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT value FROM assessment_meta WHERE key = 'data_version'").fetchone()[0]
+
+    def summary(self) -> Dict:
+        count, risk_score_sum, compliance_score_sum = self._stats('total').get('', (0, 0, 0))
+        return {
+            'total': count,
+            'mean_risk_score': risk_score_sum / count if count else 0.0,
+            'mean_compliance_score': compliance_score_sum / count if count else 0.0,
+            'by_risk_level': {k: v[0] for k, v in self._stats('risk_level').items()},
+            'by_sector': {k: v[0] for k, v in self._stats('sector').items()},
+            'by_date': {k: v[0] for k, v in sorted(self._stats('date').items())},
+        }
+
+    @staticmethod
+    def _filter(risk_level: Optional[str] = None, sector: Optional[str] = None,
+                date_from: Optional[str] = None, date_to: Optional[str] = None,
+                before: Optional[Tuple[str, int]] = None) -> Tuple[str, List]:
+        clauses, params = [], []
+        if risk_level is not None:
+            clauses.append("risk_level = ?")
+            params.append(risk_level)
+        if sector is not None:
+            clauses.append("sector = ?")
+            params.append(sector)
+        if date_from is not None:
+            clauses.append("date >= ?")
+            params.append(date_from)
+        if date_to is not None:
+            clauses.append("date <= ?")
+            params.append(date_to)
+        if before is not None:
+            clauses.append("(date, id) < (?, ?)")
+            params.extend(before)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def list(self, risk_level: Optional[str] = None, sector: Optional[str] = None,
+             date_from: Optional[str] = None, date_to: Optional[str] = None,
+             limit: Optional[int] = None, offset: int = 0,
+             before: Optional[Tuple[str, int]] = None) -> List[Dict]:
+        where, params = self._filter(risk_level, sector, date_from, date_to, before)
+        query = f"SELECT * FROM assessments{where} ORDER BY date DESC, id DESC LIMIT ? OFFSET ?"
+        params += [limit if limit is not None else -1, offset]
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def scores_by_date(self) -> List[Tuple[str, int]]:
+        with self._lock:
+            return [tuple(row) for row in self._conn.execute(
+                "SELECT date, risk_score FROM assessments ORDER BY date, id")]
+
+    def timeline(self, bucket: str = 'day') -> List[Tuple[str, int, int, float, int]]:
+        periods = {'day': "date", 'week': "date(date, '-6 days', 'weekday 1')"}
+        period = periods[bucket]
+        with self._lock:
+            return [tuple(row) for row in self._conn.execute(
+                f"SELECT {period} AS period, COUNT(*), MIN(risk_score), AVG(risk_score), "
+                f"MAX(risk_score) FROM assessments GROUP BY period ORDER BY period")]
+
+    def to_columns(self, fields: Optional[Sequence[str]] = None, batch_size: int = 10000):
+        # Raw values, so list columns are decoded once per distinct JSON text
+        from columnar import FIELDS, AssessmentColumns
+        fields = list(fields or FIELDS)
+        unknown = set(fields) - set(COLUMNS)
+        if unknown:
+            raise KeyError(f"Unknown assessment fields {sorted(unknown)}")
+        return AssessmentColumns.from_rows(self._iter_values(fields, batch_size), fields)
+
+    def _iter_values(self, fields: List[str], batch_size: int) -> Iterator[Tuple]:
+        """Value tuples of ``fields`` (then date and id), oldest first, in keyset batches."""
+        last_key = ('', -1)
+        query = (f"SELECT {', '.join(fields)}, date, id FROM assessments "
+                 f"WHERE (date, id) > (?, ?) ORDER BY date, id LIMIT ?")
+        while True:
+            with self._lock:
+                # Plain tuples are cheaper than sqlite3.Row
+                cursor = self._conn.cursor()
+                cursor.row_factory = None
+                rows = cursor.execute(query, (*last_key, batch_size)).fetchall()
+            if not rows:
+                return
+            yield from rows
+            last_key = rows[-1][-2:]
+
+    def iter_all(self, batch_size: int = 1000) -> Iterator[Dict]:
+        # Keyset pagination, so no cursor stays open between batches
+        last_key = ('', -1)
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT * FROM assessments WHERE (date, id) > (?, ?) "
+                    "ORDER BY date, id LIMIT ?", (*last_key, batch_size)).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield self._from_row(row)
+            last_key = (rows[-1]['date'], rows[-1]['id'])
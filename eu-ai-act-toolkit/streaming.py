@@ -0,0 +1,181 @@
+"""
+EU AI Act Toolkit - Streaming import and export
+Chunked CSV/JSONL (optionally gzip) readers and writers with constant memory
+"""
+
+import csv
+import gzip
+import io
+import json
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Union
+
+# Field order of exported assessments (see docs/api_reference.md)
+ASSESSMENT_FIELDS = ['id', 'system_name', 'use_case', 'context', 'data_types', 'sector',
+                     'risk_level', 'risk_score', 'compliance_score', 'matched_rules',
+                     'recommendations', 'can_deploy', 'fine_amount', 'date', 'evidence']
+
+# List fields are ';'-separated strings in batch CSVs and JSON arrays in
+# assessment exports, so values containing ';' survive a round trip
+LIST_FIELDS = ('data_types', 'matched_rules', 'recommendations', 'obligations')
+# Fields whose CSV cells always hold JSON
+JSON_FIELDS = ('evidence',)
+INT_FIELDS = ('id', 'risk_score', 'compliance_score')
+BOOL_FIELDS = ('can_deploy',)
+
+def open_text(path: str, mode: str = 'r') -> TextIO:
+    """Open a text file for reading or writing, transparently gzip'd for ``.gz``."""
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8', newline='')
+    return open(path, mode, encoding='utf-8', newline='')
+
+def detect_format(path: str, fmt: Optional[str] = None) -> str:
+    if fmt:
+        return fmt
+    if path.endswith('.gz'):
+        path = path[:-3]
+    if path.endswith('.csv'):
+        return 'csv'
+    if path.endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    raise ValueError(f"Cannot detect CSV/JSONL format of '{path}'")
+
+def flatten_row(row: Dict) -> Dict:
+    row = dict(row)
+    for key in LIST_FIELDS:
+        if isinstance(row.get(key), (list, tuple)):
+            row[key] = ';'.join(row[key])
+    return row
+
+def encode_row(row: Dict) -> Dict:
+    """``row`` with list and JSON fields encoded as JSON text for a CSV cell."""
+    row = dict(row)
+    for key in (*LIST_FIELDS, *JSON_FIELDS):
+        if row.get(key) is not None and not isinstance(row[key], str):
+            row[key] = json.dumps(row[key], ensure_ascii=False)
+    return row
+
+class RecordWriter:
+    """Writes rows as CSV or JSONL, one chunk at a time.
+
+    CSV columns default to the keys of the first row written. List cells are
+    ';'-joined, or JSON-encoded with ``json_cells``.
+    """
+
+    def __init__(self, stream: TextIO, fmt: str, fieldnames: Optional[List[str]] = None,
+                 json_cells: bool = False):
+        self.stream = stream
+        self.fmt = fmt
+        self.fieldnames = fieldnames
+        self._encode = encode_row if json_cells else flatten_row
+        self._csv_writer = None
+
+    def write_chunk(self, rows: List[Dict]):
+        if not rows:
+            return
+        if self.fmt == 'jsonl':
+            self.stream.writelines(json.dumps(row, ensure_ascii=False) + '\n' for row in rows)
+        else:
+            if self._csv_writer is None:
+                self._csv_writer = csv.DictWriter(self.stream,
+                                                  fieldnames=self.fieldnames or list(rows[0]),
+                                                  extrasaction='ignore')
+                self._csv_writer.writeheader()
+            self._csv_writer.writerows(self._encode(row) for row in rows)
+        self.stream.flush()
+
+def iter_chunks(iterable: Iterable, size: int) -> Iterator[List]:
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def iter_export(assessments: Iterable[Dict], fmt: str = 'csv', chunk_size: int = 1000,
+                fieldnames: Optional[List[str]] = None) -> Iterator[str]:
+    """Yield the export as text chunks of ``chunk_size`` rows.
+
+    Suitable for streaming responses: only one chunk is held in memory.
+    """
+    buffer = io.StringIO()
+    writer = RecordWriter(buffer, fmt, fieldnames or ASSESSMENT_FIELDS, json_cells=True)
+    for chunk in iter_chunks(assessments, chunk_size):
+        writer.write_chunk(chunk)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if fmt == 'csv' and writer._csv_writer is None:
+        # Empty exports still carry the CSV header
+        yield ','.join(fieldnames or ASSESSMENT_FIELDS) + '\r\n'
+
+def export_assessments(assessments: Iterable[Dict], target: Union[str, TextIO],
+                       fmt: Optional[str] = None, chunk_size: int = 1000) -> int:
+    """Write assessments to a path (gzip'd for ``.gz``) or text stream.
+
+    Returns the number of assessments written.
+    """
+    if isinstance(target, str):
+        fmt = detect_format(target, fmt)
+        with open_text(target, 'w') as stream:
+            return export_assessments(assessments, stream, fmt, chunk_size)
+
+    count = 0
+    writer = RecordWriter(target, fmt or 'csv', ASSESSMENT_FIELDS, json_cells=True)
+    for chunk in iter_chunks(assessments, chunk_size):
+        writer.write_chunk(chunk)
+        count += len(chunk)
+    if count == 0 and (fmt or 'csv') == 'csv':
+        csv.writer(target).writerow(ASSESSMENT_FIELDS)
+    return count
+
+def read_records(stream: TextIO, fmt: str) -> Iterator[Dict]:
+    """Stream raw records from CSV or JSONL, one at a time."""
+    if fmt == 'csv':
+        yield from csv.DictReader(stream)
+    else:
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+
+def _decode_list(value: str) -> List[str]:
+    """A list cell: a JSON array, or ';'-separated text as in older exports."""
+    if value.startswith('['):
+        try:
+            decoded = json.loads(value)
+        except ValueError:
+            decoded = None
+        if isinstance(decoded, list):
+            return decoded
+    return value.split(';')
+
+def _restore_types(record: Dict) -> Dict:
+    """Convert CSV string values back to the assessment field types.
+
+    Empty cells are fields the assessment did not have and are dropped.
+    """
+    record = {key: value for key, value in record.items() if value != ''}
+    for key in LIST_FIELDS:
+        if isinstance(record.get(key), str):
+            record[key] = _decode_list(record[key])
+    for key in JSON_FIELDS:
+        if isinstance(record.get(key), str):
+            record[key] = json.loads(record[key])
+    for key in INT_FIELDS:
+        if isinstance(record.get(key), str):
+            record[key] = int(record[key])
+    for key in BOOL_FIELDS:
+        if isinstance(record.get(key), str):
+            record[key] = record[key] == 'True'
+    return record
+
+def read_assessments(source: Union[str, TextIO], fmt: Optional[str] = None) -> Iterator[Dict]:
+    """Stream assessments back from a CSV/JSONL export (path or text stream)."""
+    if isinstance(source, str):
+        fmt = detect_format(source, fmt)
+        with open_text(source) as stream:
+            yield from read_assessments(stream, fmt)
+        return
+
+    for record in read_records(source, fmt or 'csv'):
+        yield _restore_types(record) if fmt != 'jsonl' else record
@@ -1,5 +1,3 @@
-
-```python
 """
 Basic tests for EU AI Act Toolkit
 """
@@ -41,9 +39,57 @@ def test_recommendations():
         assert isinstance(recs, list)
         assert len(recs) > 0
 
+def test_keyword_matcher_modes_agree():
+    """Test that the regex and substring matchers find the same rules"""
+    from app import KeywordMatcher, EU_AI_ACT_RULES
+    
+    scan = KeywordMatcher(EU_AI_ACT_RULES, use_regex=False)
+    regex = KeywordMatcher(EU_AI_ACT_RULES, use_regex=True)
+    
+    texts = [
+        "social credit scoring of citizens",
+        "hiring employees with facial recognition and iris scans",
+        "chatbot for deepfake detection",
+        "weather forecasting",
+        "",
+    ]
+    for text in texts:
+        assert scan.match(text) == regex.match(text)
+    
+    # Overlapping keywords are all reported
+    matches = regex.match("social credit scoring")
+    assert matches['prohibited_practices'] == [2]
+    assert matches['high_risk_systems'] == [3]
+
+def test_risk_classifier_tiers():
+    """Test tiered classification output"""
+    from app import RiskClassifier
+    
+    classifier = RiskClassifier()
+    
+    assert classifier.classify("Subliminal ads", "", [])['risk_level'] == 'unacceptable'
+    assert classifier.classify("Chatbot", "", [])['risk_level'] == 'limited'
+    assert classifier.classify("Weather forecast", "", [])['risk_level'] == 'minimal'
+    
+    result = classifier.classify("CV screening with biometric checks", "", [])
+    assert result['risk_level'] == 'high'
+    assert [r['id'] for r in result['matched_rules']] == ['HR1', 'HR3']
+    assert result['risk_score'] == 80
+
+def test_evidence_snippet_highlights_the_match():
+    """Test the highlight lands on the keyword when lowercasing changes lengths"""
+    from app import RiskClassifier, evidence_snippet
+    
+    assessment = {"use_case": "İİ social scoring", "context": "", "data_types": []}
+    result = RiskClassifier().classify(assessment["use_case"], "", [], explain=True)
+    snippet = evidence_snippet(assessment, result['evidence'][0])
+    assert "<mark>social scoring</mark>" in snippet
+
 if __name__ == "__main__":
     test_imports()
     test_risk_classifier()
     test_recommendations()
+    test_keyword_matcher_modes_agree()
+    test_risk_classifier_tiers()
+    test_evidence_snippet_highlights_the_match()
     print("✅ All tests passed!")
-```
\ No newline at end of file
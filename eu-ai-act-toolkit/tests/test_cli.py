@@ -0,0 +1,111 @@
+"""
+Tests for headless batch classification
+"""
+
+import io
+import json
+
+def test_classify_batch():
+    """Test batch classification keeps input order"""
+    from app import RiskClassifier
+    
+    classifier = RiskClassifier()
+    records = [
+        {"use_case": "Automated hiring", "context": "HR", "data_types": ["Personal data"]},
+        {"use_case": "Customer chatbot", "context": "Website", "data_types": "Text data"},
+        {"use_case": "Weather forecast", "context": "", "data_types": ""},
+    ]
+    
+    results = list(classifier.classify_batch(records))
+    assert [r['risk_level'] for r in results] == ['high', 'limited', 'minimal']
+
+def test_run_batch_jsonl():
+    """Test streaming JSONL classification"""
+    from cli import ResultWriter, read_records, run_batch
+    
+    source = io.StringIO(
+        '{"system_name": "A", "use_case": "CV screening", "context": "HR", "data_types": ["Personal data"]}\n'
+        '\n'
+        '{"system_name": "B", "use_case": "Chatbot", "context": "Support", "data_types": []}\n'
+    )
+    target = io.StringIO()
+    
+    stats = run_batch(read_records(source, 'jsonl'), ResultWriter(target, 'jsonl'), chunk_size=1)
+    rows = [json.loads(line) for line in target.getvalue().splitlines()]
+    
+    assert stats['records'] == 2
+    assert [r['system_name'] for r in rows] == ['A', 'B']
+    assert rows[0]['matched_rules'] == ['HR3']
+    assert rows[0]['compliance_score'] == 55
+
+def test_cli_csv(tmp_path):
+    """Test the CLI end to end on a CSV inventory"""
+    from cli import main
+    
+    source = tmp_path / "inventory.csv"
+    source.write_text("system_name,use_case,context,data_types\n"
+                      "Proctor,Exam proctoring,University,Biometric data;Personal data\n",
+                      encoding='utf-8')
+    target = tmp_path / "results.csv"
+    
+    assert main([str(source), "-o", str(target)]) == 0
+    
+    lines = target.read_text(encoding='utf-8').splitlines()
+    assert lines[0] == ("system_name,use_case,context,data_types,risk_level,risk_score,"
+                        "compliance_score,matched_rules,can_deploy,fine_amount")
+    assert ",high,80,60,HR1;HR2,True," in lines[1]
+    
+    assert main([str(source), "-o", str(target), "--obligations"]) == 0
+    lines = target.read_text(encoding='utf-8').splitlines()
+    assert lines[0].endswith(",fine_amount,obligations")
+    assert lines[1].endswith(";high.conformity_assessment;HR1.classification;HR2.classification")
+
+def test_reclassify_cli(tmp_path):
+    """Test euai-reclassify indexes once, applies a rule pack and writes a change report"""
+    import copy
+    from euai_core import EU_AI_ACT_RULES
+    from reclassify import main
+    from storage import SQLiteRepository
+    
+    database = str(tmp_path / "assessments.db")
+    repository = SQLiteRepository(database)
+    repository.add_many([
+        {"system_name": "Bot", "use_case": "Customer chatbot", "risk_level": "limited",
+         "risk_score": 35, "compliance_score": 85, "matched_rules": ["LR1"],
+         "can_deploy": True, "fine_amount": "€15M or 3% global turnover", "date": "2025-02-01"},
+        {"system_name": "Hiring", "use_case": "CV screening", "risk_level": "high",
+         "risk_score": 70, "compliance_score": 50, "matched_rules": ["HR3"],
+         "can_deploy": True, "fine_amount": "€15M or 3% global turnover", "date": "2025-02-02"},
+    ])
+    repository.close()
+    rules = copy.deepcopy(EU_AI_ACT_RULES)
+    rules["limited_risk_systems"][0]["keywords"].remove("chatbot")
+    pack = tmp_path / "rules.json"
+    pack.write_text(json.dumps(rules), encoding='utf-8')
+    report = tmp_path / "changes.csv"
+    
+    assert main([database, "--rules", str(pack), "--report", str(report)]) == 0
+    lines = report.read_text(encoding='utf-8').splitlines()
+    assert lines[1].startswith("1,Bot,limited,minimal,35,15,LR1,")
+    assert SQLiteRepository(database).get(1)["risk_level"] == "minimal"
+    
+    summary = tmp_path / "summary.json"
+    assert main([database, "--rules", str(pack), "--report", str(summary)]) == 0
+    assert json.loads(summary.read_text(encoding='utf-8'))["evaluated"] == 0
+
+def test_cli_dedup(tmp_path):
+    """Test --dedup adds group ids and writes the group report"""
+    from cli import main
+    
+    source = tmp_path / "inventory.jsonl"
+    source.write_text("".join(json.dumps({"system_name": name, "use_case": "CV screening tool",
+                                          "context": "HR"}) + "\n" for name in "ABC"),
+                      encoding='utf-8')
+    target = tmp_path / "results.jsonl"
+    report = tmp_path / "groups.csv"
+    
+    assert main([str(source), "-o", str(target), "--dedup", "near",
+                 "--dedup-report", str(report)]) == 0
+    rows = [json.loads(line) for line in target.read_text(encoding='utf-8').splitlines()]
+    assert [row["duplicate_group"] for row in rows] == [0, 0, 0]
+    assert report.read_text(encoding='utf-8').splitlines()[1].startswith("0,3,2,0,1.0,0,high,")
@@ -0,0 +1,63 @@
+"""
+Tests for the columnar assessment store
+"""
+
+def make_assessments():
+    recommendations = ["Transparency obligations", "Inform users"]
+    return [
+        {"id": 1, "system_name": "Chatbot", "use_case": "Support chatbot", "context": "Web",
+         "data_types": ["Text data"], "sector": "Customer Service", "risk_level": "limited",
+         "risk_score": 35, "compliance_score": 85, "matched_rules": ["L1"],
+         "recommendations": recommendations, "can_deploy": True, "fine_amount": "€15M",
+         "date": "2025-02-01",
+         "evidence": [{"rule_id": "L1", "keyword": "chatbot", "field": "use_case",
+                       "start": 8, "end": 15, "text": "chatbot"}]},
+        {"id": 2, "system_name": "Résumé ranker", "use_case": "", "context": "HR",
+         "data_types": [], "risk_level": "high", "risk_score": 70, "matched_rules": ["HR3"],
+         "recommendations": ["Risk management"], "can_deploy": False, "date": "2025-02-03"},
+        {"id": 3, "system_name": "Chatbot 2", "use_case": "Support chatbot",
+         "data_types": ["Text data"], "sector": "Customer Service", "risk_level": "limited",
+         "risk_score": 35, "compliance_score": 85, "matched_rules": ["L1"],
+         "recommendations": list(recommendations), "date": "2025-02-03"},
+    ]
+
+def test_columns_round_trip_and_frame():
+    """Test rows come back unchanged, lists are interned and pandas gets categoricals"""
+    from columnar import AssessmentColumns
+    
+    assessments = make_assessments()
+    columns = AssessmentColumns.from_records(assessments)
+    assert len(columns) == 3
+    assert list(columns) == assessments
+    
+    codes, values = columns.sets['recommendations']
+    assert codes.tolist() == [0, 1, 0] and len(values) == 2
+    assert columns.categories['risk_level'][0].dtype.itemsize == 1
+    
+    df = columns.to_frame(['system_name', 'date', 'sector', 'risk_level', 'compliance_score',
+                           'can_deploy', 'recommendations'])
+    assert list(df.columns) == ['system_name', 'date', 'sector', 'risk_level',
+                                'compliance_score', 'can_deploy', 'recommendations']
+    assert str(df['risk_level'].dtype) == 'category'
+    assert df['sector'].isna().tolist() == [False, True, False]
+    assert df['compliance_score'].isna().tolist() == [False, True, False]
+    assert df['can_deploy'].tolist()[:2] == [True, False]
+    assert df['recommendations'][0] is df['recommendations'][2]
+    assert str(df['date'][1].date()) == "2025-02-03"
+
+def test_repository_to_columns(tmp_path):
+    """Test the SQLite loader matches listings and selects only the requested fields"""
+    import pytest
+    from storage import SQLiteRepository
+    
+    repository = SQLiteRepository(str(tmp_path / "test.db"))
+    repository.add_many(make_assessments())
+    
+    columns = repository.to_columns()
+    assert list(columns) == repository.list()[::-1]
+    
+    picked = repository.to_columns(['system_name', 'risk_score'])
+    assert picked.fields == ['system_name', 'risk_score']
+    assert picked.row(1) == {"system_name": "Résumé ranker", "risk_score": 70}
+    with pytest.raises(KeyError):
+        repository.to_columns(['owner'])
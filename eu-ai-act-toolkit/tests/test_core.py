@@ -0,0 +1,360 @@
+"""
+Tests for the UI-free core engine
+"""
+
+import subprocess
+import sys
+
+def test_core_import_has_no_ui_dependencies():
+    """Test the core engine and headless entry points never import the UI stack"""
+    code = (
+        "import sys\n"
+        "import euai_core\n"
+        "assert 'http.server' not in sys.modules\n"
+        "import cli, parallel, server\n"
+        "loaded = {'streamlit', 'pandas', 'plotly', 'app'} & set(sys.modules)\n"
+        "assert not loaded, loaded\n"
+        "assert euai_core.RiskClassifier().classify('CV screening', 'HR', [])['risk_level'] == 'high'\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+def test_app_reexports_core():
+    """Test the Streamlit module still exposes the core engine"""
+    import app
+    import euai_core
+    
+    assert app.RiskClassifier is euai_core.RiskClassifier
+    assert app.EU_AI_ACT_RULES is euai_core.EU_AI_ACT_RULES
+
+def test_result_cache_hits_and_evicts():
+    """Test cached classification matches uncached and the LRU bound holds"""
+    from euai_core import ResultCache, RiskClassifier
+    
+    cache = ResultCache(max_size=2)
+    cached, plain = RiskClassifier(cache=cache), RiskClassifier()
+    inputs = [("CV screening", "HR", ["Personal data", "Text data"]),
+              ("CV screening", "HR", ["Personal data", "Text data"]),
+              ("Customer chatbot", "Website", []),
+              ("Weather forecast", "", [])]
+    
+    for args in inputs:
+        assert cached.classify(*args) == plain.classify(*args)
+    
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses']) == (1, 3)
+    assert stats['size'] == 2 and stats['evictions'] == 1
+    
+    # Keywords can span data types, so reordered data types are a different input
+    args = ("Grading", "scoring exam proctoring social",
+            ["exam proctoring", "the", "credit scoring"])
+    reordered = (*args[:2], sorted(args[2]))
+    assert cached.classify(*args) == plain.classify(*args)
+    assert cached.classify(*reordered) == plain.classify(*reordered)
+    assert plain.classify(*args)['risk_level'] == 'high'
+    assert plain.classify(*reordered)['risk_level'] == 'unacceptable'
+
+def test_result_cache_rule_change_and_disk_tier(tmp_path):
+    """Test a changed rule base misses and the disk tier survives restarts"""
+    import copy
+    from euai_core import EU_AI_ACT_RULES, ResultCache, RiskClassifier
+    
+    path = str(tmp_path / "cache.db")
+    cache = ResultCache(path=path)
+    assert RiskClassifier(cache=cache).classify("Hiring", "HR", [])['risk_level'] == 'high'
+    
+    rules = copy.deepcopy(EU_AI_ACT_RULES)
+    rules['high_risk_systems'] = []
+    assert RiskClassifier(rules, cache=cache).classify("Hiring", "HR", [])['risk_level'] == 'minimal'
+    assert cache.stats()['misses'] == 2
+    cache.close()
+    
+    restarted = ResultCache(path=path)
+    assert RiskClassifier(cache=restarted).classify("Hiring", "HR", [])['risk_level'] == 'high'
+    assert restarted.stats()['disk_hits'] == 1
+    restarted.close()
+
+def test_rule_pack_validation_and_hot_swap(tmp_path):
+    """Test YAML/JSON rule packs are validated, snapshotted and swapped on change"""
+    import json
+    import pytest
+    from euai_core import RulePack, RulePackError, load_rule_pack
+    
+    pack = tmp_path / "rules.json"
+    pack.write_text(json.dumps({"high_risk_systems": [
+        {"id": "X1", "title": "Drones", "keywords": ["Drone"], "fine": "€1M"}]}))
+    snapshot = str(tmp_path / "rules.pkl")
+    
+    rule_pack = RulePack(str(pack), snapshot_path=snapshot)
+    assert rule_pack.rules['high_risk_systems'][0]['keywords'] == ['drone']
+    assert rule_pack.classify("Drone delivery", "", [])['risk_level'] == 'high'
+    assert RulePack(snapshot).version == rule_pack.version
+    
+    before = rule_pack.classifier
+    pack.write_text(json.dumps({"limited_risk_systems": [
+        {"id": "X1", "title": "Drones", "keywords": ["drone"], "fine": "€1M"}]}))
+    assert rule_pack.reload()
+    assert rule_pack.classify("Drone delivery", "", [])['risk_level'] == 'limited'
+    assert before.classify("Drone delivery", "", [])['risk_level'] == 'high'
+    
+    pack.write_text(json.dumps({"high_risk_systems": [{"id": "X2", "keywords": []}]}))
+    assert not rule_pack.reload()
+    assert isinstance(rule_pack.last_error, RulePackError)
+    assert rule_pack.classify("Drone delivery", "", [])['risk_level'] == 'limited'
+    
+    yaml_pack = tmp_path / "rules.yaml"
+    yaml_pack.write_text("prohibited_practices:\n"
+                         "  - {id: Y1, title: Spying, keywords: [spyware], fine: €35M}\n")
+    assert load_rule_pack(str(yaml_pack))['prohibited_practices'][0]['id'] == 'Y1'
+    yaml_pack.write_text("unknown_tier: []\n")
+    with pytest.raises(RulePackError):
+        load_rule_pack(str(yaml_pack))
+
+def test_token_matcher_multilingual_and_fuzzy():
+    """Test token matching folds accents, stems, translates and tolerates typos"""
+    from euai_core import EU_AI_ACT_RULES, RiskClassifier, create_matcher
+    
+    token = RiskClassifier(matcher=create_matcher(EU_AI_ACT_RULES, 'token'))
+    assert token.classify("Tri automatisé des CV", "Recrutement", [])['risk_level'] == 'high'
+    assert token.classify("Gesichtserkennung am Eingang", "", [])['risk_level'] == 'high'
+    assert token.classify("Asistente virtual", "atención al cliente", [])['risk_level'] == 'limited'
+    assert token.classify("Scheduling for employees", "", [])['risk_level'] == 'high'
+    # Translations stay out of the rules returned in results
+    result = token.classify("Tri automatisé des CV", "Recrutement", [])
+    assert all('translations' not in rule for rule in result['matched_rules'])
+    # Whole terms only: "iris" inside "Osiris" is not a biometric system
+    assert RiskClassifier().classify("Osiris archive", "", [])['risk_level'] == 'high'
+    assert token.classify("Osiris archive", "", [])['risk_level'] == 'minimal'
+    
+    english = RiskClassifier(matcher=create_matcher(EU_AI_ACT_RULES, 'token', languages=['en']))
+    assert english.classify("Reconnaissance faciale", "", [])['risk_level'] == 'minimal'
+    
+    fuzzy = RiskClassifier(matcher=create_matcher(EU_AI_ACT_RULES, 'token', max_edits=1))
+    assert token.classify("Facial recogniton", "", [])['risk_level'] == 'minimal'
+    assert fuzzy.classify("Facial recogniton", "", [])['risk_level'] == 'high'
+
+def test_vectorized_scoring_matches_per_record(tmp_path):
+    """Test matrix scoring equals classify() and compute_compliance_score for any weights"""
+    import pytest
+    from euai_core import RiskClassifier, compute_compliance_score
+    from euai_core.scoring import ScoringMatrix
+    
+    records = [
+        {"id": 1, "use_case": "CV screening and credit scoring", "context": "HR",
+         "data_types": "Personal data;Text data"},
+        {"id": 2, "use_case": "Social scoring of citizens", "context": "", "data_types": []},
+        {"id": 3, "use_case": "Customer chatbot", "context": "Website", "data_types": ["Text data"]},
+        {"id": 4, "use_case": "Weather forecast", "context": "", "data_types": None},
+        {"id": 5, "use_case": "Hiring", "context": "HR",
+         "data_types": ["Personal data", "Personal data"]},
+    ]
+    matrix = ScoringMatrix.from_records(records)
+    assert matrix.ids.tolist() == [1, 2, 3, 4, 5]
+    
+    tweaked = {"high_match_bonus": 20, "high_max_bonus": 40, "compliance_per_data_type": 7}
+    for weights in (None, tweaked):
+        classifier = RiskClassifier(weights=weights)
+        scores = matrix.score(weights)
+        for position, result in enumerate(classifier.classify_batch(records)):
+            data_types = records[position]["data_types"]
+            data_types = data_types.split(";") if isinstance(data_types, str) else data_types or []
+            assert scores["risk_level"][position] == result["risk_level"]
+            assert scores["risk_score"][position] == result["risk_score"]
+            assert scores["can_deploy"][position] == result["can_deploy"]
+            assert scores["compliance_score"][position] == compute_compliance_score(
+                result["risk_level"], data_types, classifier.weights)
+    
+    path = str(tmp_path / "portfolio.npz")
+    matrix.save(path)
+    assert ScoringMatrix.load(path, matrix.rules).score()["risk_score"].tolist() == \
+        matrix.score()["risk_score"].tolist()
+    with pytest.raises(ValueError):
+        RiskClassifier(weights={"unknown": 1})
+
+def test_explained_matches_carry_spans():
+    """Test explain mode adds field spans from the same scan without changing results"""
+    from euai_core import EU_AI_ACT_RULES, KeywordMatcher, RiskClassifier, create_matcher
+    
+    args = ("Automated CV screening", "Recruitment chatbot", ["Personal data"])
+    for matcher in (KeywordMatcher(EU_AI_ACT_RULES, use_regex=False),
+                    KeywordMatcher(EU_AI_ACT_RULES, use_regex=True)):
+        classifier = RiskClassifier(matcher=matcher)
+        result = classifier.classify(*args, explain=True)
+        evidence = result.pop('evidence')
+        assert result == classifier.classify(*args)
+        assert [(e['rule_id'], e['keyword'], e['field'], e['start'], e['end'], e['text'])
+                for e in evidence] == [("HR3", "cv screening", "use_case", 10, 22, "CV screening"),
+                                       ("HR3", "recruitment", "context", 0, 11, "Recruitment")]
+    
+    token = RiskClassifier(matcher=create_matcher(EU_AI_ACT_RULES, 'token', max_edits=1))
+    evidence = token.classify("Reconnaissance faciale, recogniton", "", [], explain=True)['evidence']
+    assert [(e['keyword'], e['text']) for e in evidence] == [
+        ("reconnaissance faciale", "Reconnaissance faciale"),
+        ("facial recognition", "faciale, recogniton")]
+
+def test_instrumentation_records_spans_and_exports(tmp_path):
+    """Test opt-in spans, counters, Prometheus text and the JSON trace file"""
+    import json
+    from euai_core import ResultCache, RiskClassifier, instrumentation
+    
+    classifier = RiskClassifier(cache=ResultCache())
+    classifier.classify("CV screening", "HR", [])
+    assert instrumentation.recorder is None
+    
+    trace_path = str(tmp_path / "trace.json")
+    recorder = instrumentation.enable(trace_path=trace_path)
+    try:
+        for _ in range(2):
+            result = classifier.classify("CV screening", "HR", [])
+        classifier.generate_recommendations(result['risk_level'])
+        with instrumentation.span('page.dashboard'):
+            pass
+    finally:
+        assert instrumentation.disable() is recorder
+    
+    snapshot = recorder.snapshot()
+    assert snapshot['spans']['classify']['count'] == 2
+    assert snapshot['spans']['recommendations']['count'] == 1
+    assert snapshot['counters']['cache_hits'] == 2
+    assert snapshot['counters']['rule_evaluations'] == 2 * classifier.rule_count
+    assert 'euai_span_seconds_count{name="classify"} 2' in recorder.prometheus()
+    
+    recorder.write_trace()
+    with open(trace_path) as f:
+        events = json.load(f)['traceEvents']
+    assert [event['name'] for event in events] == ['classify', 'classify', 'recommendations',
+                                                   'page.dashboard']
+    assert all(event['ph'] == 'X' and event['dur'] >= 0 for event in events)
+
+def test_incremental_reclassification_matches_full_run(tmp_path):
+    """Test a rule diff re-evaluates only affected assessments and reports tier moves"""
+    import copy
+    from euai_core import EU_AI_ACT_RULES, RiskClassifier, compute_compliance_score
+    from euai_core.incremental import DependencyIndex, diff_rules, reclassify
+    from storage import SQLiteRepository
+    
+    def assess(classifier, name, use_case, context=""):
+        result = classifier.classify(use_case, context, [], explain=True)
+        matched = [r["id"] for r in result["matched_rules"]]
+        return {"system_name": name, "use_case": use_case, "context": context,
+                "data_types": [], "risk_level": result["risk_level"],
+                "risk_score": result["risk_score"],
+                "compliance_score": compute_compliance_score(result["risk_level"], []),
+                "matched_rules": matched,
+                "can_deploy": result["can_deploy"], "fine_amount": result["fine_amount"],
+                "date": "2025-02-01", "evidence": result["evidence"]}
+    
+    old = RiskClassifier()
+    repository = SQLiteRepository(str(tmp_path / "test.db"))
+    repository.add_many([assess(old, "Bot", "Customer chatbot"),
+                         assess(old, "Hiring", "CV screening", "HR"),
+                         assess(old, "Forecast", "Weather forecast"),
+                         assess(old, "Faces", "Facial recognition at doors")])
+    index = DependencyIndex.build(repository.iter_all(), old)
+    index.save(str(tmp_path / "index.npz"))
+    index = DependencyIndex.load(str(tmp_path / "index.npz"))
+    assert index.by_rule["LR1"].tolist() == [1]
+    
+    rules = copy.deepcopy(EU_AI_ACT_RULES)
+    rules["limited_risk_systems"][0]["keywords"].remove("chatbot")
+    rules["high_risk_systems"][1]["keywords"].append("weather")
+    rules["high_risk_systems"][2]["fine"] = "€20M"
+    diff = diff_rules(EU_AI_ACT_RULES, rules)
+    assert diff.changed == {"LR1", "HR2", "HR3"} and diff.keywords_added == {"weather"}
+    
+    new = RiskClassifier(rules)
+    repository.add(assess(old, "Tutor", "Education chatbot"))
+    report = reclassify(repository, new, index)
+    # Bot, Hiring (fine), Forecast (found by the scan) and the unindexed Tutor
+    assert report.evaluated == 4 and report.scanned == 5
+    assert report.transitions() == {("limited", "minimal"): 1, ("minimal", "high"): 1}
+    assert [change["system_name"] for change in report.moved] == ["Bot", "Forecast"]
+    
+    for stored in repository.iter_all():
+        expected = assess(new, stored["system_name"], stored["use_case"], stored["context"])
+        assert {key: stored[key] for key in expected if key != "id"} == expected
+    assert index.rules is rules and index.by_rule["HR2"].tolist() == [3, 5]
+    assert reclassify(repository, new, index).evaluated == 0
+
+def test_dedup_classifier_shares_results_within_groups():
+    """Test exact and near duplicates reuse one classification and groups are reported"""
+    from euai_core import RiskClassifier
+    from euai_core.dedup import GROUP_FIELD, DedupClassifier
+    
+    records = [
+        {"use_case": "Acme HR-Scan v2 CV screening for recruitment", "context": "Team Alpha",
+         "data_types": ["Personal data"]},
+        {"use_case": "acme hr-scan v2 cv screening for recruitment", "context": "team alpha",
+         "data_types": ["Personal data"]},
+        {"use_case": "Acme HR-Scan v2  CV screening for recruitment", "context": "Team Alpha 2",
+         "data_types": ["Personal data"]},
+        {"use_case": "Acme HR-Scan v2 CV screening for recruitment", "context": "Team Alpha",
+         "data_types": ["Biometric data"]},
+        {"use_case": "Customer chatbot", "context": "Website", "data_types": []},
+    ]
+    dedup = DedupClassifier()
+    results = list(dedup.classify_batch(records))
+    expected = list(RiskClassifier().classify_batch(records))
+    
+    assert [result.pop(GROUP_FIELD) for result in results] == [0, 0, 0, 1, 2]
+    assert results == expected
+    assert dedup.stats() == {"records": 5, "groups": 3, "exact_duplicates": 1,
+                             "near_duplicates": 1, "duplicate_rate": 0.4}
+    [group] = dedup.groups()
+    assert (group["size"], group["representative"], group["risk_level"]) == (3, 0, "high")
+    assert 0.8 <= group["min_similarity"] < 1
+    
+    # A copy of a near-duplicate member is a near duplicate of the representative
+    repeated = DedupClassifier()
+    list(repeated.classify_batch(records[:3] + records[2:3]))
+    assert (repeated.stats()["exact_duplicates"], repeated.stats()["near_duplicates"]) == (1, 2)
+    
+    # Reordered data types are not duplicates: keywords can span adjacent values
+    spanning = [{"use_case": "Grading", "context": "scoring exam proctoring social",
+                 "data_types": data_types} for data_types in
+                (["exam proctoring", "the", "credit scoring"],
+                 ["credit scoring", "exam proctoring", "the"])]
+    for near_duplicates in (True, False):
+        shared = DedupClassifier(near_duplicates=near_duplicates).classify_batch(spanning)
+        assert [{k: v for k, v in result.items() if k != GROUP_FIELD} for result in shared] \
+            == list(RiskClassifier().classify_batch(spanning))
+    
+    exact = DedupClassifier(near_duplicates=False)
+    assert [r[GROUP_FIELD] for r in exact.classify_batch(records)] == [0, 0, 1, 2, 3]
+    explained = DedupClassifier()
+    assert [r[GROUP_FIELD] for r in explained.classify_batch(records, explain=True)] == \
+        [0, 1, 2, 3, 4]
+
+def test_obligation_tables_are_shared_and_rule_specific():
+    """Test recommendations and obligations are compiled once and looked up by reference"""
+    from euai_core import RISK_OBLIGATIONS, RiskClassifier, validate_rules
+    
+    classifier = RiskClassifier()
+    assert classifier.obligations is RiskClassifier().obligations
+    high = classifier.obligations.recommendations("high", ["HR3"])
+    assert high is classifier.obligations.recommendations("high", ("HR3",))
+    recommendations = classifier.generate_recommendations("high", ["HR3"])
+    assert isinstance(recommendations, list) and recommendations == list(high)
+    assert high[:5] == tuple(o.text for o in RISK_OBLIGATIONS["high"])
+    assert "Employment & Recruitment" in high[5] and "Annex III(3)" in high[5]
+    assert classifier.generate_recommendations("minimal")[0] == "✅ No mandatory compliance"
+    # Stored assessments keep the key only; the texts are looked up on read
+    assessment = {"risk_level": "high", "matched_rules": ["HR3"]}
+    assert classifier.obligations.recommendations_for(assessment) is high
+    
+    [rule_obligation] = classifier.obligations.obligations("high", ["HR3"])[5:]
+    assert rule_obligation.rule_id == "HR3" and rule_obligation.deadline == "2026-08-02"
+    assert rule_obligation.to_dict()["evidence"] == ["Classification rationale"]
+    
+    rules = validate_rules({"high_risk_systems": [
+        {"id": "X1", "title": "Credit", "keywords": ["credit"], "fine": "€15M",
+         "obligations": ["Log every decision", {"id": "X1.fria", "text": "Run a FRIA",
+                                                "article": "Article 27",
+                                                "evidence": ["FRIA report"]}]}]})
+    obligations = RiskClassifier(rules).obligations
+    ids = obligations.obligation_ids("high", ["X1", "unknown"])
+    assert ids[5:] == ("X1.classification", "X1.1", "X1.fria")
+    assert obligations.by_rule["X1"][2].evidence == ("FRIA report",)
+    # Keys with unknown ids are answered but not memoized
+    assert ("high", "X1", "unknown") not in obligations._ids
+    assert obligations.obligation_ids("high", ["X1"]) is obligations.obligation_ids("high", ["X1"])
+
@@ -0,0 +1,58 @@
+"""
+Tests for the background job queue
+"""
+
+import threading
+
+def test_jobs_report_progress_and_results():
+    """Test submit returns at once and pollers see progress, results and failures"""
+    from jobs import JobQueue
+    
+    release = threading.Event()
+    
+    def count(job, n):
+        release.wait(5)
+        for i in range(n):
+            job.update(i + 1, n)
+        return n
+    
+    with JobQueue(workers=1) as queue:
+        job = queue.submit(count, 3, description="count")
+        assert job.status in ('queued', 'running') and queue.get(job.id) is job
+        release.set()
+        assert job.wait(5)
+        assert (job.status, job.result, job.snapshot()['progress']) == ('done', 3, 1.0)
+        
+        failing = queue.submit(lambda job: 1 / 0)
+        failing.wait(5)
+        assert failing.status == 'failed' and 'ZeroDivisionError' in failing.error
+        assert queue.stats()['done'] == 1
+
+def test_backpressure_and_cancellation():
+    """Test a full queue rejects submissions and jobs can be cancelled"""
+    import pytest
+    from jobs import JobQueue, QueueFull
+    
+    release = threading.Event()
+    started = threading.Event()
+    
+    def loop(job):
+        started.set()
+        while not release.wait(0.01):
+            job.update(job.done + 1)
+    
+    queue = JobQueue(workers=1, max_pending=2)
+    running = queue.submit(loop)
+    queued = queue.submit(loop)
+    with pytest.raises(QueueFull):
+        queue.submit(loop)
+    
+    assert started.wait(5)
+    assert queue.cancel(queued.id) and queued.status == 'cancelled'
+    assert running.cancel() and running.wait(5)
+    assert running.status == 'cancelled'
+    
+    # Finished jobs free their slots
+    assert queue.submit(lambda job: 'ok').wait(5)
+    release.set()
+    queue.shutdown()
@@ -0,0 +1,43 @@
+"""
+Tests for the multi-core classification engine
+"""
+
+def test_parallel_matches_serial():
+    """Test that parallel results equal serial results, in input order"""
+    from app import RiskClassifier
+    from parallel import ParallelClassifier
+    
+    records = [
+        {"use_case": "Automated hiring", "context": "HR", "data_types": ["Personal data"]},
+        {"use_case": "Customer chatbot", "context": "Website", "data_types": []},
+        {"use_case": "Social scoring", "context": "City", "data_types": "Personal data"},
+        {"use_case": "Weather forecast", "context": "", "data_types": []},
+        {"use_case": "Facial recognition for hiring", "context": "", "data_types": []},
+    ] * 7
+    
+    expected = list(RiskClassifier().classify_batch(records))
+    with ParallelClassifier(workers=2, chunk_size=3, max_pending=2) as classifier:
+        assert list(classifier.classify_batch(records)) == expected
+
+def test_parallel_classifier_shares_rules_and_pool():
+    """Test recommendations follow the configured rules and threads share one pool"""
+    import threading
+    from euai_core import validate_rules
+    from parallel import ParallelClassifier
+    from server import ClassificationService
+    
+    rules = validate_rules({"high_risk_systems": [
+        {"id": "X1", "title": "Widget scoring", "keywords": ["widget"], "fine": "€1M"}]})
+    with ParallelClassifier(rules, workers=2) as classifier:
+        service = ClassificationService(classifier)
+        body = service.recommendations("high", ["X1"])
+        assert any("Widget scoring" in text for text in body['recommendations'])
+        
+        executors = []
+        threads = [threading.Thread(target=lambda: executors.append(classifier.executor))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len({id(executor) for executor in executors}) == 1
@@ -0,0 +1,85 @@
+"""
+Tests for audit report generation
+"""
+
+import zipfile
+
+import pytest
+
+def make_assessments():
+    return [
+        {"id": 1, "system_name": "CV Screening <AI>", "use_case": "Resume screening",
+         "context": "HR", "data_types": ["Personal data"], "sector": "Employment",
+         "risk_level": "high", "risk_score": 70, "compliance_score": 55,
+         "matched_rules": ["HR3"], "can_deploy": True,
+         "fine_amount": "€15M or 3% global turnover",
+         "date": "2025-02-01",
+         "evidence": [{"rule_id": "HR3", "keyword": "resume screening", "field": "use_case",
+                       "start": 0, "end": 16, "text": "Resume screening"}]},
+        {"id": 2, "system_name": "Support bot", "use_case": "Customer chatbot", "context": "Web",
+         "data_types": [], "sector": "Customer Service", "risk_level": "limited",
+         "risk_score": 35, "compliance_score": 85, "matched_rules": ["LR1"],
+         "can_deploy": True, "fine_amount": "€7.5M", "date": "2025-02-02"},
+        {"id": 3, "system_name": "Support bot 2", "use_case": "Customer chatbot",
+         "data_types": [], "sector": "Customer Service", "risk_level": "limited",
+         "risk_score": 35, "compliance_score": 85, "matched_rules": ["LR1"],
+         "can_deploy": True, "date": "2025-02-03"},
+    ]
+
+def test_html_reports_archive(tmp_path):
+    """Test per-system and portfolio HTML reports stream into a zip with shared charts"""
+    from reports import write_reports
+    
+    target = tmp_path / "reports.zip"
+    stats = write_reports(make_assessments(), str(target), ['html'])
+    assert (stats['systems'], stats['files'], stats['charts']) == (3, 4, 4)
+    
+    with zipfile.ZipFile(target) as archive:
+        names = archive.namelist()
+        assert names[0] == "systems/000001-cv-screening-ai.html"
+        assert sorted(n for n in names if n.startswith("charts/")) == [
+            "charts/compliance-55.svg", "charts/compliance-85.svg",
+            "charts/risk-35-limited.svg", "charts/risk-70-high.svg"]
+        report = archive.read(names[0]).decode('utf-8')
+        portfolio = archive.read("portfolio.html").decode('utf-8')
+    assert "CV Screening &lt;AI&gt;" in report and "<AI>" not in report
+    assert '../charts/risk-70-high.svg' in report
+    assert "Article 9" in report and "2026-08-02" in report and "Annex III(3)" in report
+    assert "resume screening" in report
+    assert "3 systems" in portfolio and 'href="systems/000002-support-bot.html"' in portfolio
+
+def test_pdf_reports_with_workers(tmp_path):
+    """Test PDF rendering on a worker pool gives the same archive layout as serial rendering"""
+    pytest.importorskip("fpdf")
+    from reports import ReportRenderer, write_reports
+    
+    serial, parallel = tmp_path / "serial.zip", tmp_path / "parallel.zip"
+    write_reports(make_assessments(), str(serial), ['pdf'], chunk_size=1)
+    stats = write_reports(make_assessments(), str(parallel), ['pdf'], workers=2, chunk_size=1)
+    assert (stats['files'], stats['charts']) == (4, 0)
+    
+    with zipfile.ZipFile(serial) as a, zipfile.ZipFile(parallel) as b:
+        assert a.namelist() == b.namelist() == [
+            "systems/000001-cv-screening-ai.pdf", "systems/000002-support-bot.pdf",
+            "systems/000003-support-bot-2.pdf", "portfolio.pdf"]
+        assert all(b.read(name).startswith(b"%PDF") for name in b.namelist())
+    
+    with pytest.raises(ValueError):
+        ReportRenderer(['docx'])
+
+def test_report_cli(tmp_path):
+    """Test euai-report renders a database into an archive"""
+    from reports import main
+    from storage import SQLiteRepository
+    
+    database = str(tmp_path / "assessments.db")
+    repository = SQLiteRepository(database)
+    repository.add_many(dict(assessment, id=None) for assessment in make_assessments())
+    repository.close()
+    target = tmp_path / "out.zip"
+    
+    assert main([database, "-o", str(target), "--no-portfolio"]) == 0
+    with zipfile.ZipFile(target) as archive:
+        assert len([n for n in archive.namelist() if n.startswith("systems/")]) == 3
+        assert "portfolio.html" not in archive.namelist()
+
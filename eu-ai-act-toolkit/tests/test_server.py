@@ -0,0 +1,123 @@
+"""
+Tests for the headless HTTP API
+"""
+
+import json
+import threading
+from http.client import HTTPConnection
+
+def _serve(service=None):
+    from server import create_server
+
+    server = create_server('127.0.0.1', 0, service)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def _request(conn, method, path, payload=None):
+    body = json.dumps(payload) if payload is not None else None
+    conn.request(method, path, body=body, headers={'Content-Type': 'application/json'})
+    response = conn.getresponse()
+    return response.status, json.loads(response.read())
+
+def test_endpoints_over_keep_alive():
+    """Test every endpoint on one persistent connection"""
+    server = _serve()
+    conn = HTTPConnection('127.0.0.1', server.server_address[1])
+    try:
+        status, result = _request(conn, 'POST', '/classify', {
+            "use_case": "CV screening", "context": "HR", "data_types": ["Personal data"]})
+        assert status == 200
+        assert result['risk_level'] == 'high'
+        assert result['matched_rules'] == ['HR3']
+        assert result['compliance_score'] == 55
+
+        status, body = _request(conn, 'POST', '/classify_batch', {"records": [
+            {"use_case": "Customer chatbot", "context": "Website"},
+            {"use_case": "Weather forecast"},
+        ]})
+        assert [r['risk_level'] for r in body['results']] == ['limited', 'minimal']
+
+        status, body = _request(conn, 'GET', '/recommendations?risk_level=limited')
+        assert status == 200 and body['recommendations']
+
+        status, body = _request(conn, 'GET', '/recommendations?risk_level=high&matched_rules=HR3')
+        assert len(body['recommendations']) == len(body['obligations']) == 6
+        assert body['obligations'][-1]['rule_id'] == 'HR3'
+        assert body['obligations'][0]['article'] == 'Article 9'
+
+        status, body = _request(conn, 'POST', '/recommendations',
+                                {"risk_level": "high", "matched_rules": "HR3"})
+        assert status == 400 and "matched_rules" in body['error']
+
+        status, body = _request(conn, 'POST', '/classify', "not a record")
+        assert status == 400
+
+        status, metrics = _request(conn, 'GET', '/metrics')
+        classify = metrics['endpoints']['POST /classify']
+        assert classify['requests'] == 2 and classify['errors'] == 1
+        assert classify['p50_ms'] <= classify['p99_ms'] <= classify['max_ms']
+        assert 'evidence' not in result
+
+        status, result = _request(conn, 'POST', '/classify?explain=1', {
+            "use_case": "Automated CV screening", "context": "HR"})
+        assert result['evidence'] == [{"rule_id": "HR3", "keyword": "cv screening",
+                                       "field": "use_case", "start": 10, "end": 22,
+                                       "text": "CV screening"}]
+    finally:
+        conn.close()
+        server.shutdown()
+        server.server_close()
+
+def test_micro_batcher_coalesces_requests():
+    """Test concurrent single requests are classified in shared batches"""
+    from app import RiskClassifier
+    from server import MicroBatcher
+
+    class CountingClassifier(RiskClassifier):
+        batches = []
+
+        def classify_batch(self, records):
+            records = list(records)
+            self.batches.append(len(records))
+            return super().classify_batch(records)
+
+    batcher = MicroBatcher(CountingClassifier(), max_batch=8, max_wait=0.2)
+    futures = [batcher.submit({"use_case": "Social scoring of citizens"})
+               for _ in range(10)]
+
+    assert all(f.result(timeout=5)['risk_level'] == 'unacceptable' for f in futures)
+    assert sum(CountingClassifier.batches) == 10
+    assert max(CountingClassifier.batches) == 8
+
+def test_batch_jobs_poll_and_backpressure():
+    """Test /jobs returns a job id at once, long-polls to results and rejects overload"""
+    from jobs import JobQueue
+    from server import ClassificationService
+    
+    release = threading.Event()
+    blocker = JobQueue(workers=1, max_pending=1)
+    blocker.submit(lambda job: release.wait(5))
+    service = ClassificationService(jobs=JobQueue(workers=1, max_pending=2))
+    server = _serve(service)
+    conn = HTTPConnection('127.0.0.1', server.server_address[1])
+    try:
+        status, job = _request(conn, 'POST', '/jobs', {"records": [
+            {"use_case": "CV screening", "context": "HR"}, {"use_case": "Weather forecast"}]})
+        assert status == 202 and job['total'] == 2
+        
+        while 'results' not in job and job['status'] in ('queued', 'running', 'done'):
+            status, job = _request(conn, 'GET', f"/jobs/{job['id']}?since={job['version']}&wait=5")
+        assert job['status'] == 'done' and job['progress'] == 1.0
+        assert [r['risk_level'] for r in job['results']] == ['high', 'minimal']
+        
+        service.jobs = blocker
+        status, body = _request(conn, 'POST', '/jobs', [{"use_case": "Chatbot"}])
+        assert status == 503
+        status, body = _request(conn, 'GET', '/jobs/unknown')
+        assert status == 404
+    finally:
+        release.set()
+        blocker.shutdown()
+        conn.close()
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,266 @@
+"""
+Tests for SQLite assessment persistence
+"""
+
+def make_assessment(name, level, score, date, sector="Employment"):
+    return {
+        "system_name": name,
+        "use_case": f"{name} use case",
+        "context": "Test",
+        "data_types": ["Personal data"],
+        "sector": sector,
+        "risk_level": level,
+        "risk_score": score,
+        "compliance_score": 85,
+        "matched_rules": [],
+        "date": date,
+    }
+
+def test_add_get_delete(tmp_path):
+    """Test basic repository operations"""
+    from storage import SQLiteRepository
+    
+    repository = SQLiteRepository(str(tmp_path / "test.db"))
+    stored = repository.add(make_assessment("A", "high", 80, "2025-02-01"))
+    
+    assert stored['id'] == 1
+    assert repository.get(1) == stored
+    assert repository.delete(1)
+    assert repository.get(1) is None
+    assert repository.count() == 0
+
+def test_queries(tmp_path):
+    """Test counts, recent items and filtered listings"""
+    from storage import SQLiteRepository
+    
+    path = str(tmp_path / "test.db")
+    repository = SQLiteRepository(path)
+    repository.add_many([
+        make_assessment("A", "high", 80, "2025-02-01"),
+        make_assessment("B", "limited", 35, "2025-02-03", sector="Customer Service"),
+        make_assessment("C", "high", 90, "2025-02-02", sector="Education"),
+        make_assessment("D", "minimal", 15, "2025-02-03"),
+    ])
+    repository.close()
+    
+    # Data survives a restart
+    repository = SQLiteRepository(path)
+    assert repository.count() == 4
+    assert repository.count_by_level() == {'high': 2, 'limited': 1, 'minimal': 1}
+    assert repository.average_risk_score() == 55
+    assert [a['system_name'] for a in repository.recent(3)] == ['D', 'B', 'C']
+    assert [a['system_name'] for a in repository.list(risk_level='high')] == ['C', 'A']
+    assert [a['system_name'] for a in repository.list(sector='Employment', date_to='2025-02-02')] == ['A']
+    assert [a['system_name'] for a in repository.list(limit=2, offset=1)] == ['B', 'C']
+    assert repository.scores_by_date() == [
+        ('2025-02-01', 80), ('2025-02-02', 90), ('2025-02-03', 35), ('2025-02-03', 15)]
+    assert [a['system_name'] for a in repository.iter_all(batch_size=1)] == ['A', 'C', 'B', 'D']
+
+def test_indexes_are_used(tmp_path):
+    """Test that filtered queries are index-backed"""
+    from storage import SQLiteRepository
+    
+    repository = SQLiteRepository(str(tmp_path / "test.db"))
+    plan = repository._conn.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM assessments WHERE risk_level = ? "
+        "ORDER BY date DESC, id DESC LIMIT 3", ('high',)).fetchall()
+    assert any('idx_assessments_risk_level' in row[-1] for row in plan)
+
+def test_summary_is_maintained_incrementally(tmp_path):
+    """Test that aggregates follow inserts, updates and deletes"""
+    from storage import SQLiteRepository
+    
+    repository = SQLiteRepository(str(tmp_path / "test.db"))
+    assert repository.summary()['total'] == 0
+    
+    a = repository.add(make_assessment("A", "high", 80, "2025-02-01"))
+    repository.add(make_assessment("B", "limited", 40, "2025-02-01", sector="Education"))
+    
+    summary = repository.summary()
+    assert summary['total'] == 2
+    assert summary['mean_risk_score'] == 60
+    assert summary['mean_compliance_score'] == 85
+    assert summary['by_risk_level'] == {'high': 1, 'limited': 1}
+    assert summary['by_sector'] == {'Employment': 1, 'Education': 1}
+    assert summary['by_date'] == {'2025-02-01': 2}
+    
+    repository._conn.execute("UPDATE assessments SET risk_level = 'minimal', risk_score = 20 "
+                             "WHERE id = ?", (a['id'],))
+    assert repository.count_by_level() == {'minimal': 1, 'limited': 1}
+    assert repository.average_risk_score() == 30
+    
+    repository.delete(a['id'])
+    summary = repository.summary()
+    assert summary['total'] == 1
+    assert summary['by_risk_level'] == {'limited': 1}
+    assert summary['by_sector'] == {'Education': 1}
+    
+    # A full rebuild agrees with the incremental aggregates
+    repository.rebuild_stats()
+    assert repository.summary() == summary
+
+def test_timeline_buckets_and_data_version(tmp_path):
+    """Test server-side timeline aggregation and change tracking"""
+    from storage import SQLiteRepository
+    
+    repository = SQLiteRepository(str(tmp_path / "test.db"))
+    version = repository.data_version()
+    repository.add_many([
+        make_assessment("A", "high", 80, "2025-02-03"),
+        make_assessment("B", "limited", 40, "2025-02-03"),
+        make_assessment("C", "minimal", 15, "2025-02-05"),
+        make_assessment("D", "high", 90, "2025-02-10"),
+    ])
+    assert repository.data_version() > version
+    
+    assert repository.timeline('day') == [
+        ('2025-02-03', 2, 40, 60.0, 80),
+        ('2025-02-05', 1, 15, 15.0, 15),
+        ('2025-02-10', 1, 90, 90.0, 90),
+    ]
+    # 2025-02-03 and 2025-02-10 are Mondays
+    assert repository.timeline('week') == [
+        ('2025-02-03', 3, 15, 45.0, 80),
+        ('2025-02-10', 1, 90, 90.0, 90),
+    ]
+    
+    version = repository.data_version()
+    repository.delete(1)
+    assert repository.data_version() > version
+
+def test_keyset_pagination_and_filtered_counts(tmp_path):
+    """Test cursor pagination and counts with pushed-down filters"""
+    from storage import SQLiteRepository
+    
+    repository = SQLiteRepository(str(tmp_path / "test.db"))
+    repository.add_many(
+        make_assessment(f"S{i}", "high" if i % 2 else "minimal", 50, f"2025-02-{i % 5 + 1:02d}",
+                        sector="Education" if i % 3 else "Employment")
+        for i in range(20))
+    
+    seen, cursor = [], None
+    while True:
+        page = repository.list(risk_level="high", limit=3, before=cursor)
+        if not page:
+            break
+        seen += [a['id'] for a in page]
+        cursor = (page[-1]['date'], page[-1]['id'])
+    assert seen == [a['id'] for a in repository.list(risk_level="high")]
+    assert len(seen) == repository.count(risk_level="high") == 10
+    
+    assert repository.count(risk_level="high", sector="Education") == len(
+        repository.list(risk_level="high", sector="Education"))
+    assert repository.count(sector="Employment", date_from="2025-02-02", date_to="2025-02-03") == len(
+        repository.list(sector="Employment", date_from="2025-02-02", date_to="2025-02-03"))
+
+def test_update_scores_keeps_aggregates(tmp_path):
+    """Test bulk re-scores update rows and the incremental aggregates"""
+    from storage import SQLiteRepository
+    
+    repository = SQLiteRepository(str(tmp_path / "test.db"))
+    repository.add_many([make_assessment("A", "high", 80, "2025-02-01"),
+                         make_assessment("B", "limited", 35, "2025-02-02")])
+    
+    assert repository.update_scores([(1, "high", 90, 60), (2, "minimal", 15, 85)]) == 2
+    assert repository.get(1)['risk_score'] == 90
+    assert repository.count_by_level() == {'high': 1, 'minimal': 1}
+    summary = repository.summary()
+    assert summary['mean_risk_score'] == 52.5
+    assert summary['mean_compliance_score'] == 72.5
+
+def test_log_repository_matches_sqlite(tmp_path):
+    """Test the append-only log answers queries like SQLite after updates and deletes"""
+    from storage import SQLiteRepository, open_repository
+    
+    assessments = [
+        make_assessment("A", "high", 80, "2025-02-01"),
+        make_assessment("B", "limited", 35, "2025-02-03", sector="Customer Service"),
+        make_assessment("C", "high", 70, "2025-02-03", sector="Education"),
+        dict(make_assessment("D", "minimal", 10, "2025-02-10"), can_deploy=True, evidence=[]),
+    ]
+    del assessments[1]['compliance_score']
+    log = open_repository(str(tmp_path / "history.euailog"))
+    sqlite = SQLiteRepository(str(tmp_path / "test.db"))
+    for repository in (log, sqlite):
+        repository.add_many(assessments)
+        repository.add(make_assessment("E", "high", 90, "2025-02-02"))
+        assert repository.delete(3)
+        assert not repository.delete(99)
+        assert repository.update_scores([(1, "limited", 40, 90), (99, "high", 1, 1)]) == 1
+        assert repository.update_results([
+            {"id": 2, "risk_level": "minimal", "risk_score": 15, "compliance_score": 85,
+             "matched_rules": [], "recommendations": ["None"], "can_deploy": True,
+             "fine_amount": "N/A"},
+            {"id": 4, "risk_level": "high", "risk_score": 70, "compliance_score": 55,
+             "matched_rules": ["HR3"], "recommendations": [], "can_deploy": True,
+             "fine_amount": "€15M", "evidence": [{"rule_id": "HR3"}]}]) == 2
+    
+    assert type(log).__name__ == 'LogRepository'
+    assert log.list() == sqlite.list()
+    assert log.get(1) == sqlite.get(1) and log.get(3) is None
+    assert log.get(4) == sqlite.get(4) and log.get(4)['evidence'] == [{"rule_id": "HR3"}]
+    assert log.get(2)['recommendations'] == ["None"] and log.get(2)['use_case'] == "B use case"
+    assert sorted(log.ids()) == sorted(sqlite.ids()) == [1, 2, 4, 5]
+    assert log.summary() == sqlite.summary()
+    assert log.list(risk_level="high", limit=1) == sqlite.list(risk_level="high", limit=1)
+    assert log.list(before=("2025-02-03", 2)) == sqlite.list(before=("2025-02-03", 2))
+    assert log.count(sector="Employment", date_from="2025-02-02") == 2
+    assert log.timeline('week') == sqlite.timeline('week')
+    assert log.scores_by_date() == sqlite.scores_by_date()
+    assert list(log.iter_all()) == list(sqlite.iter_all())
+
+def test_log_repository_shared_readers_and_torn_writes(tmp_path):
+    """Test a second reader sees appends and a partial trailing record is ignored"""
+    from assessment_log import LogRepository
+    
+    path = str(tmp_path / "history.euailog")
+    writer = LogRepository(path)
+    reader = LogRepository(path)
+    writer.add(make_assessment("A", "high", 80, "2025-02-01"))
+    assert reader.count() == 1
+    version = reader.data_version()
+    
+    writer.add(make_assessment("B", "high", 75, "2025-02-02"))
+    assert reader.data_version() != version
+    assert [a['system_name'] for a in reader.list()] == ["B", "A"]
+    
+    with open(path, 'ab') as handle:
+        handle.write(b'\x01' * 10)
+    assert reader.count() == 2
+    writer.add(make_assessment("C", "limited", 30, "2025-02-03"))
+    assert [a['id'] for a in reader.list()] == [3, 2, 1]
+    assert reader.summary()['by_risk_level'] == {'high': 2, 'limited': 1}
+
+def test_seed_once_and_change_feed(tmp_path):
+    """Test seeding is skipped on a non-empty store and the change feed reports writes"""
+    from changes import ChangeFeed
+    from storage import open_repository
+    
+    seed = [make_assessment("A", "high", 80, "2025-02-01")]
+    for name in ("shared.db", "shared.euailog"):
+        path = str(tmp_path / name)
+        first, second = open_repository(path), open_repository(path)
+        assert (first.seed(seed), second.seed(seed)) == (1, 0)
+        
+        feed = ChangeFeed(second, start=False)
+        seen = []
+        token = feed.subscribe(seen.append)
+        assert feed.poll() == feed.version and not seen
+        # A write through another connection is picked up by polling
+        first.add(make_assessment("B", "limited", 35, "2025-02-02"))
+        version = feed.poll()
+        assert seen == [version] and feed.wait_change(version - 1, timeout=0) == version
+        assert feed.unsubscribe(token) and second.count() == 2
+        first.close()
+        second.close()
+
+def test_timeline_chart_of_empty_repository(tmp_path):
+    """Test bucketed timeline charts render an empty figure without assessments"""
+    from charts import create_timeline
+    from storage import SQLiteRepository
+    
+    repository = SQLiteRepository(str(tmp_path / "empty.db"))
+    for bucket in ('day', 'week', 'raw'):
+        figure = create_timeline(repository, bucket)
+        assert all(len(trace.x) == 0 for trace in figure.data)
+    repository.close()